@@ -0,0 +1,17 @@
+"""
+Benchmarks für die A2T-Verarbeitungspipeline
+
+Aufruf aus dem Projektverzeichnis, z.B.:
+    python -m benchmarks.resampling
+    python -m benchmarks.pipeline --duration 60 --model tiny --json results.json
+    python -m benchmarks.loadtest --jobs 20 --concurrency 4   (Server mit STUB_ENGINES=True)
+    python -m benchmarks.fake_ollama --port 11435
+"""
+
+import sys
+from pathlib import Path
+
+# Services liegen unter src/ (wie in src/main.py)
+SRC_PATH = Path(__file__).resolve().parent.parent / 'src'
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
@@ -0,0 +1,127 @@
+"""
+Lokaler Fake-Ollama-Server für Lasttests
+
+Beantwortet ``/api/tags``, ``/api/version`` und ``/api/generate`` (auch
+``stream: true`` als NDJSON) mit einstellbarer Latenz, Antwortlänge und
+Fehlerquote. Der echte ``OllamaClient`` samt HTTP-Pfad lässt sich so ohne
+Modell und GPU testen:
+
+    python -m benchmarks.fake_ollama --port 11435 --latency 0.3 --tokens 400 --tokens-per-second 80
+    OLLAMA_BASE_URL=http://localhost:11435 python src/main.py
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = ("Protokoll", "Termin", "Budget", "Aufgabe", "Team", "Freitag", "klären", "Vereinbarung", "—")
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    server_version = "FakeOllama/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{
+                "name": self.server.model, "size": 4_700_000_000,
+                "modified_at": datetime.now(timezone.utc).isoformat(),
+                "details": {"family": "fake", "parameter_size": "8B"}
+            }]})
+        elif self.path == "/api/version":
+            self._send_json(200, {"version": "0.0.0-fake"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/api/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        config = self.server
+
+        time.sleep(config.latency)
+        if config.random.random() < config.error_rate:
+            self._send_json(500, {"error": "simulated failure"})
+            return
+
+        tokens = [config.random.choice(WORDS) for _ in range(config.tokens)]
+        token_delay = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+        started_at = time.perf_counter()
+        if request.get("stream", True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            for token in tokens:
+                time.sleep(token_delay)
+                self.wfile.write(json.dumps({"model": request.get("model"), "response": token + " ",
+                                             "done": False}).encode() + b"\n")
+            self.wfile.write(json.dumps({"model": request.get("model"), "response": "", "done": True,
+                                         "eval_count": len(tokens)}).encode() + b"\n")
+            return
+
+        time.sleep(token_delay * len(tokens))
+        self._send_json(200, {
+            "model": request.get("model"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "response": "# Meeting-Protokoll\n\n" + " ".join(tokens),
+            "done": True,
+            "eval_count": len(tokens),
+            "eval_duration": int((time.perf_counter() - started_at) * 1e9)
+        })
+
+
+def create_server(host: str = "127.0.0.1", port: int = 11435, latency: float = 0.3, tokens: int = 400,
+                  tokens_per_second: float = 80.0, error_rate: float = 0.0, model: str = "llama3",
+                  seed: int = 0, verbose: bool = False) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), FakeOllamaHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.tokens = tokens
+    server.tokens_per_second = tokens_per_second
+    server.error_rate = error_rate
+    server.model = model
+    server.random = random.Random(seed)
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Ollama server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency", type=float, default=0.3, help="Wartezeit vor der Antwort (Sekunden)")
+    parser.add_argument("--tokens", type=int, default=400, help="Antwortlänge in Tokens")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil der Anfragen mit HTTP 500")
+    parser.add_argument("--model", default="llama3")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.latency, args.tokens, args.tokens_per_second,
+                           args.error_rate, args.model, verbose=args.verbose)
+    print(f"🦙 Fake Ollama listening on http://{args.host}:{args.port} "
+          f"(latency {args.latency}s, {args.tokens} tokens @ {args.tokens_per_second}/s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
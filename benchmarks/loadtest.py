@@ -0,0 +1,240 @@
+"""
+HTTP-Lasttest für Job-System und API
+
+Schickt ``--jobs`` synthetische Aufnahmen mit ``--concurrency`` gleichzeitig
+laufenden Jobs an ``/api/v1/transcribe``, fragt ``/api/v1/status`` ab und
+misst optional ``/api/v1/generate-protocol``. Ausgewertet werden Latenz-
+Perzentile je Endpoint, Durchsatz, Wartezeit bis Verarbeitungsbeginn,
+Durchlaufzeit sowie RSS und Compute-Warteschlange des Servers über die Zeit.
+
+Für reine Durchsatzmessungen ohne Modelle den Server mit Stub-Engines starten:
+
+    STUB_ENGINES=True python src/main.py
+    python -m benchmarks.loadtest --jobs 50 --concurrency 8 --duration 60 --protocol-requests 20
+"""
+
+import argparse
+import io
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
+
+import numpy as np
+import requests
+import soundfile as sf
+
+from benchmarks.synthetic import synthetic_meeting
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def latency_summary(values) -> dict:
+    if not values:
+        return {"count": 0}
+    values = np.asarray(values, dtype=np.float64)
+    summary = {"count": int(len(values)), "mean": round(float(values.mean()), 4)}
+    for p in PERCENTILES:
+        summary[f"p{p}"] = round(float(np.percentile(values, p)), 4)
+    summary["max"] = round(float(values.max()), 4)
+    return summary
+
+
+class ServerSampler:
+    """Fragt während des Tests periodisch RSS und Compute-Warteschlange des Servers ab"""
+
+    def __init__(self, base_url: str, interval: float = 1.0):
+        self.base_url = base_url
+        self.interval = interval
+        self.samples = []
+        self._stop = Event()
+        self._thread = Thread(target=self._run, name="server-sampler", daemon=True)
+        self._started_at = time.perf_counter()
+
+    def sample(self) -> dict:
+        sample = {"t": round(time.perf_counter() - self._started_at, 2)}
+        try:
+            memory = requests.get(f"{self.base_url}/api/v1/models/overview", timeout=10).json().get("memory_usage", {})
+            sample["rss_mb"] = memory.get("process_rss_mb")
+        except (requests.RequestException, ValueError):
+            pass
+        try:
+            text = requests.get(f"{self.base_url}/metrics", timeout=10).text
+            for name in ("a2t_compute_queue_length", "a2t_compute_active_workers"):
+                match = re.search(rf"^{name} ([0-9.eE+-]+)$", text, re.MULTILINE)
+                if match:
+                    sample[name.replace("a2t_", "")] = float(match.group(1))
+        except requests.RequestException:
+            pass
+        return sample
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.samples.append(self.sample())
+
+    def start(self):
+        self.samples.append(self.sample())
+        self._thread.start()
+
+    def stop(self) -> dict:
+        self._stop.set()
+        self._thread.join()
+        self.samples.append(self.sample())
+        rss = [s["rss_mb"] for s in self.samples if s.get("rss_mb") is not None]
+        queue = [s["compute_queue_length"] for s in self.samples if "compute_queue_length" in s]
+        return {
+            "rss_start_mb": rss[0] if rss else None,
+            "rss_peak_mb": max(rss) if rss else None,
+            "rss_end_mb": rss[-1] if rss else None,
+            "rss_growth_mb": round(rss[-1] - rss[0], 1) if rss else None,
+            "compute_queue_peak": max(queue) if queue else None,
+            "compute_queue_mean": round(float(np.mean(queue)), 2) if queue else None,
+            "timeline": self.samples,
+        }
+
+
+class LoadTest:
+    def __init__(self, base_url: str, audio_bytes: bytes, form: dict, poll_interval: float = 0.5,
+                 timeout: float = 3600.0):
+        self.base_url = base_url.rstrip("/")
+        self.audio_bytes = audio_bytes
+        self.form = form
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.latencies = {"transcribe": [], "status": [], "generate_protocol": []}
+        self.jobs = []
+        self.errors = []
+        self._lock = Lock()
+
+    def _timed_request(self, endpoint: str, method: str, url: str, **kwargs):
+        started_at = time.perf_counter()
+        response = requests.request(method, url, timeout=60, **kwargs)
+        with self._lock:
+            self.latencies[endpoint].append(time.perf_counter() - started_at)
+        return response
+
+    def run_job(self, index: int) -> dict:
+        submitted_at = time.perf_counter()
+        try:
+            response = self._timed_request(
+                "transcribe", "POST", f"{self.base_url}/api/v1/transcribe",
+                files={"audio": (f"loadtest_{index}.wav", self.audio_bytes, "audio/wav")}, data=self.form)
+            response.raise_for_status()
+            job_id = response.json()["job_id"]
+
+            started_at = None
+            status = {}
+            while time.perf_counter() - submitted_at < self.timeout:
+                status = self._timed_request("status", "GET", f"{self.base_url}/api/v1/status/{job_id}").json()
+                if started_at is None and status.get("status") != "queued":
+                    started_at = time.perf_counter()
+                if status.get("status") in ("completed", "failed"):
+                    break
+                time.sleep(self.poll_interval)
+            finished_at = time.perf_counter()
+
+            job = {
+                "job_id": job_id,
+                "status": status.get("status", "timeout"),
+                "queue_seconds": (started_at or finished_at) - submitted_at,
+                "turnaround_seconds": finished_at - submitted_at,
+                "transcript": (status.get("result") or {}).get("transcript", ""),
+            }
+        except (requests.RequestException, ValueError, KeyError) as e:
+            job = {"status": "error", "error": str(e), "turnaround_seconds": time.perf_counter() - submitted_at}
+            with self._lock:
+                self.errors.append(str(e))
+        with self._lock:
+            self.jobs.append(job)
+        return job
+
+    def generate_protocol(self, transcript: str):
+        try:
+            self._timed_request("generate_protocol", "POST", f"{self.base_url}/api/v1/generate-protocol",
+                                json={"transcript": transcript,
+                                      "speakers": [{"speaker": "SPEAKER_00", "name": "Anna"},
+                                                   {"speaker": "SPEAKER_01", "name": "Ben"}]}).raise_for_status()
+        except requests.RequestException as e:
+            with self._lock:
+                self.errors.append(str(e))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP load test for the A2T job system")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4, help="Gleichzeitig laufende Jobs")
+    parser.add_argument("--duration", type=float, default=30.0, help="Länge der Testaufnahme in Sekunden")
+    parser.add_argument("--speakers", type=int, default=3)
+    parser.add_argument("--model", help="Whisper-Modell für die Jobs")
+    parser.add_argument("--form", action="append", default=[], help="Weitere Formularfelder key=value")
+    parser.add_argument("--protocol-requests", type=int, default=0, help="Anfragen an /api/v1/generate-protocol")
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Abstand der Server-Messungen")
+    parser.add_argument("--json", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args()
+
+    audio, _ = synthetic_meeting(args.duration, args.speakers)
+    buffer = io.BytesIO()
+    sf.write(buffer, audio, 16000, format="WAV", subtype="PCM_16")
+    form = dict(field.split("=", 1) for field in args.form)
+    if args.model:
+        form["model"] = args.model
+
+    test = LoadTest(args.url, buffer.getvalue(), form, poll_interval=args.poll_interval)
+    sampler = ServerSampler(test.base_url, args.sample_interval)
+    sampler.start()
+    print(f"🚦 {args.jobs} jobs ({args.duration:.0f}s audio) with concurrency {args.concurrency} against {args.url}")
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(test.run_job, range(args.jobs)))
+    jobs_seconds = time.perf_counter() - started_at
+
+    if args.protocol_requests:
+        transcript = next((job["transcript"] for job in test.jobs if job.get("transcript")), "Testtranskript")
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            list(executor.map(lambda _: test.generate_protocol(transcript), range(args.protocol_requests)))
+    server = sampler.stop()
+
+    completed = [job for job in test.jobs if job["status"] == "completed"]
+    report = {
+        "config": vars(args),
+        "wall_seconds": round(jobs_seconds, 2),
+        "jobs_completed": len(completed),
+        "jobs_failed": len(test.jobs) - len(completed),
+        "throughput_jobs_per_minute": round(60 * len(completed) / jobs_seconds, 2) if jobs_seconds else None,
+        "audio_seconds_per_second": round(len(completed) * args.duration / jobs_seconds, 2) if jobs_seconds else None,
+        "latency": {endpoint: latency_summary(values) for endpoint, values in test.latencies.items()},
+        "queue_seconds": latency_summary([job["queue_seconds"] for job in completed]),
+        "turnaround_seconds": latency_summary([job["turnaround_seconds"] for job in completed]),
+        "server": server,
+        "errors": test.errors[:20],
+    }
+
+    print(f"✅ {len(completed)}/{args.jobs} jobs in {jobs_seconds:.1f}s "
+          f"({report['throughput_jobs_per_minute']} jobs/min, {report['audio_seconds_per_second']}x real time)")
+    for name in ("transcribe", "status", "generate_protocol"):
+        summary = report["latency"][name]
+        if summary["count"]:
+            print(f"   {name:<18} p50 {summary['p50'] * 1000:7.1f}ms  p95 {summary['p95'] * 1000:7.1f}ms  "
+                  f"p99 {summary['p99'] * 1000:7.1f}ms  ({summary['count']} requests)")
+    for name in ("queue_seconds", "turnaround_seconds"):
+        summary = report[name]
+        if summary["count"]:
+            print(f"   {name:<18} p50 {summary['p50']:7.2f}s   p95 {summary['p95']:7.2f}s   max {summary['max']:.2f}s")
+    if server["rss_start_mb"] is not None:
+        print(f"   server RSS {server['rss_start_mb']} MB -> {server['rss_end_mb']} MB "
+              f"(peak {server['rss_peak_mb']} MB), compute queue peak {server['compute_queue_peak']}")
+    if test.errors:
+        print(f"⚠️ {len(test.errors)} request error(s), first: {test.errors[0]}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
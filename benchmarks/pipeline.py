@@ -0,0 +1,227 @@
+"""
+Pipeline-Benchmark: Stufenzeiten über Modelle und Aufnahmelängen
+
+Misst mit deterministischen synthetischen Besprechungen (``benchmarks.synthetic``)
+die Stufen der Job-Pipeline:
+
+    convert     convert_audio_to_wav (FFmpeg-Pipe, Resampling, Lautheit)
+    load_model  Whisper-Modell laden (einmal je Modell)
+    transcribe  WhisperClient.transcribe_with_timestamps
+    diarize     SpeakerDiarization.identify_speakers
+    merge       ProtocolGenerator._merge_transcription_with_speakers
+    protocol    Fallback-Protokoll (ohne LLM, deterministisch)
+
+Die Dienste werden aus ``api.app`` übernommen, also mit derselben Verdrahtung
+und Konfiguration (.env) wie im Server.
+
+    python -m benchmarks.pipeline --duration 30 --duration 300 --model tiny --model base \\
+        --json results.json --baseline benchmarks/baseline.json
+
+Mit ``--save-baseline`` wird das Ergebnis als neue Referenz gespeichert. Beim
+Vergleich gilt eine Stufe als Regression, wenn sie um mehr als ``--tolerance``
+(relativ) und ``--min-delta`` Sekunden (absolut) langsamer ist; der Exit-Code
+ist dann 1.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import soundfile as sf
+
+from benchmarks.synthetic import synthetic_meeting
+
+SOURCE_RATE = 44100  # Stereo 44.1 kHz, damit convert wirklich resampelt und heruntermischt
+
+
+def machine_info() -> dict:
+    info = {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or "unknown",
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+    }
+    try:
+        import psutil
+        info["memory_gb"] = round(psutil.virtual_memory().total / 1024 ** 3, 1)
+    except ImportError:
+        pass
+    try:
+        import torch
+        info["torch"] = torch.__version__
+        info["cuda"] = torch.cuda.get_device_name(0) if torch.cuda.is_available() else None
+        info["torch_threads"] = torch.get_num_threads()
+    except ImportError:
+        pass
+    return info
+
+
+def _timed(function, *args, **kwargs):
+    started_at = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started_at
+
+
+def _best_of(repeats: int, function, *args, **kwargs):
+    """Schnellster von ``repeats`` Läufen (weniger Rauschen durch andere Prozesse)"""
+    best = None
+    for _ in range(max(1, repeats)):
+        result, seconds = _timed(function, *args, **kwargs)
+        if best is None or seconds < best[1]:
+            best = (result, seconds)
+    return best
+
+
+def write_input(duration: float, speakers: int, seed: int, directory: str) -> tuple:
+    """Synthetische Aufnahme als Stereo-WAV mit 44.1 kHz schreiben"""
+    audio, turns = synthetic_meeting(duration, speakers, sample_rate=SOURCE_RATE, seed=seed)
+    path = os.path.join(directory, f"meeting_{int(duration)}s_{speakers}spk_seed{seed}.wav")
+    sf.write(path, np.stack([audio, audio], axis=1), SOURCE_RATE, subtype='PCM_16')
+    return path, turns
+
+
+def run_benchmark(durations, models, speakers: int = 3, seed: int = 0, repeats: int = 1,
+                  engine: str = None, profile: str = None, language: str = "de") -> dict:
+    # Import erst hier: initialisiert Whisper, PyAnnote und Ollama-Client wie der Server
+    from api.app import convert_audio_to_wav, diarization_client, ollama_client, protocol_generator, whisper_client
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="a2t_bench_") as directory:
+        # Modellunabhängige Stufen einmal je Aufnahmelänge
+        inputs = []
+        for duration in durations:
+            input_path, reference_turns = write_input(duration, speakers, seed, directory)
+            print(f"🎙️ {duration:.0f}s synthetic meeting, {speakers} speakers, {len(reference_turns)} turns")
+
+            converted_path, convert_seconds = _best_of(repeats, convert_audio_to_wav, input_path)
+            speakers_found, diarize_seconds = _best_of(repeats, diarization_client.identify_speakers,
+                                                       converted_path, engine=engine)
+            inputs.append((duration, reference_turns, converted_path, convert_seconds,
+                           speakers_found, diarize_seconds))
+
+        # Modelle außen: jedes Modell wird genau einmal (gemessen) geladen, damit
+        # transcribe nie einen Modellwechsel mitmisst
+        for model in models:
+            _, load_seconds = _timed(whisper_client.load_model, model)
+            print(f"📦 {model}: loaded in {load_seconds:.3f}s")
+
+            for duration, reference_turns, converted_path, convert_seconds, speakers_found, diarize_seconds in inputs:
+                if whisper_client.current_model_size != model:
+                    whisper_client.load_model(model)
+                transcript, transcribe_seconds = _best_of(
+                    repeats, whisper_client.transcribe_with_timestamps,
+                    converted_path, language=language, model_override=model, profile=profile)
+                merged, merge_seconds = _best_of(
+                    repeats, protocol_generator._merge_transcription_with_speakers,
+                    transcript.get("segments", []), speakers_found)
+                _, protocol_seconds = _best_of(
+                    repeats, ollama_client._generate_fallback_protocol, transcript.get("text", ""), speakers_found)
+
+                stages = {
+                    "convert": convert_seconds,
+                    "load_model": load_seconds,
+                    "transcribe": transcribe_seconds,
+                    "diarize": diarize_seconds,
+                    "merge": merge_seconds,
+                    "protocol": protocol_seconds,
+                }
+                results.append({
+                    "duration": duration,
+                    "model": model,
+                    "stages": {name: {"seconds": round(seconds, 4),
+                                      "real_time_factor": round(seconds / duration, 5)}
+                               for name, seconds in stages.items()},
+                    "segments": len(transcript.get("segments", [])),
+                    "speakers_reference": len({turn["speaker"] for turn in reference_turns}),
+                    "speakers_found": len({turn.get("speaker") for turn in speakers_found}),
+                    "merged_segments": len(merged),
+                })
+                print(f"   {duration:>6.0f}s {model:<9} "
+                      + "  ".join(f"{name} {seconds:7.3f}s" for name, seconds in stages.items()))
+
+        for _, _, converted_path, *_ in inputs:
+            if os.path.exists(converted_path) and not converted_path.startswith(directory):
+                os.remove(converted_path)
+
+    results.sort(key=lambda entry: (durations.index(entry["duration"]), models.index(entry["model"])))
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "config": {"durations": list(durations), "models": list(models), "speakers": speakers, "seed": seed,
+                   "repeats": repeats, "engine": engine, "profile": profile, "language": language},
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float = 0.2, min_delta: float = 0.05) -> list:
+    """Stufen, die gegenüber der Referenz langsamer geworden sind"""
+    reference = {(entry["duration"], entry["model"]): entry["stages"] for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in report["results"]:
+        stages = reference.get((entry["duration"], entry["model"]))
+        if stages is None:
+            continue
+        for name, current in entry["stages"].items():
+            if name not in stages:
+                continue
+            before, after = stages[name]["seconds"], current["seconds"]
+            if after - before > min_delta and after > before * (1 + tolerance):
+                regressions.append({"duration": entry["duration"], "model": entry["model"], "stage": name,
+                                    "baseline_seconds": before, "seconds": after,
+                                    "change": round(after / before - 1, 3) if before else None})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline benchmark with synthetic meeting audio")
+    parser.add_argument("--duration", type=float, action="append", help="Aufnahmelänge in Sekunden (mehrfach möglich)")
+    parser.add_argument("--model", action="append", help="Whisper-Modell (mehrfach möglich)")
+    parser.add_argument("--speakers", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=1, help="Bester von N Läufen je Stufe")
+    parser.add_argument("--engine", help="Diarization-Engine (pyannote, light, auto)")
+    parser.add_argument("--profile", help="Whisper Speed-Profil")
+    parser.add_argument("--json", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--baseline", help="Mit gespeicherter Referenz vergleichen")
+    parser.add_argument("--save-baseline", help="Ergebnis als neue Referenz speichern")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Erlaubte relative Verlangsamung")
+    parser.add_argument("--min-delta", type=float, default=0.05, help="Erlaubte absolute Verlangsamung in Sekunden")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.duration or [30.0, 120.0], args.model or ["tiny", "base"],
+                           speakers=args.speakers, seed=args.seed, repeats=args.repeats,
+                           engine=args.engine, profile=args.profile)
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"💾 Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("machine", {}).get("platform") != report["machine"]["platform"] or \
+                baseline.get("machine", {}).get("cpu_count") != report["machine"]["cpu_count"]:
+            print("⚠️ Baseline was recorded on a different machine, timings are not directly comparable")
+        regressions = compare(report, baseline, args.tolerance, args.min_delta)
+        for regression in regressions:
+            print(f"🐢 {regression['stage']} ({regression['model']}, {regression['duration']:.0f}s): "
+                  f"{regression['baseline_seconds']:.3f}s -> {regression['seconds']:.3f}s")
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) against {args.baseline}")
+            sys.exit(1)
+        print(f"✅ No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
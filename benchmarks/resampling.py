@@ -0,0 +1,138 @@
+"""
+Resampling-Benchmark: Polyphasen-Resampler vs. bisheriger librosa-Pfad
+
+    python -m benchmarks.resampling --seconds 600 --source-rate 48000 --source-rate 44100
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+from scipy import signal
+
+from services.audio.decoder import FFmpegDecoder
+from services.audio.resampler import Resampler
+
+TARGET_RATE = 16000
+
+
+def synthetic_audio(seconds: float, sample_rate: int, seed: int = 0) -> np.ndarray:
+    """Sprachähnliches Testsignal: modulierte Obertonreihe plus Rauschen"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 20))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 2.5 * t) ** 2
+    audio = 0.1 * voiced * envelope + 0.01 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+def _timed(function, *args):
+    started_at = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started_at
+
+
+def _stream(audio: np.ndarray, source_rate: int, block_seconds: float = 10.0) -> np.ndarray:
+    resampler = Resampler(source_rate, TARGET_RATE)
+    block = int(block_seconds * source_rate)
+    pieces = [resampler.process(audio[i:i + block]) for i in range(0, len(audio), block)]
+    pieces.append(resampler.flush())
+    return np.concatenate(pieces)
+
+
+def resampling_candidates():
+    """Verfügbare Verfahren: Name → Funktion(audio, source_rate)"""
+    candidates = {
+        "polyphase_stream": _stream,
+        "resample_poly": lambda audio, rate: signal.resample_poly(
+            audio, TARGET_RATE // np.gcd(rate, TARGET_RATE), rate // np.gcd(rate, TARGET_RATE)),
+    }
+    try:
+        import librosa
+        candidates["librosa"] = lambda audio, rate: librosa.resample(audio, orig_sr=rate, target_sr=TARGET_RATE)
+    except ImportError:
+        pass
+    try:
+        import soxr
+        candidates["soxr_hq"] = lambda audio, rate: soxr.resample(audio, rate, TARGET_RATE, quality='HQ')
+    except ImportError:
+        pass
+    return candidates
+
+
+def benchmark_resampling(seconds: float, source_rate: int, repeats: int = 3) -> dict:
+    audio = synthetic_audio(seconds, source_rate)
+    reference = None
+    results = {}
+    for name, function in resampling_candidates().items():
+        timings = []
+        for _ in range(repeats):
+            output, elapsed = _timed(function, audio, source_rate)
+            timings.append(elapsed)
+        if name == "resample_poly":
+            reference = output
+        results[name] = {"seconds": min(timings), "output": output}
+
+    for name, entry in results.items():
+        output = entry.pop("output")
+        length = min(len(output), len(reference))
+        entry["realtime_factor"] = entry["seconds"] / seconds
+        entry["max_deviation"] = float(np.max(np.abs(output[:length] - reference[:length])))
+    return results
+
+
+def benchmark_decode(seconds: float, source_rate: int) -> dict:
+    """Kompletter Ladepfad: neuer Decoder vs. librosa.load(sr=16000)"""
+    audio = synthetic_audio(seconds, source_rate)
+    path = os.path.join(tempfile.gettempdir(), f"a2t_resample_bench_{source_rate}.wav")
+    sf.write(path, audio, source_rate, subtype='PCM_16')
+    results = {}
+    try:
+        decoded, elapsed = _timed(FFmpegDecoder(TARGET_RATE).decode, path)
+        results["decoder"] = {"seconds": elapsed, "samples": len(decoded)}
+        try:
+            import librosa
+            decoded, elapsed = _timed(lambda: librosa.load(path, sr=TARGET_RATE, mono=True)[0])
+            results["librosa_load"] = {"seconds": elapsed, "samples": len(decoded)}
+        except ImportError:
+            pass
+    finally:
+        os.remove(path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resampling benchmark")
+    parser.add_argument("--seconds", type=float, default=300.0, help="Länge des Testsignals")
+    parser.add_argument("--source-rate", type=int, action="append", help="Quell-Samplerate (mehrfach möglich)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--json", help="Ergebnisse zusätzlich als JSON speichern")
+    args = parser.parse_args()
+
+    report = {}
+    for rate in args.source_rate or [48000, 44100]:
+        print(f"🎚️ {rate} Hz → {TARGET_RATE} Hz, {args.seconds:.0f}s audio")
+        report[str(rate)] = {
+            "resampling": benchmark_resampling(args.seconds, rate, args.repeats),
+            "decode": benchmark_decode(args.seconds, rate)
+        }
+        for name, entry in report[str(rate)]["resampling"].items():
+            print(f"   {name:<18} {entry['seconds']:8.3f}s  RTF {entry['realtime_factor']:.5f}  "
+                  f"max dev {entry['max_deviation']:.2e}")
+        for name, entry in report[str(rate)]["decode"].items():
+            print(f"   {name:<18} {entry['seconds']:8.3f}s  ({entry['samples']} samples)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
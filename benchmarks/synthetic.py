@@ -0,0 +1,96 @@
+"""
+Deterministische synthetische Besprechungsaufnahmen für Benchmarks
+
+Formant-Synthese ohne TTS: Pulsfolge mit sprecherspezifischer Grundfrequenz
+durch Vokal-Formantfilter, dazwischen Frikativ-Rauschen, Sprecherwechsel mit
+Pausen, gelegentliche längere Stille und Hintergrundrauschen. Gleicher Seed
+ergibt bitgenau dieselbe Aufnahme samt Sprecher-Referenz.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy import signal
+
+# Formanten (F1, F2, F3 in Hz) einiger Vokale
+VOWELS = {
+    "a": (730, 1090, 2440),
+    "e": (530, 1840, 2480),
+    "i": (270, 2290, 3010),
+    "o": (570, 840, 2410),
+    "u": (300, 870, 2240),
+}
+
+# Grundfrequenz und Formant-Skalierung je Sprecher (tiefe/mittlere/hohe Stimmen)
+VOICES = [
+    {"pitch": 105.0, "formant_scale": 0.92},
+    {"pitch": 210.0, "formant_scale": 1.12},
+    {"pitch": 145.0, "formant_scale": 1.0},
+    {"pitch": 245.0, "formant_scale": 1.18},
+    {"pitch": 125.0, "formant_scale": 0.97},
+]
+
+
+def _resonate(source: np.ndarray, frequency: float, bandwidth: float, sample_rate: int) -> np.ndarray:
+    """Zweipoliger Resonator (ein Formant)"""
+    r = np.exp(-np.pi * bandwidth / sample_rate)
+    a = [1.0, -2.0 * r * np.cos(2 * np.pi * frequency / sample_rate), r * r]
+    return signal.lfilter([1.0 - r], a, source)
+
+
+def _syllable(rng: np.random.Generator, voice: Dict, seconds: float, sample_rate: int) -> np.ndarray:
+    length = int(seconds * sample_rate)
+    t = np.arange(length) / sample_rate
+    pitch = voice["pitch"] * (1 + 0.06 * np.sin(2 * np.pi * rng.uniform(2, 5) * t + rng.uniform(0, 6.3)))
+    phase = np.cumsum(pitch) / sample_rate
+    pulses = np.diff(np.floor(phase), prepend=0.0)  # ein Impuls je Periode
+
+    formants = VOWELS[rng.choice(list(VOWELS))]
+    voiced = sum(_resonate(pulses, f * voice["formant_scale"], 60 + 0.06 * f, sample_rate) / (k + 1)
+                 for k, f in enumerate(formants))
+    envelope = np.sin(np.pi * t / seconds) ** 0.6
+    syllable = voiced * envelope
+
+    if rng.random() < 0.4:  # Frikativ am Silbenanfang
+        onset = int(min(0.06, seconds / 3) * sample_rate)
+        hiss = _resonate(rng.standard_normal(onset), rng.uniform(3000, 6000), 1500, sample_rate)
+        syllable[:onset] += 0.3 * hiss * np.hanning(onset)
+    return syllable
+
+
+def synthetic_meeting(duration: float, speakers: int = 3, sample_rate: int = 16000,
+                      seed: int = 0, noise_db: float = -40.0) -> Tuple[np.ndarray, List[Dict]]:
+    """Synthetische Besprechung mit ``speakers`` Stimmen.
+
+    Rückgabe: ``(audio, turns)`` mit float32-Audio und der Sprecher-Referenz
+    ``[{"start", "end", "speaker"}]`` (Format der Diarization).
+    """
+    rng = np.random.default_rng(seed)
+    total = int(duration * sample_rate)
+    audio = np.zeros(total, dtype=np.float64)
+    turns = []
+    voices = [VOICES[i % len(VOICES)] for i in range(max(1, speakers))]
+
+    position = rng.uniform(0.3, 1.0)
+    speaker = 0
+    while position < duration - 1.0:
+        turn_seconds = min(rng.uniform(2.0, 12.0), duration - position - 0.5)
+        cursor = position
+        while cursor < position + turn_seconds:
+            syllable_seconds = rng.uniform(0.12, 0.3)
+            start = int(cursor * sample_rate)
+            piece = _syllable(rng, voices[speaker], syllable_seconds, sample_rate)[:total - start]
+            audio[start:start + len(piece)] += piece
+            cursor += syllable_seconds + (rng.uniform(0.15, 0.4) if rng.random() < 0.2 else 0.02)
+        turns.append({"start": round(position, 3), "end": round(min(cursor, duration), 3),
+                      "speaker": f"SPEAKER_{speaker:02d}"})
+
+        pause = rng.uniform(0.3, 1.5) if rng.random() > 0.1 else rng.uniform(3.0, 6.0)
+        position = cursor + pause
+        if len(voices) > 1:
+            speaker = (speaker + int(rng.integers(1, len(voices)))) % len(voices)
+
+    peak = np.max(np.abs(audio)) or 1.0
+    audio = 0.5 * audio / peak
+    audio += 10 ** (noise_db / 20) * rng.standard_normal(total)
+    return np.clip(audio, -1.0, 1.0).astype(np.float32), turns
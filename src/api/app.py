@@ -1,12 +1,15 @@
 # src/api/app.py
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 from flask_cors import CORS
 import uuid
+import time
+import glob
+import shutil
 import os
 import sys
 from threading import Thread
-from datetime import datetime
-import librosa
+from datetime import datetime, timedelta
+from dataclasses import asdict
 import soundfile as sf
 import tempfile
 import numpy as np
@@ -17,13 +20,40 @@ import logging
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from config.settings import A2TSettings
-from services.ai.whisper_client import WhisperClient
+from services.ai.whisper_client import WhisperClient, WhisperClientPool
+from services.ai.two_pass import TwoPassTranscriber
+from services.ai.turn_transcriber import TurnTranscriber
+from services.ai.chunked import ChunkedTranscriber
+from services.ai.redecode import SelectiveRedecoder
+from services.ai.streaming import StreamingTranscriber
 from services.ai.diarization import SpeakerDiarization
+from services.ai.speaker_index import SpeakerIndex
 from services.ai.ollama_client import OllamaClient
-from services.protocol.generator import ProtocolGenerator
+from services.ai.stubs import StubDiarization, StubOllamaClient, StubWhisperClient
+from services.protocol.generator import ProtocolGenerator, ProtocolData
+from services.audio.vad import VoiceActivityDetector
+from services.audio.decoder import FFmpegDecoder, decode_audio
+from services.audio.processor import AudioProcessor
+from services.jobs.eta import MODELS_BY_ACCURACY, RuntimeModel
+from services.jobs.cancel import CancelToken, JobCancelled, cancellation_scope
+from services.jobs.scheduler import JOB_PRIORITIES, JobAdmission, PriorityGate
+from services.jobs.store import JobStore
+from services.monitoring.logs import job_context, job_logs, setup_logging
+from services.monitoring.profiler import JobProfiler
+from services.monitoring.tracing import FileSpanExporter, STATUS_ERROR, STATUS_OK, trace_id_for, tracer
+from services.monitoring.timing import JobTimings, current_rss_bytes, parameter_bytes, peak_rss_bytes
+from services.monitoring.metrics import (
+    registry as metrics_registry, time_stage, JOBS, JOBS_FINISHED,
+    COMPUTE_QUEUE_LENGTH, COMPUTE_ACTIVE_WORKERS, COMPUTE_SLOTS
+)
+
+# Asynchronous logging (queue + background writer) before any service starts logging
+setup_logging(A2TSettings.LOG_LEVEL, A2TSettings.LOG_FORMAT, A2TSettings.JOB_LOG_BUFFER_SIZE)
+logger = logging.getLogger(__name__)
 
 def create_app():
     """Application factory function"""
+    resume_jobs()
     return app
 
 app = Flask(__name__)
@@ -32,15 +62,23 @@ CORS(app)
 # Job-Management für Async Processing
 active_jobs = {}
 
+# Live streaming sessions (chunked HTTP ingest)
+stream_sessions = {}
+
 def log_progress(job_id, level, message, step=None):
-    """Helper function to log progress to console"""
-    print(f"[{level.upper()}] {message}")
+    """Helper function to log job progress (console and the job's log buffer)"""
+    logger.log(getattr(logging, level.upper(), logging.INFO), message,
+               extra={"job_id": job_id or None, "stage": step})
 
 class A2TJob:
-    def __init__(self, job_id: str, audio_file: str, model: str = None):
+    def __init__(self, job_id: str, audio_file: str, model: str = None, speed_profile: str = None,
+                 two_pass: bool = False, preview_model: str = None, redecode_model: str = None,
+                 skip_silence: bool = None, denoise: bool = None, diarization_engine: str = None,
+                 diarize_first: bool = None, profile: bool = False, priority: str = None):
         self.job_id = job_id
         self.audio_file = audio_file
         self.model = model or A2TSettings.WHISPER_MODEL  # Use setting default
+        self.speed_profile = speed_profile or A2TSettings.WHISPER_SPEED_PROFILE
         self.status = "queued"
         self.progress = 0
         self.result = None
@@ -48,6 +86,57 @@ class A2TJob:
         self.created_at = datetime.now()
         self.model_loading = False  # Flag for model loading status
         self.target_model = self.model  # Track target model
+        self.two_pass = two_pass
+        self.preview_model = preview_model or A2TSettings.TWO_PASS_PREVIEW_MODEL
+        self.display_pass = None  # "preview", "refining" or "final" in two-pass mode
+        self.partial_result = None
+        self.redecode_model = redecode_model  # Larger model for low-confidence segments
+        self.skip_silence = A2TSettings.VAD_ENABLED if skip_silence is None else skip_silence
+        self.denoise = A2TSettings.NOISE_REDUCTION_ENABLED if denoise is None else denoise
+        self.diarization_engine = diarization_engine or A2TSettings.DIARIZATION_ENGINE
+        self.diarization_progress = None  # per-window progress for long recordings
+        self.diarize_first = A2TSettings.DIARIZE_FIRST if diarize_first is None else diarize_first
+        self.transcription_progress = None  # per-turn progress in diarize-first mode
+        self.previous_result = None  # set while an appended part is processed
+        self.parts = [audio_file]  # uploaded recording parts in order
+        self.checkpoint = None  # JobCheckpoint when the job store is enabled
+        self.timings = JobTimings()  # per-stage wall/CPU/RSS accounting
+        self.profile = profile  # run under the sampling profiler / cProfile
+        self.profiler = None
+        self.audio_duration = None  # probed from the file header at submission
+        self.expected_seconds = None  # runtime estimate used for queue order and ETA
+        self.runtime_key = None  # (whisper model, diarization engine) the estimate is learned under
+        self.processing_started = None  # monotonic time the job left the queue
+        self.resumed = False  # restarted from a checkpoint (runtime not representative)
+        self.model_selection = None  # model=auto / deadline: chosen model and why
+        self.priority = priority or A2TSettings.JOB_DEFAULT_PRIORITY  # interactive, normal or bulk
+        self.cancel_token = None  # CancelToken of the current run (DELETE /api/v1/jobs/<id>)
+    
+    # Options that are needed to re-run the job after a restart
+    RECORD_FIELDS = ("job_id", "audio_file", "model", "speed_profile", "status", "error", "two_pass",
+                     "preview_model", "redecode_model", "skip_silence", "denoise", "diarization_engine",
+                     "diarize_first", "profile", "parts", "model_selection", "priority")
+    
+    def to_record(self) -> dict:
+        record = {name: getattr(self, name) for name in self.RECORD_FIELDS}
+        record["created_at"] = self.created_at.isoformat()
+        return record
+    
+    @classmethod
+    def from_record(cls, record: dict) -> "A2TJob":
+        job = cls(record["job_id"], record["audio_file"], record.get("model"), record.get("speed_profile"),
+                  two_pass=record.get("two_pass", False), preview_model=record.get("preview_model"),
+                  redecode_model=record.get("redecode_model"), skip_silence=record.get("skip_silence"),
+                  denoise=record.get("denoise"), diarization_engine=record.get("diarization_engine"),
+                  diarize_first=record.get("diarize_first"), profile=record.get("profile", False),
+                  priority=record.get("priority"))
+        job.status = record.get("status", "queued")
+        job.model_selection = record.get("model_selection")
+        job.error = record.get("error")
+        job.parts = record.get("parts") or [job.audio_file]
+        if record.get("created_at"):
+            job.created_at = datetime.fromisoformat(record["created_at"])
+        return job
 
 # Initialize AI Services for local operation
 print(f"🔧 Initializing A2T Services for local operation")
@@ -56,10 +145,142 @@ print(f"🔧 Initializing A2T Services for local operation")
 A2TSettings.print_startup_info()
 
 # Use "small" as default Whisper model for best balance of quality and speed
-whisper_client = WhisperClient(model_size=A2TSettings.WHISPER_MODEL)
-diarization_client = SpeakerDiarization()
-ollama_client = OllamaClient(base_url=A2TSettings.OLLAMA_BASE_URL)
-protocol_generator = ProtocolGenerator(ollama_client, whisper_client, diarization_client)
+if A2TSettings.STUB_ENGINES:
+    # Simulated engines for load tests of the job system (no models, no Ollama server)
+    WhisperEngine = StubWhisperClient
+    diarization_client = StubDiarization()
+    ollama_client = StubOllamaClient()
+else:
+    WhisperEngine = WhisperClient
+    diarization_client = SpeakerDiarization()
+    ollama_client = OllamaClient(base_url=A2TSettings.OLLAMA_BASE_URL)
+whisper_client = WhisperEngine(model_size=A2TSettings.WHISPER_MODEL)
+speaker_index = SpeakerIndex(A2TSettings.SPEAKER_INDEX_PATH, thresholds=A2TSettings.SPEAKER_MATCH_THRESHOLDS)
+
+# Shared FFmpeg pipe decoder (16 kHz mono float32)
+audio_decoder = FFmpegDecoder(sample_rate=16000)
+audio_processor = AudioProcessor()
+
+# Extra Whisper instances (preview models, parallel turn workers) and prioritised access to compute;
+# the main client is lent out as well, so its model is not loaded a second time
+whisper_pool = WhisperClientPool(max_idle_per_model=A2TSettings.WHISPER_PARALLEL_WORKERS,
+                                 client_factory=WhisperEngine, primary=whisper_client,
+                                 max_idle_total=A2TSettings.WHISPER_POOL_MAX_IDLE)
+compute_gate = PriorityGate(slots=A2TSettings.WHISPER_PARALLEL_WORKERS)
+
+# Job queue: expected runtime from a learned real-time factor, shortest job first with aging
+runtime_model = RuntimeModel(A2TSettings.ETA_MODEL_PATH, overhead_seconds=A2TSettings.ETA_OVERHEAD_SECONDS)
+job_admission = JobAdmission(slots=max(1, A2TSettings.MAX_CONCURRENT_JOBS), aging=A2TSettings.SCHEDULER_AGING)
+turn_transcriber = TurnTranscriber(
+    whisper_pool, compute_gate,
+    workers=A2TSettings.WHISPER_PARALLEL_WORKERS,
+    min_turn_seconds=A2TSettings.DIARIZE_FIRST_MIN_TURN_SECONDS,
+    max_turn_seconds=A2TSettings.DIARIZE_FIRST_MAX_TURN_SECONDS
+)
+chunked_transcriber = ChunkedTranscriber(whisper_pool, compute_gate, chunk_seconds=A2TSettings.CHECKPOINT_CHUNK_SECONDS)
+protocol_generator = ProtocolGenerator(ollama_client, whisper_client, diarization_client, speaker_index,
+                                       turn_transcriber=turn_transcriber, chunked_transcriber=chunked_transcriber,
+                                       whisper_pool=whisper_pool, compute_gate=compute_gate)
+
+# Gauges evaluated on each /metrics scrape
+def count_jobs_by_status():
+    counts = {(status,): 0 for status in ("queued", "processing", "completed", "failed", "cancelled")}
+    for job in list(active_jobs.values()):
+        counts[(job.status,)] = counts.get((job.status,), 0) + 1
+    return counts
+
+JOBS.set_function(count_jobs_by_status)
+COMPUTE_QUEUE_LENGTH.set_function(compute_gate.waiting)
+COMPUTE_ACTIVE_WORKERS.set_function(compute_gate.active)
+COMPUTE_SLOTS.set_function(lambda: compute_gate.slots)
+
+# Span export for /api/v1/jobs/<id>/trace (OTLP-JSON files, pruned with the job retention)
+if A2TSettings.TRACING_ENABLED:
+    tracer.exporter = FileSpanExporter(A2TSettings.TRACE_PATH)
+    tracer.exporter.prune(A2TSettings.JOB_RETENTION_HOURS)
+
+# Durable job records and checkpoints (resume after restart)
+job_store = JobStore(A2TSettings.JOB_STORE_PATH) if A2TSettings.JOB_STORE_ENABLED else None
+
+# Intermediate checkpoints of one pipeline run (cleared once the result is stored)
+PIPELINE_CHECKPOINTS = ("transcript", "transcript_chunks", "turns", "diarization")
+two_pass_transcriber = TwoPassTranscriber(
+    whisper_pool, compute_gate, window_seconds=A2TSettings.TWO_PASS_WINDOW_SECONDS
+)
+selective_redecoder = SelectiveRedecoder(whisper_pool, compute_gate)
+voice_activity_detector = VoiceActivityDetector(
+    margin_db=A2TSettings.VAD_MARGIN_DB,
+    min_speech_seconds=A2TSettings.VAD_MIN_SPEECH_SECONDS,
+    min_silence_seconds=A2TSettings.VAD_MIN_SILENCE_SECONDS,
+    padding_seconds=A2TSettings.VAD_PADDING_SECONDS
+)
+
+def persist_job(job: A2TJob):
+    """Write the job record to the job store (no-op when disabled)"""
+    if job_store is None:
+        return
+    try:
+        checkpoint = job.checkpoint or job_store.checkpoint(job.job_id)
+        checkpoint.save("job", job.to_record())
+    except Exception as store_error:
+        log_progress(job.job_id, "warning", f"Could not persist job record: {store_error}")
+
+def remove_silence(job: A2TJob, audio_path: str):
+    """Cut silence out of the audio before Whisper and PyAnnote.
+    Returns (speech_audio_path, speech_timeline) or (audio_path, None) if nothing to skip."""
+    audio = decode_audio(audio_path)
+    speech_audio, speech_timeline = voice_activity_detector.compact(audio)
+    stats = speech_timeline.get_stats()
+    log_progress(job.job_id, "info", f"VAD: {stats['speech_regions']} speech regions, "
+                                     f"{stats['skipped_seconds']:.1f}s of {stats['original_duration']:.1f}s silence")
+    
+    if len(speech_audio) == 0 or stats["skipped_seconds"] < 1.0:
+        log_progress(job.job_id, "info", "VAD: nothing worth skipping, using full audio")
+        return audio_path, None
+    
+    speech_path = os.path.join(tempfile.gettempdir(), f"{job.job_id}_speech.wav")
+    sf.write(speech_path, speech_audio, 16000, format='WAV', subtype='PCM_16')
+    return speech_path, speech_timeline
+
+def report_diarization_progress(job: A2TJob, window: int, windows: int, processed_seconds: float):
+    """Per-window progress of long-form diarization"""
+    job.diarization_progress = {
+        "window": window,
+        "windows": windows,
+        "processed_seconds": processed_seconds
+    }
+    if windows:
+        job.progress = max(job.progress, 70 + int(15 * window / windows))
+    log_progress(job.job_id, "info", f"Diarization window {window}/{windows or '?'} ({processed_seconds / 60:.1f} min)")
+
+def report_transcription_progress(job: A2TJob, done: int, total: int, transcribed_seconds: float):
+    """Per-turn progress of diarize-first transcription"""
+    job.transcription_progress = {
+        "turns_done": done,
+        "turns": total,
+        "transcribed_seconds": transcribed_seconds
+    }
+    job.progress = max(job.progress, 40 + int(45 * done / total))
+    log_progress(job.job_id, "info", f"Speaker turn {done}/{total} transcribed")
+
+def run_two_pass_transcription(job: A2TJob, audio_path: str) -> dict:
+    """Preview pass with a small model, then background refinement with the job's model"""
+    def publish(pass_name, partial):
+        job.display_pass = pass_name
+        job.partial_result = partial
+        if partial.get("duration"):
+            job.progress = 30 + int(40 * partial["refined_until"] / partial["duration"])
+        log_progress(job.job_id, "info", f"Two-pass update: {pass_name} (refined until {partial['refined_until']:.1f}s)")
+    
+    log_progress(job.job_id, "info", f"Two-pass mode: preview '{job.preview_model}', final '{job.model}'")
+    return two_pass_transcriber.transcribe(
+        audio_path,
+        preview_model=job.preview_model,
+        final_model=job.model,
+        language=A2TSettings.WHISPER_LANGUAGE,
+        profile=job.speed_profile,
+        on_update=publish
+    )
 
 def process_audio_async(job: A2TJob):
     """Background processing function with enhanced debugging"""
@@ -67,9 +288,11 @@ def process_audio_async(job: A2TJob):
         log_progress(job.job_id, "info", f"Starting async processing for job {job.job_id}")
         job.status = "processing"
         job.progress = 10
+        persist_job(job)
         
         log_progress(job.job_id, "info", f"Processing audio file: {job.audio_file}")
         log_progress(job.job_id, "info", f"Using Whisper model: {job.model}")
+        log_progress(job.job_id, "info", f"Using speed profile: {job.speed_profile}")
         
         # File path should already be absolute
         audio_path = job.audio_file
@@ -94,9 +317,36 @@ def process_audio_async(job: A2TJob):
         
         # Convert audio to WAV for better Whisper compatibility
         log_progress(job.job_id, "info", f"Converting audio to optimal WAV format...")
-        converted_audio_path = convert_audio_to_wav(audio_path)
+        with time_stage("convert"):
+            converted_audio_path = convert_audio_to_wav(audio_path)
         log_progress(job.job_id, "info", f"Audio conversion completed: {converted_audio_path}")
         
+        # Optional in-pipeline preprocessing stages working on the converted WAV
+        pipeline_audio_path = converted_audio_path
+        speech_timeline = None
+        noise_reduction = None
+        
+        if job.denoise:
+            try:
+                denoised_path = os.path.join(tempfile.gettempdir(), f"{job.job_id}_denoised.wav")
+                log_progress(job.job_id, "info", f"Reducing noise (spectral gating)...")
+                with time_stage("denoise"):
+                    noise_reduction = audio_processor.denoise_file(converted_audio_path, denoised_path)
+                pipeline_audio_path = denoised_path
+            except Exception as denoise_error:
+                log_progress(job.job_id, "warning", f"Noise reduction failed, using original audio: {denoise_error}")
+        
+        # Optionally skip silence; timestamps are mapped back by the protocol generator
+        if job.skip_silence:
+            try:
+                with time_stage("vad"):
+                    speech_audio_path, speech_timeline = remove_silence(job, pipeline_audio_path)
+                if speech_audio_path != pipeline_audio_path and pipeline_audio_path != converted_audio_path:
+                    os.remove(pipeline_audio_path)
+                pipeline_audio_path = speech_audio_path
+            except Exception as vad_error:
+                log_progress(job.job_id, "warning", f"Silence skipping failed, using full audio: {vad_error}")
+        
         # Process audio through pipeline with selected model
         job.progress = 20
         
@@ -114,35 +364,115 @@ def process_audio_async(job: A2TJob):
             log_progress(job.job_id, "info", f"Calling protocol_generator.process_audio_to_protocol")
             job.model_loading = False  # Model should be loaded now
             job.progress = 25
-            result = protocol_generator.process_audio_to_protocol(converted_audio_path, whisper_model=job.model)
+            transcript_result = None
+            if job.checkpoint is not None and (job.two_pass or job.redecode_model):
+                transcript_result = job.checkpoint.load("transcript")
+                if transcript_result is not None:
+                    log_progress(job.job_id, "info", "Resuming with checkpointed transcription")
+            resumed_transcript = transcript_result is not None
+            
+            if job.two_pass and not resumed_transcript:
+                with time_stage("transcribe"):
+                    transcript_result = run_two_pass_transcription(job, pipeline_audio_path)
+            
+            if job.redecode_model and not resumed_transcript:
+                # Fast first pass, then re-decode only the low-confidence ranges
+                if transcript_result is None:
+                    with time_stage("transcribe"), protocol_generator.whisper_session(job.model) as client:
+                        transcript_result = client.transcribe_with_timestamps(
+                            pipeline_audio_path,
+                            language=A2TSettings.WHISPER_LANGUAGE,
+                            model_override=job.model,
+                            profile=job.speed_profile
+                        )
+                job.progress = 50
+                log_progress(job.job_id, "info", f"Re-decoding low-confidence segments with: {job.redecode_model}")
+                with time_stage("redecode"):
+                    transcript_result = selective_redecoder.refine(
+                        pipeline_audio_path,
+                        transcript_result,
+                        model=job.redecode_model,
+                        language=A2TSettings.WHISPER_LANGUAGE,
+                        profile=job.speed_profile
+                    )
+            
+            if job.checkpoint is not None and transcript_result is not None and not resumed_transcript:
+                job.checkpoint.save("transcript", transcript_result)
+            
+            pipeline_options = dict(
+                whisper_model=job.model,
+                speed_profile=job.speed_profile,
+                transcript_result=transcript_result,
+                speech_timeline=speech_timeline,
+                diarization_engine=job.diarization_engine,
+                diarization_progress=lambda window, windows, seconds: report_diarization_progress(job, window, windows, seconds),
+                diarize_first=job.diarize_first,
+                transcription_progress=lambda done, total, seconds: report_transcription_progress(job, done, total, seconds),
+                checkpoint=job.checkpoint
+            )
+            if job.previous_result is not None:
+                # Appended part: only the new audio is processed, then merged into the existing result
+                log_progress(job.job_id, "info", f"Appending part {len(job.parts)} to existing result")
+                result = protocol_generator.append_to_protocol(job.previous_result, pipeline_audio_path, **pipeline_options)
+            else:
+                result = protocol_generator.process_audio_to_protocol(pipeline_audio_path, **pipeline_options)
+                result.audio_file = converted_audio_path
+            if job.two_pass:
+                job.display_pass = "final"
+                result.metadata["two_pass"] = True
+                result.metadata["preview_model"] = job.preview_model
+            if noise_reduction:
+                result.metadata["noise_reduction"] = noise_reduction
+            if job.model_selection:
+                result.metadata["model_selection"] = job.model_selection
+            if transcript_result and "redecode" in transcript_result:
+                result.metadata["redecode"] = transcript_result["redecode"]
             log_progress(job.job_id, "info", f"Protocol generation completed successfully")
             
         except Exception as processing_error:
             log_progress(job.job_id, "error", f"Protocol generation failed: {processing_error}")
             log_progress(job.job_id, "info", f"Creating fallback result due to error: {type(processing_error).__name__}")
             
-            # Create fallback result
-            from services.protocol.generator import ProtocolData
-            result = ProtocolData(
-                audio_file=converted_audio_path,
-                transcript=f"Processing failed: {str(processing_error)}",
-                segments=[],
-                speakers=[],
-                protocol_text=f"# Processing Error\n\nAudio processing failed with error:\n{str(processing_error)}\n\nThis may be due to audio format compatibility issues.",
-                metadata={
-                    "language": "de",
-                    "duration": 0,
-                    "speaker_count": 0,
-                    "segments_count": 0,
-                    "diarization_available": False,
-                    "error": str(processing_error),
-                    "error_type": type(processing_error).__name__
-                }
-            )
+            # Create fallback result (an appended part that fails keeps the earlier result)
+            if job.previous_result is not None:
+                result = job.previous_result
+                result.metadata["append_error"] = str(processing_error)
+            else:
+                result = ProtocolData(
+                    audio_file=converted_audio_path,
+                    transcript=f"Processing failed: {str(processing_error)}",
+                    segments=[],
+                    speakers=[],
+                    protocol_text=f"# Processing Error\n\nAudio processing failed with error:\n{str(processing_error)}\n\nThis may be due to audio format compatibility issues.",
+                    metadata={
+                        "language": "de",
+                        "duration": 0,
+                        "speaker_count": 0,
+                        "segments_count": 0,
+                        "diarization_available": False,
+                        "whisper_profile": job.speed_profile,
+                        "error": str(processing_error),
+                        "error_type": type(processing_error).__name__
+                    }
+                )
         
+        result.metadata["timings"] = job.timings.summary()
         job.progress = 100
         job.status = "completed"
         job.result = result
+        job.previous_result = None
+        if job.checkpoint is not None:
+            job.checkpoint.save("result", asdict(result))
+            job.checkpoint.clear("previous_result", *PIPELINE_CHECKPOINTS)
+        persist_job(job)
+        JOBS_FINISHED.inc(status="completed")
+        
+        # Cleanup denoised / speech-only audio file
+        if pipeline_audio_path != converted_audio_path:
+            try:
+                os.remove(pipeline_audio_path)
+            except Exception as cleanup_error:
+                log_progress(job.job_id, "error", f"Failed to cleanup speech audio file: {cleanup_error}")
         
         # Cleanup converted audio file if different from original
         if converted_audio_path != audio_path:
@@ -158,12 +488,202 @@ def process_audio_async(job: A2TJob):
     except Exception as e:
         job.status = "failed"
         job.error = str(e)
+        persist_job(job)
+        JOBS_FINISHED.inc(status="failed")
         log_progress(job.job_id, "error", f"Audio processing failed for job {job.job_id}: {e}")
         log_progress(job.job_id, "info", f"Error type: {type(e).__name__}")
         import traceback
         log_progress(job.job_id, "info", f"Full traceback:")
         traceback.print_exc()
 
+def resident_models() -> set:
+    """Whisper models that are loaded right now (no load time before a job can use them)"""
+    return {whisper_client.current_model_size, *whisper_pool.resident_models()}
+
+def select_model(audio_duration, diarization_engine: str, deadline_seconds: float = None,
+                 max_model: str = None, priority: str = None):
+    """Most accurate Whisper model expected to finish within the deadline, given the
+    learned real-time factors, which models are loaded and the current queue.
+    Without a deadline the audio duration times AUTO_MODEL_DEADLINE_FACTOR is used."""
+    candidates = [model for model in A2TSettings.AUTO_MODEL_CANDIDATES if model in WhisperClient.AVAILABLE_MODELS]
+    if max_model in MODELS_BY_ACCURACY:
+        limit = MODELS_BY_ACCURACY.index(max_model)
+        candidates = [model for model in candidates if MODELS_BY_ACCURACY.index(model) <= limit] or [max_model]
+    if deadline_seconds is None and audio_duration is not None:
+        deadline_seconds = audio_duration * A2TSettings.AUTO_MODEL_DEADLINE_FACTOR
+    queue_priority = JOB_PRIORITIES.get(priority or A2TSettings.JOB_DEFAULT_PRIORITY, JOB_PRIORITIES["normal"])
+    model, selection = runtime_model.select_model(
+        audio_duration, diarization_client.resolve_engine(diarization_engine), deadline_seconds,
+        wait_seconds=job_admission.estimated_wait(queue_priority), candidates=candidates, resident=resident_models()
+    )
+    if model is None:
+        model = max_model or A2TSettings.WHISPER_MODEL
+        selection["model"] = model
+    return model, selection
+
+def estimate_runtime(job: A2TJob):
+    """Probe the audio duration (container header only) and predict the job's runtime"""
+    job.audio_duration = audio_decoder.probe_duration(job.audio_file)
+    job.runtime_key = (job.model, diarization_client.resolve_engine(job.diarization_engine))
+    job.expected_seconds = runtime_model.estimate(job.audio_duration, *job.runtime_key,
+                                                  loaded=job.model in resident_models())
+    if job.expected_seconds is not None:
+        log_progress(job.job_id, "info", f"Audio duration {job.audio_duration:.1f}s, "
+                                         f"expected runtime {job.expected_seconds:.0f}s")
+
+def job_eta(job: A2TJob):
+    """Queue position, expected wait and remaining runtime of an unfinished job"""
+    if job.status in ("completed", "failed", "cancelled") or job.expected_seconds is None:
+        return None
+    if job.processing_started is None:
+        wait_seconds = job_admission.estimated_start(job.job_id) or 0.0
+        remaining_seconds = wait_seconds + job.expected_seconds
+    else:
+        wait_seconds = 0.0
+        elapsed = time.monotonic() - job.processing_started
+        remaining_seconds = max(0.0, job.expected_seconds - elapsed)
+    return {
+        "audio_duration": job.audio_duration,
+        "expected_runtime_seconds": round(job.expected_seconds, 1),
+        "queue_position": job_admission.position(job.job_id),
+        "wait_seconds": round(wait_seconds, 1),
+        "remaining_seconds": round(remaining_seconds, 1),
+        "estimated_completion": (datetime.now() + timedelta(seconds=remaining_seconds)).isoformat()
+    }
+
+def start_job(job: A2TJob):
+    """Register a job and start background processing"""
+    active_jobs[job.job_id] = job
+    job.processing_started = None
+    job.cancel_token = CancelToken()
+    estimate_runtime(job)
+    if job_store is not None and job.checkpoint is None:
+        job.checkpoint = job_store.checkpoint(job.job_id)
+    persist_job(job)
+    args = (run_traced_job, job)
+    if job.profile:
+        job.profiler = JobProfiler(job_profile_dir(job.job_id), interval=A2TSettings.PROFILE_SAMPLE_INTERVAL_MS / 1000)
+        args = (job.profiler.run,) + args
+    Thread(target=job.timings.run, args=args, name=f"job-{job.job_id[:8]}").start()
+
+def run_traced_job(job: A2TJob):
+    """Run the pipeline inside the job's parent span; stage spans become its children"""
+    attributes = {
+        "job.id": job.job_id, "job.part": len(job.parts), "whisper.model": job.model,
+        "whisper.profile": job.speed_profile, "job.two_pass": job.two_pass, "job.diarize_first": job.diarize_first,
+        "diarization.engine": job.diarization_engine, "job.redecode_model": job.redecode_model
+    }
+    with job_context(job.job_id), cancellation_scope(job.cancel_token), \
+            tracer.span("job", trace_id=trace_id_for(job.job_id), **attributes) as span:
+        span.set_attributes(**{"audio.probed_seconds": job.audio_duration, "job.expected_seconds": job.expected_seconds,
+                               "job.priority": job.priority})
+        queue_priority = JOB_PRIORITIES.get(job.priority, JOB_PRIORITIES["normal"])
+        try:
+            with time_stage("queue"):
+                job_admission.acquire(job.job_id, job.expected_seconds, queue_priority)
+            job.processing_started = time.monotonic()
+            loads_before = len(job.timings.model_loads)
+            try:
+                process_audio_async(job)
+            finally:
+                job_admission.release(job.job_id)
+        except JobCancelled as cancelled:
+            finish_cancelled(job, str(cancelled))
+            span.set_attribute("job.status", job.status)
+            span.set_attribute("job.cancelled", True)
+            return
+        load_seconds = sum(load["seconds"] for load in job.timings.model_loads[loads_before:]
+                           if load["kind"] == "whisper" and load["model"] == job.model)
+        learn_runtime(job, time.monotonic() - job.processing_started, load_seconds)
+        job.resumed = False
+        span.set_attribute("job.status", job.status)
+        if job.result is not None:
+            span.set_attribute("audio.duration_seconds", job.result.metadata.get("duration"))
+        if job.status == "failed":
+            span.set_status(STATUS_ERROR, job.error)
+        else:
+            span.set_status(STATUS_OK)
+
+def remove_job_files(job: A2TJob, parts=None):
+    """Delete the job's intermediate audio (converted, denoised, speech-only) and the given uploads"""
+    for path in glob.glob(os.path.join(tempfile.gettempdir(), f"{job.job_id}_*")) + list(parts or []):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def finish_cancelled(job: A2TJob, reason: str):
+    """Wrap up a cancelled run. A cancelled appended part is dropped and the job
+    keeps its earlier result; otherwise the job ends as 'cancelled' without uploads."""
+    if job.previous_result is not None:
+        remove_job_files(job, parts=job.parts[-1:])
+        job.parts.pop()
+        job.audio_file = job.parts[-1]
+        job.result = job.previous_result
+        job.previous_result = None
+        job.status = "completed"
+        job.progress = 100
+        if job.checkpoint is not None:
+            job.checkpoint.clear("previous_result", *PIPELINE_CHECKPOINTS)
+    else:
+        remove_job_files(job, parts=job.parts)
+        job.status = "cancelled"
+        job.error = reason
+        if job.checkpoint is not None:
+            job.checkpoint.clear(*PIPELINE_CHECKPOINTS)
+    job.partial_result = None
+    persist_job(job)
+    JOBS_FINISHED.inc(status="cancelled")
+    log_progress(job.job_id, "warning", f"Job {job.job_id} cancelled: {reason}")
+
+def learn_runtime(job: A2TJob, seconds: float, load_seconds: float = 0.0):
+    """Feed the runtime of a cleanly completed job into the ETA model"""
+    if job.status != "completed" or job.resumed or job.profile or job.runtime_key is None:
+        return
+    if job.result is None or "error" in job.result.metadata or "append_error" in job.result.metadata:
+        return
+    runtime_model.observe(job.audio_duration, seconds, *job.runtime_key, load_seconds=load_seconds)
+
+def job_profile_dir(job_id: str) -> str:
+    return os.path.abspath(os.path.join(A2TSettings.PROFILE_PATH, job_id))
+
+_jobs_resumed = False
+
+def resume_jobs():
+    """Restore stored jobs after a restart: finished jobs keep their result,
+    interrupted ones are re-queued and continue from their last checkpoint"""
+    global _jobs_resumed
+    if job_store is None or _jobs_resumed:
+        return
+    _jobs_resumed = True
+    
+    for record in job_store.load_jobs(max_age_hours=A2TSettings.JOB_RETENTION_HOURS):
+        try:
+            job = A2TJob.from_record(record)
+            job.checkpoint = job_store.checkpoint(job.job_id)
+            if job.status == "completed":
+                stored_result = job.checkpoint.load("result")
+                job.result = ProtocolData(**stored_result) if stored_result else None
+                job.progress = 100
+                active_jobs[job.job_id] = job
+            elif job.status in ("failed", "cancelled"):
+                active_jobs[job.job_id] = job
+            elif not os.path.exists(job.audio_file):
+                job.status = "failed"
+                job.error = f"Audio file lost during restart: {job.audio_file}"
+                active_jobs[job.job_id] = job
+                persist_job(job)
+            else:
+                stored_previous = job.checkpoint.load("previous_result")
+                if stored_previous:
+                    job.previous_result = ProtocolData(**stored_previous)
+                job.status = "queued"
+                job.resumed = True
+                log_progress(job.job_id, "info", f"Resuming interrupted job {job.job_id} from checkpoint")
+                start_job(job)
+        except Exception as resume_error:
+            log_progress(record.get("job_id", ""), "error", f"Could not restore job: {resume_error}")
+
 def convert_audio_to_wav(audio_path: str) -> str:
     """
     Convert any audio file to WAV format for better Whisper compatibility
@@ -186,54 +706,101 @@ def convert_audio_to_wav(audio_path: str) -> str:
         # If already WAV and reasonable size, check if it needs processing
         if ext == '.wav':
             try:
-                # Quick check if WAV is already optimal
-                audio, sr = librosa.load(audio_path, sr=None, duration=1.0)  # Load just 1 second to test
-                if sr == 16000 and len(audio.shape) == 1:  # Mono, 16kHz
-                    log_progress("", "info", f"WAV file already optimal: {sr}Hz, mono")
-                    return audio_path
+                # Quick header-only check if WAV is already optimal
+                info = sf.info(audio_path)
+                if info.samplerate == 16000 and info.channels == 1:
+                    if not A2TSettings.LOUDNESS_NORMALIZATION:
+                        log_progress("", "info", f"WAV file already optimal: {info.samplerate}Hz, mono")
+                        return audio_path
+                    # Read-only loudness check; rewrite only if the gain is outside the tolerance
+                    loudness = audio_processor.measure_loudness_file(audio_path)
+                    if loudness["within_tolerance"]:
+                        log_progress("", "info", f"WAV file already optimal: {info.samplerate}Hz, mono, "
+                                     f"{loudness['integrated_lufs']:.1f} LUFS (gain {loudness['gain_db']:+.1f} dB)")
+                        return audio_path
+                    log_progress("", "info", f"WAV needs loudness normalization (gain {loudness['gain_db']:+.1f} dB, "
+                                 f"true peak {loudness['true_peak_dbtp']:.1f} dBTP)")
                 else:
-                    log_progress("", "info", f"WAV needs reprocessing: {sr}Hz, shape: {audio.shape}")
+                    log_progress("", "info", f"WAV needs reprocessing: {info.samplerate}Hz, channels: {info.channels}")
             except Exception as e:
                 log_progress("", "warning", f"WAV check failed, will reprocess: {e}")
         
-        # Load full audio with librosa (handles most formats)
-        log_progress("", "info", f"Loading audio with librosa...")
-        audio, sr = librosa.load(audio_path, sr=16000, mono=True)
-        log_progress("", "info", f"Audio loaded: {len(audio)} samples at {sr}Hz")
-        
-        # Handle edge cases
-        if len(audio) == 0:
-            log_progress("", "warning", f"Empty audio detected, creating silence")
-            audio = np.zeros(16000)  # 1 second silence
-        elif len(audio) < 1600:  # Less than 0.1 seconds
-            log_progress("", "warning", f"Very short audio ({len(audio)} samples), padding")
-            audio = np.pad(audio, (0, 16000 - len(audio)), mode='constant')
-        
-        # Normalize audio to prevent clipping
-        if np.max(np.abs(audio)) > 0:
-            max_val = np.max(np.abs(audio))
-            if max_val > 1.0:
-                audio = audio / max_val * 0.95
-                log_progress("", "info", f"Normalized audio (max was: {max_val:.3f})")
-        else:
-            log_progress("", "warning", f"Audio appears to be silent")
-        
         # Create output path for converted WAV
         temp_dir = tempfile.gettempdir()
         base_name = os.path.splitext(os.path.basename(audio_path))[0]
         wav_filename = f"{base_name}_converted.wav"
         wav_path = os.path.join(temp_dir, wav_filename)
         
-        log_progress("", "info", f"Saving converted WAV to: {wav_path}")
-        
-        # Save as WAV with consistent format (16-bit PCM, 16kHz, mono)
-        sf.write(wav_path, audio, 16000, format='WAV', subtype='PCM_16')
+        if audio_decoder.available:
+            # Stream PCM blocks from the FFmpeg pipe straight into the WAV file (bounded memory)
+            log_progress("", "info", f"Decoding audio with FFmpeg pipe to: {wav_path}")
+            total_samples = 0
+            peak = 0.0
+            loudness_meter = audio_processor.create_loudness_meter()
+            with sf.SoundFile(wav_path, mode='w', samplerate=16000, channels=1,
+                              format='WAV', subtype='PCM_16') as wav_file:
+                for block in audio_decoder.iter_blocks(audio_path):
+                    peak = max(peak, float(np.max(np.abs(block))) if len(block) else 0.0)
+                    loudness_meter.update(block)
+                    # Float sources may exceed full scale; clip instead of wrapping in PCM_16
+                    wav_file.write(np.clip(block, -1.0, 1.0))
+                    total_samples += len(block)
+                
+                # Handle edge cases
+                if total_samples < 1600:  # Less than 0.1 seconds
+                    log_progress("", "warning", f"Very short audio ({total_samples} samples), padding")
+                    wav_file.write(np.zeros(16000 - total_samples, dtype=np.float32))
+                    total_samples = 16000
+            
+            if peak == 0:
+                log_progress("", "warning", f"Audio appears to be silent")
+            elif peak > 1.0:
+                log_progress("", "warning", f"Audio exceeded full scale (max was: {peak:.3f}), clipped")
+            
+            if A2TSettings.LOUDNESS_NORMALIZATION and peak > 0:
+                # Measured while decoding; only the gain stage touches the file again
+                loudness = audio_processor.normalize_loudness_in_place(wav_path, loudness_meter.result())
+                log_progress("", "info", f"Loudness normalized: {loudness['integrated_lufs']:.1f} LUFS "
+                             f"→ {loudness['target_lufs']:.1f} LUFS (gain {loudness['gain_db']:+.1f} dB)")
+        else:
+            # Decode in-process (native rate + polyphase resampling to 16 kHz)
+            log_progress("", "info", f"Decoding audio without FFmpeg...")
+            audio = decode_audio(audio_path)
+            log_progress("", "info", f"Audio loaded: {len(audio)} samples at 16000Hz")
+            
+            # Handle edge cases
+            if len(audio) == 0:
+                log_progress("", "warning", f"Empty audio detected, creating silence")
+                audio = np.zeros(16000)  # 1 second silence
+            elif len(audio) < 1600:  # Less than 0.1 seconds
+                log_progress("", "warning", f"Very short audio ({len(audio)} samples), padding")
+                audio = np.pad(audio, (0, 16000 - len(audio)), mode='constant')
+            
+            if A2TSettings.LOUDNESS_NORMALIZATION and np.max(np.abs(audio)) > 0:
+                audio, loudness = audio_processor.loudness.normalize(audio)
+                audio = np.clip(audio, -1.0, 1.0)
+                log_progress("", "info", f"Loudness normalized: {loudness['integrated_lufs']:.1f} LUFS "
+                             f"→ {loudness['target_lufs']:.1f} LUFS (gain {loudness['gain_db']:+.1f} dB)")
+            # Normalize audio to prevent clipping
+            elif np.max(np.abs(audio)) > 0:
+                max_val = np.max(np.abs(audio))
+                if max_val > 1.0:
+                    audio = audio / max_val * 0.95
+                    log_progress("", "info", f"Normalized audio (max was: {max_val:.3f})")
+            else:
+                log_progress("", "warning", f"Audio appears to be silent")
+            
+            log_progress("", "info", f"Saving converted WAV to: {wav_path}")
+            
+            # Save as WAV with consistent format (16-bit PCM, 16kHz, mono)
+            sf.write(wav_path, audio, 16000, format='WAV', subtype='PCM_16')
+            total_samples = len(audio)
         
         # Verify converted file
         if os.path.exists(wav_path):
             converted_size = os.path.getsize(wav_path)
             log_progress("", "info", f"Conversion successful: {converted_size} bytes")
-            log_progress("", "info", f"Duration: {len(audio) / 16000:.2f} seconds")
+            log_progress("", "info", f"Duration: {total_samples / 16000:.2f} seconds")
             return wav_path
         else:
             raise Exception("Failed to save converted WAV file")
@@ -261,6 +828,7 @@ def home():
         "endpoints": {
             "transcribe": "/api/v1/transcribe",
             "status": "/api/v1/status/<job_id>",
+            "stream": "/api/v1/stream",
             "config": "/api/v1/config",
             "models": "/api/v1/models",
             "web": "/web"
@@ -281,6 +849,11 @@ def health():
         "service": "A2T-DreamMall"
     })
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics (text exposition format)"""
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/v1/config', methods=['GET'])
 def get_configuration():
     """Get current system configuration and requirements"""
@@ -306,9 +879,28 @@ def get_available_models():
     return jsonify({
         "current_model": whisper_client.current_model_size,
         "available_models": whisper_client.AVAILABLE_MODELS,
-        "model_info": whisper_client.get_model_info()
+        "model_info": whisper_client.get_model_info(),
+        "speed_profiles": A2TSettings.WHISPER_DECODING_PROFILES,
+        "default_speed_profile": A2TSettings.WHISPER_SPEED_PROFILE
     })
 
+def model_memory_usage() -> dict:
+    """Measured parameter memory of the loaded models and the process RSS"""
+    mb = lambda value: round(value / 1024 / 1024, 1) if value is not None else None
+    whisper_bytes = parameter_bytes(whisper_client.model)
+    pool_bytes = sum(parameter_bytes(client.model) for client in whisper_pool.idle_clients())
+    pyannote_bytes = parameter_bytes(getattr(diarization_client, 'pipeline', None))
+    rss = current_rss_bytes()
+    return {
+        "estimated_whisper_size": f"{whisper_client.get_model_info().get('size_mb', 0)} MB",
+        "whisper_parameters_mb": mb(whisper_bytes),
+        "whisper_pool_parameters_mb": mb(pool_bytes),
+        "pyannote_parameters_mb": mb(pyannote_bytes),
+        "model_parameters_mb": mb(whisper_bytes + pool_bytes + pyannote_bytes),
+        "process_rss_mb": mb(rss),
+        "process_peak_rss_mb": mb(peak_rss_bytes())
+    }
+
 @app.route('/api/v1/models/overview', methods=['GET'])
 def get_models_overview():
     """Get comprehensive overview of all loaded AI models"""
@@ -333,6 +925,12 @@ def get_models_overview():
                     "version": getattr(diarization_client, 'version', 'unknown'),
                     "capabilities": ["speaker_diarization", "voice_activity_detection"]
                 },
+                "light_diarization": {
+                    "status": "available",
+                    "method": "MFCC window embeddings + agglomerative clustering",
+                    "default_engine": A2TSettings.DIARIZATION_ENGINE,
+                    "capabilities": ["speaker_diarization"]
+                },
                 "ollama": {
                     "status": "available" if ollama_client.available else "unavailable",
                     "base_url": A2TSettings.OLLAMA_BASE_URL,
@@ -346,10 +944,7 @@ def get_models_overview():
                 "output_format": "structured_protocol",
                 "audio_formats": ["mp3", "wav", "m4a", "mp4", "webm", "ogg"]
             },
-            "memory_usage": {
-                "estimated_whisper_size": f"{whisper_client.get_model_info().get('size_mb', 0)} MB",
-                "estimated_total": "calculating..."
-            }
+            "memory_usage": model_memory_usage()
         }
         
         # Try to get Ollama models if available
@@ -451,6 +1046,82 @@ def transcribe_audio():
     # Get model selection from form data (default from settings)
     selected_model = request.form.get('model', A2TSettings.WHISPER_MODEL)
     
+    # Optional deadline: model=auto (or the given model as upper bound) picks the most
+    # accurate model expected to finish in time
+    deadline_seconds = request.form.get('deadline_seconds')
+    if deadline_seconds is not None:
+        try:
+            deadline_seconds = float(deadline_seconds)
+        except ValueError:
+            return jsonify({"error": f"deadline_seconds must be a number, got: {deadline_seconds}"}), 400
+        if deadline_seconds <= 0:
+            return jsonify({"error": "deadline_seconds must be positive"}), 400
+    auto_model = selected_model == "auto" or deadline_seconds is not None
+    
+    # Speed profile for Whisper decoding (fast, balanced, accurate);
+    # 'profile=<name>' is still accepted as an alias for older clients
+    profile_option = request.form.get('profile')
+    legacy_speed_profile = profile_option if profile_option in A2TSettings.WHISPER_DECODING_PROFILES else None
+    speed_profile = (request.form.get('speed_profile') or legacy_speed_profile
+                     or A2TSettings.WHISPER_SPEED_PROFILE)
+    if profile_option and not legacy_speed_profile and profile_option.lower() not in ('true', 'false'):
+        return jsonify({
+            "error": f"profile must be 'true', 'false' or a speed profile name, got: {profile_option}",
+            "available_profiles": list(A2TSettings.WHISPER_DECODING_PROFILES.keys())
+        }), 400
+    if speed_profile not in A2TSettings.WHISPER_DECODING_PROFILES:
+        return jsonify({
+            "error": f"Unknown speed profile: {speed_profile}",
+            "available_profiles": list(A2TSettings.WHISPER_DECODING_PROFILES.keys())
+        }), 400
+    
+    # Optional two-pass mode: instant preview with tiny/base, refined in the background
+    two_pass = request.form.get('two_pass', 'false').lower() == 'true'
+    preview_model = request.form.get('preview_model', A2TSettings.TWO_PASS_PREVIEW_MODEL)
+    if two_pass and preview_model not in ("tiny", "base"):
+        return jsonify({"error": f"Preview model must be 'tiny' or 'base', got: {preview_model}"}), 400
+    
+    # Optional confidence-driven re-decoding of uncertain segments with a larger model
+    redecode_model = request.form.get('redecode_model') or None
+    if request.form.get('redecode', 'false').lower() == 'true' and not redecode_model:
+        redecode_model = A2TSettings.REDECODE_MODEL
+    if redecode_model and redecode_model not in WhisperClient.AVAILABLE_MODELS:
+        return jsonify({"error": f"Unknown re-decode model: {redecode_model}"}), 400
+    
+    # Optional silence skipping (voice activity pre-pass)
+    skip_silence = request.form.get('skip_silence')
+    skip_silence = A2TSettings.VAD_ENABLED if skip_silence is None else skip_silence.lower() == 'true'
+    
+    # Optional spectral-gating noise reduction
+    denoise = request.form.get('denoise')
+    denoise = A2TSettings.NOISE_REDUCTION_ENABLED if denoise is None else denoise.lower() == 'true'
+    
+    # Speaker diarization engine: pyannote, light (no downloads) or auto
+    diarization_engine = request.form.get('diarization_engine', A2TSettings.DIARIZATION_ENGINE)
+    if diarization_engine not in A2TSettings.DIARIZATION_ENGINES:
+        return jsonify({
+            "error": f"Unknown diarization engine: {diarization_engine}",
+            "available_engines": A2TSettings.DIARIZATION_ENGINES
+        }), 400
+    
+    # Optional diarize-first order: cut at speaker turns and transcribe them in parallel
+    diarize_first = request.form.get('diarize_first')
+    diarize_first = A2TSettings.DIARIZE_FIRST if diarize_first is None else diarize_first.lower() == 'true'
+    if diarize_first and (two_pass or redecode_model):
+        return jsonify({"error": "diarize_first cannot be combined with two_pass or redecode"}), 400
+    
+    # Optional profiling of this job (sampled stacks + cProfile), downloadable afterwards
+    # ('profile=true'; a speed profile name in 'profile' is the alias above, not profiling)
+    profile = (profile_option or 'false').lower() == 'true'
+    
+    # Queue priority: interactive jobs go ahead of normal and bulk (backfill) jobs
+    priority = request.form.get('priority', A2TSettings.JOB_DEFAULT_PRIORITY)
+    if priority not in JOB_PRIORITIES:
+        return jsonify({
+            "error": f"Unknown priority: {priority}",
+            "available_priorities": list(JOB_PRIORITIES.keys())
+        }), 400
+    
     job_id = str(uuid.uuid4())
     
     # Ensure upload directory exists with absolute path
@@ -460,28 +1131,52 @@ def transcribe_audio():
     # Save uploaded file with absolute path
     upload_filename = f"{job_id}_{audio_file.filename}"
     upload_path = os.path.join(upload_dir, upload_filename)
-    audio_file.save(upload_path)
+    with tracer.span("upload", trace_id=trace_id_for(job_id), **{"http.route": "/api/v1/transcribe"}) as span:
+        audio_file.save(upload_path)
+        span.set_attribute("upload.bytes", os.path.getsize(upload_path))
     
     log_progress(job_id, "info", f"File saved to: {upload_path}")
     log_progress(job_id, "info", f"File exists: {os.path.exists(upload_path)}")
+    
+    model_selection = None
+    if auto_model:
+        selected_model, model_selection = select_model(
+            audio_decoder.probe_duration(upload_path), diarization_engine, deadline_seconds,
+            max_model=None if selected_model == "auto" else selected_model, priority=priority
+        )
+        model_selection["mode"] = "deadline" if deadline_seconds is not None else "auto"
+        log_progress(job_id, "info", f"Auto model selection: {selected_model} ({model_selection['reason']})")
     log_progress(job_id, "info", f"Selected model: {selected_model}")
+    log_progress(job_id, "info", f"Selected speed profile: {speed_profile}")
     
     # Ensure absolute path for job
     absolute_upload_path = os.path.abspath(upload_path)
     log_progress(job_id, "info", f"Absolute path: {absolute_upload_path}")
     
     # Create job with absolute path and model selection
-    job = A2TJob(job_id, absolute_upload_path, selected_model)
-    active_jobs[job_id] = job
-    
-    # Start background processing
-    Thread(target=process_audio_async, args=(job,)).start()
+    job = A2TJob(job_id, absolute_upload_path, selected_model, speed_profile,
+                 two_pass=two_pass, preview_model=preview_model, redecode_model=redecode_model,
+                 skip_silence=skip_silence, denoise=denoise, diarization_engine=diarization_engine,
+                 diarize_first=diarize_first, profile=profile, priority=priority)
+    job.model_selection = model_selection
+    start_job(job)
     
     return jsonify({
         "job_id": job_id,
         "status": "queued",
         "message": "Audio processing started",
-        "selected_model": selected_model
+        "selected_model": selected_model,
+        "model_selection": model_selection,
+        "speed_profile": speed_profile,
+        "two_pass": two_pass,
+        "redecode_model": redecode_model,
+        "skip_silence": skip_silence,
+        "denoise": denoise,
+        "diarization_engine": diarization_engine,
+        "diarize_first": diarize_first,
+        "profile": profile,
+        "priority": priority,
+        "eta": job_eta(job)
     })
 
 @app.route('/api/v1/status/<job_id>', methods=['GET'])
@@ -497,9 +1192,31 @@ def get_job_status(job_id: str):
         "status": job.status,
         "progress": job.progress,
         "model_loading": getattr(job, 'model_loading', False),
-        "target_model": getattr(job, 'target_model', job.model)
+        "target_model": getattr(job, 'target_model', job.model),
+        "speed_profile": job.speed_profile,
+        "two_pass": job.two_pass,
+        "display_pass": job.display_pass,
+        "priority": job.priority
     }
     
+    if job.model_selection:
+        response["model_selection"] = job.model_selection
+    
+    if job.status != "completed" and job.partial_result:
+        response["partial_result"] = job.partial_result
+    
+    if job.diarization_progress:
+        response["diarization_progress"] = job.diarization_progress
+    
+    if job.transcription_progress:
+        response["transcription_progress"] = job.transcription_progress
+    
+    response["timings"] = job_timings(job)
+    
+    eta = job_eta(job)
+    if eta:
+        response["eta"] = eta
+    
     if job.status == "completed" and job.result:
         response["result"] = {
             "transcript": job.result.transcript,
@@ -513,6 +1230,373 @@ def get_job_status(job_id: str):
     
     return jsonify(response)
 
+def job_timings(job: A2TJob) -> dict:
+    """Stage timing breakdown; finished jobs report the figures stored with their result"""
+    if job.status == "completed" and job.result and "timings" in job.result.metadata:
+        return job.result.metadata["timings"]
+    return job.timings.summary()
+
+@app.route('/api/v1/jobs/<job_id>/timings', methods=['GET'])
+def get_job_timings(job_id: str):
+    """Per-stage wall time, CPU time, peak RSS and model-load time of a job"""
+    job = active_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify({"job_id": job_id, "status": job.status, "timings": job_timings(job)})
+
+@app.route('/api/v1/jobs/<job_id>/trace', methods=['GET'])
+def get_job_trace(job_id: str):
+    """Span waterfall of a job (upload, job, stages, model and Ollama calls).
+    format=otlp downloads the raw OTLP-JSON span file instead"""
+    if tracer.exporter is None:
+        return jsonify({"error": "Tracing is disabled (TRACING_ENABLED=False)"}), 404
+    trace_id = trace_id_for(job_id)
+    if job_id not in active_jobs and not os.path.exists(tracer.exporter.path(trace_id)):
+        return jsonify({"error": "Job not found"}), 404
+    
+    if request.args.get('format') == 'otlp':
+        if not os.path.exists(tracer.exporter.path(trace_id)):
+            return jsonify({"error": "No spans recorded for this job yet"}), 404
+        directory, filename = os.path.split(os.path.abspath(tracer.exporter.path(trace_id)))
+        return send_from_directory(directory, filename, as_attachment=True, download_name=f"{job_id}.otlp.jsonl")
+    
+    waterfall = tracer.waterfall(trace_id)
+    job = active_jobs.get(job_id)
+    return jsonify(dict(waterfall, job_id=job_id, status=job.status if job else None))
+
+@app.route('/api/v1/queue', methods=['GET'])
+def get_job_queue():
+    """Running and waiting jobs in scheduling order, plus the learned real-time factors"""
+    jobs = [job for job in list(active_jobs.values()) if job.status in ("queued", "processing")]
+    entries = []
+    for job in jobs:
+        entry = {"job_id": job.job_id, "status": job.status, "model": job.model, "priority": job.priority}
+        entry.update(job_eta(job) or {})
+        entries.append(entry)
+    entries.sort(key=lambda entry: (entry["status"] != "processing", entry.get("queue_position") or 0))
+    return jsonify({
+        "slots": job_admission.slots,
+        "running": job_admission.active(),
+        "waiting": job_admission.waiting(),
+        "aging": job_admission.aging,
+        "jobs": entries,
+        "real_time_factors": runtime_model.snapshot()
+    })
+
+@app.route('/api/v1/jobs/<job_id>/logs', methods=['GET'])
+def get_job_logs(job_id: str):
+    """Log lines of a job from its ring buffer (includes service and worker-thread logs).
+    since=<seq> returns only newer lines, level=<name> filters by minimum level"""
+    try:
+        since = int(request.args.get('since', 0))
+    except ValueError:
+        return jsonify({"error": "since must be an integer"}), 400
+    level_name = request.args.get('level', 'DEBUG').upper()
+    min_level = logging.getLevelName(level_name)
+    if not isinstance(min_level, int):
+        return jsonify({"error": f"Unknown log level: {level_name}"}), 400
+
+    records = job_logs.get(job_id, since=since, min_level=min_level)
+    job = active_jobs.get(job_id)
+    if records is None:
+        if job is None:
+            return jsonify({"error": "Job not found"}), 404
+        records = []
+    return jsonify({
+        "job_id": job_id,
+        "status": job.status if job else None,
+        "records": records,
+        "next": records[-1]["seq"] if records else since
+    })
+
+@app.route('/api/v1/jobs/<job_id>/profile', methods=['GET'])
+def get_job_profile(job_id: str):
+    """Download the profile of a job started with profile=true.
+    format=collapsed (default, flamegraph/speedscope input) or format=pstats (cProfile dump)"""
+    job = active_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if not job.profile:
+        return jsonify({"error": "Job was not started with profile=true"}), 404
+    if job.profiler is not None and not job.profiler.finished:
+        return jsonify({"error": f"Job is {job.status}, the profile is written when it finishes"}), 409
+    
+    profile_format = request.args.get('format', 'collapsed')
+    files = (job.profiler or JobProfiler(job_profile_dir(job_id))).files()
+    if profile_format not in ("collapsed", "pstats"):
+        return jsonify({"error": f"Unknown profile format: {profile_format}", "available_formats": list(files)}), 400
+    if profile_format not in files:
+        return jsonify({"error": f"No {profile_format} profile stored for this job"}), 404
+    
+    directory, filename = os.path.split(files[profile_format])
+    return send_from_directory(directory, filename, as_attachment=True,
+                               download_name=f"{job_id}.{filename.split('.')[-1]}")
+
+@app.route('/api/v1/jobs/<job_id>', methods=['DELETE'])
+def delete_job(job_id: str):
+    """Cancel or delete a job.
+    Queued jobs leave the queue, running jobs stop cooperatively at the next stage or
+    chunk boundary (202, status becomes 'cancelled'); finished jobs are deleted with
+    their uploads, checkpoints, profile and logs."""
+    job = active_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    
+    if job.status in ("queued", "processing"):
+        if job.cancel_token is not None:
+            job.cancel_token.cancel("cancelled by user")
+        was_queued = job_admission.withdraw(job_id)
+        log_progress(job_id, "info", f"Cancellation requested ({'queued' if was_queued else job.status})")
+        return jsonify({"job_id": job_id, "status": "cancelling"}), 202
+    
+    active_jobs.pop(job_id, None)
+    remove_job_files(job, parts=job.parts)
+    if job_store is not None:
+        job_store.delete(job_id)
+    shutil.rmtree(job_profile_dir(job_id), ignore_errors=True)
+    job_logs.drop(job_id)
+    log_progress("", "info", f"Deleted job {job_id}")
+    return jsonify({"job_id": job_id, "status": "deleted"})
+
+@app.route('/api/v1/jobs/<job_id>/append', methods=['POST'])
+def append_job_audio(job_id: str):
+    """Append another recording part to a completed job.
+    Only the new part is transcribed and diarized; speakers are linked to earlier parts by voiceprint."""
+    job = active_jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job.status != "completed" or job.result is None:
+        return jsonify({"error": f"Job is {job.status}, parts can only be appended to completed jobs"}), 409
+    
+    if 'audio' not in request.files or request.files['audio'].filename == '':
+        return jsonify({"error": "No audio file provided"}), 400
+    audio_file = request.files['audio']
+    
+    upload_dir = os.path.abspath("temp/uploads")
+    os.makedirs(upload_dir, exist_ok=True)
+    upload_path = os.path.join(upload_dir, f"{job_id}_part{len(job.parts) + 1}_{audio_file.filename}")
+    with tracer.span("upload", trace_id=trace_id_for(job_id), **{"http.route": "/api/v1/jobs/<job_id>/append"}) as span:
+        audio_file.save(upload_path)
+        span.set_attribute("upload.bytes", os.path.getsize(upload_path))
+    log_progress(job_id, "info", f"Appending part {len(job.parts) + 1}: {upload_path}")
+    
+    job.previous_result = job.result
+    if job.checkpoint is not None:
+        job.checkpoint.clear(*PIPELINE_CHECKPOINTS)
+        job.checkpoint.save("previous_result", asdict(job.previous_result))
+    job.audio_file = upload_path
+    job.parts.append(upload_path)
+    job.status = "queued"
+    job.progress = 0
+    job.error = None
+    job.partial_result = None
+    job.display_pass = None
+    job.diarization_progress = None
+    job.transcription_progress = None
+    start_job(job)
+    
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "message": "Appending audio part",
+        "part": len(job.parts),
+        "offset": job.previous_result.metadata.get("duration", 0)
+    })
+
+@app.route('/api/v1/stream', methods=['POST'])
+def create_stream():
+    """Start a live transcription stream (16 kHz mono PCM, sent in chunks)"""
+    data = request.get_json(silent=True) or request.form
+    
+    sample_format = data.get('format', 's16le')
+    if sample_format not in StreamingTranscriber.FORMATS:
+        return jsonify({
+            "error": f"Unsupported format: {sample_format}",
+            "supported_formats": list(StreamingTranscriber.FORMATS.keys())
+        }), 400
+    try:
+        sample_rate = int(data.get('sample_rate', StreamingTranscriber.SAMPLE_RATE))
+    except (TypeError, ValueError):
+        return jsonify({"error": f"sample_rate must be an integer, got: {data.get('sample_rate')}"}), 400
+    if sample_rate != StreamingTranscriber.SAMPLE_RATE:
+        return jsonify({"error": f"Sample rate must be {StreamingTranscriber.SAMPLE_RATE} Hz"}), 400
+    
+    # Models for the live transcript and for the full pipeline job after closing
+    stream_model = data.get('stream_model', A2TSettings.STREAMING_MODEL)
+    model = data.get('model', A2TSettings.WHISPER_MODEL)
+    for option, value in (("stream_model", stream_model), ("model", model)):
+        if value not in WhisperClient.AVAILABLE_MODELS:
+            return jsonify({
+                "error": f"Unknown {option}: {value}",
+                "available_models": list(WhisperClient.AVAILABLE_MODELS.keys())
+            }), 400
+    speed_profile = data.get('speed_profile') or data.get('profile', A2TSettings.WHISPER_SPEED_PROFILE)
+    if speed_profile not in A2TSettings.WHISPER_DECODING_PROFILES:
+        return jsonify({
+            "error": f"Unknown speed profile: {speed_profile}",
+            "available_profiles": list(A2TSettings.WHISPER_DECODING_PROFILES.keys())
+        }), 400
+    
+    session_id = str(uuid.uuid4())
+    upload_dir = os.path.abspath(A2TSettings.AUDIO_UPLOAD_FOLDER)
+    os.makedirs(upload_dir, exist_ok=True)
+    wav_path = os.path.join(upload_dir, f"{session_id}_stream.wav")
+    
+    session = StreamingTranscriber(
+        session_id,
+        whisper_pool,
+        compute_gate,
+        wav_path,
+        model=stream_model,
+        language=A2TSettings.WHISPER_LANGUAGE,
+        sample_format=sample_format,
+        step_seconds=A2TSettings.STREAMING_STEP_SECONDS,
+        max_window_seconds=A2TSettings.STREAMING_MAX_WINDOW_SECONDS,
+        idle_timeout=A2TSettings.STREAMING_IDLE_TIMEOUT_SECONDS,
+        on_expired=expire_stream
+    )
+    # Options for the full pipeline job created when the stream closes
+    session.job_options = {
+        "model": model,
+        "speed_profile": speed_profile
+    }
+    stream_sessions[session_id] = session
+    log_progress(session_id, "info", f"Live stream started: {session_id} ({sample_format})")
+    
+    return jsonify({
+        "session_id": session_id,
+        "audio_endpoint": f"/api/v1/stream/{session_id}/audio",
+        "close_endpoint": f"/api/v1/stream/{session_id}/close",
+        "sample_rate": StreamingTranscriber.SAMPLE_RATE,
+        "format": sample_format
+    })
+
+def expire_stream(session: StreamingTranscriber):
+    """Remove an abandoned live stream (no audio within the idle timeout) and its recording"""
+    stream_sessions.pop(session.session_id, None)
+    if os.path.exists(session.wav_path):
+        os.remove(session.wav_path)
+    log_progress(session.session_id, "warning", f"Live stream abandoned, removed after {session.idle_timeout:.0f}s idle")
+
+@app.route('/api/v1/stream/<session_id>/audio', methods=['POST'])
+def stream_audio(session_id: str):
+    """Append raw PCM frames to a live stream; returns new committed and tentative segments"""
+    session = stream_sessions.get(session_id)
+    if not session:
+        return jsonify({"error": "Stream not found"}), 404
+    
+    try:
+        session.feed(request.get_data())
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 409
+    
+    since = request.args.get('since', 0, type=int)
+    return jsonify(session.state(since))
+
+@app.route('/api/v1/stream/<session_id>', methods=['GET'])
+def get_stream_state(session_id: str):
+    """Current transcript of a live stream"""
+    session = stream_sessions.get(session_id)
+    if not session:
+        return jsonify({"error": "Stream not found"}), 404
+    
+    since = request.args.get('since', 0, type=int)
+    return jsonify(session.state(since))
+
+@app.route('/api/v1/stream/<session_id>/close', methods=['POST'])
+def close_stream(session_id: str):
+    """Close a live stream and hand the recorded audio to the normal pipeline"""
+    session = stream_sessions.pop(session_id, None)
+    if not session:
+        return jsonify({"error": "Stream not found"}), 404
+    
+    wav_path = session.close()
+    final_state = session.state()
+    log_progress(session_id, "info", f"Live stream closed after {final_state['duration']:.1f}s")
+    
+    if session.total_samples == 0:
+        os.remove(wav_path)
+        return jsonify({"session_id": session_id, "transcript": final_state, "job_id": None})
+    
+    job_id = str(uuid.uuid4())
+    job = A2TJob(job_id, wav_path, session.job_options["model"], session.job_options["speed_profile"])
+    start_job(job)
+    
+    return jsonify({
+        "session_id": session_id,
+        "transcript": final_state,
+        "job_id": job_id,
+        "status_endpoint": f"/api/v1/status/{job_id}"
+    })
+
+@app.route('/api/v1/speakers', methods=['GET'])
+def list_speakers():
+    """Enrolled voices of recurring participants"""
+    speakers = speaker_index.list_speakers()
+    return jsonify({"speakers": speakers, "count": len(speakers)})
+
+@app.route('/api/v1/speakers/enroll', methods=['POST'])
+def enroll_speaker():
+    """Enroll a named voice, either from a finished job (JSON: name, job_id, speaker)
+    or from an uploaded sample (multipart: name, audio, optional diarization_engine)"""
+    if request.files.get('audio'):
+        name = request.form.get('name', '').strip()
+        if not name:
+            return jsonify({"error": "Missing speaker name"}), 400
+        engine = request.form.get('diarization_engine', A2TSettings.DIARIZATION_ENGINE)
+        if engine not in A2TSettings.DIARIZATION_ENGINES:
+            return jsonify({"error": f"Unknown diarization engine: {engine}"}), 400
+        
+        upload_dir = os.path.abspath("temp/uploads")
+        os.makedirs(upload_dir, exist_ok=True)
+        sample_path = os.path.join(upload_dir, f"enroll_{uuid.uuid4()}_{request.files['audio'].filename}")
+        request.files['audio'].save(sample_path)
+        try:
+            turns, voiceprints = diarization_client.identify_speakers(sample_path, engine=engine, return_embeddings=True)
+        finally:
+            os.remove(sample_path)
+        
+        if not voiceprints.get("centroids"):
+            return jsonify({"error": "No voice embedding could be extracted from the sample"}), 422
+        # The sample should contain one voice; use the dominant speaker
+        talk_time = {}
+        for turn in turns:
+            talk_time[turn["speaker"]] = talk_time.get(turn["speaker"], 0) + turn["duration"]
+        label = max(voiceprints["centroids"], key=lambda l: talk_time.get(l, 0))
+        entry = speaker_index.enroll(name, voiceprints["centroids"][label], voiceprints["engine"])
+        return jsonify({"success": True, "speaker": entry})
+    
+    data = request.get_json(silent=True) or {}
+    name = (data.get('name') or '').strip()
+    job_id = data.get('job_id')
+    label = data.get('speaker')
+    if not name or not job_id or not label:
+        return jsonify({"error": "Expected name, job_id and speaker (or a multipart audio sample)"}), 400
+    
+    job = active_jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    if job.status != "completed" or not job.result:
+        return jsonify({"error": "Job is not completed yet"}), 409
+    
+    embeddings = getattr(job.result, 'speaker_embeddings', None) or {}
+    centroid = embeddings.get("centroids", {}).get(label)
+    if centroid is None:
+        return jsonify({
+            "error": f"No voice embedding for speaker: {label}",
+            "available_speakers": list(embeddings.get("centroids", {}).keys())
+        }), 404
+    
+    entry = speaker_index.enroll(name, centroid, embeddings["engine"])
+    return jsonify({"success": True, "speaker": entry})
+
+@app.route('/api/v1/speakers/<name>', methods=['DELETE'])
+def delete_speaker(name: str):
+    """Remove an enrolled voice"""
+    if not speaker_index.remove(name):
+        return jsonify({"error": "Speaker not found"}), 404
+    return jsonify({"success": True, "name": name})
+
 @app.route('/api/v1/generate-protocol', methods=['POST'])
 def generate_protocol_endpoint():
     """Generate meeting protocol with custom speaker names and model selection"""
@@ -667,4 +1751,8 @@ if __name__ == '__main__':
     print("📝 Web Interface: http://localhost:5000/web")
     print("🔌 API Endpoint: http://localhost:5000/api/v1/transcribe")
     
+    # Only the reloader child serves requests, resume jobs there
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        resume_jobs()
+    
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
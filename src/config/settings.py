@@ -15,6 +15,87 @@ class A2TSettings:
     # === WHISPER KONFIGURATION ===
     WHISPER_MODEL = os.getenv('WHISPER_MODEL', 'small')
     WHISPER_LANGUAGE = os.getenv('WHISPER_LANGUAGE', 'de')
+
+    # Decoding-Profile: Geschwindigkeit vs. Genauigkeit
+    # Werte werden direkt an whisper.transcribe() bzw. DecodingOptions weitergereicht.
+    # without_timestamps bleibt aus, da die Segment-Zeitstempel für die
+    # Sprecher-Zuordnung benötigt werden.
+    WHISPER_SPEED_PROFILE = os.getenv('WHISPER_SPEED_PROFILE', 'balanced')
+    WHISPER_DECODING_PROFILES = {
+        "fast": {
+            "beam_size": None,  # Greedy Decoding
+            "best_of": None,
+            "temperature": (0.0,),  # Kein Temperature-Fallback
+            "compression_ratio_threshold": None,
+            "logprob_threshold": None,
+            "no_speech_threshold": 0.6,
+            "condition_on_previous_text": False,
+            "without_timestamps": False
+        },
+        "balanced": {
+            "beam_size": None,
+            "best_of": 3,
+            "temperature": (0.0, 0.4, 0.8),
+            "compression_ratio_threshold": 2.4,
+            "logprob_threshold": -1.0,
+            "no_speech_threshold": 0.6,
+            "condition_on_previous_text": True,
+            "without_timestamps": False
+        },
+        "accurate": {
+            "beam_size": 5,
+            "best_of": 5,
+            "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+            "compression_ratio_threshold": 2.4,
+            "logprob_threshold": -1.0,
+            "no_speech_threshold": 0.6,
+            "condition_on_previous_text": True,
+            "without_timestamps": False
+        }
+    }
+
+    # Zwei-Pass-Modus: schnelle Vorschau, danach Verfeinerung im Hintergrund
+    TWO_PASS_PREVIEW_MODEL = os.getenv('TWO_PASS_PREVIEW_MODEL', 'tiny')
+    TWO_PASS_WINDOW_SECONDS = float(os.getenv('TWO_PASS_WINDOW_SECONDS', 60))
+    
+    # Selektive Neudekodierung unsicherer Segmente mit größerem Modell
+    REDECODE_MODEL = os.getenv('REDECODE_MODEL', 'medium')
+    REDECODE_LOGPROB_THRESHOLD = float(os.getenv('REDECODE_LOGPROB_THRESHOLD', -0.8))
+    REDECODE_COMPRESSION_RATIO_THRESHOLD = float(os.getenv('REDECODE_COMPRESSION_RATIO_THRESHOLD', 2.4))
+    REDECODE_NO_SPEECH_THRESHOLD = float(os.getenv('REDECODE_NO_SPEECH_THRESHOLD', 0.6))
+    REDECODE_MERGE_GAP_SECONDS = float(os.getenv('REDECODE_MERGE_GAP_SECONDS', 1.0))
+    REDECODE_PADDING_SECONDS = float(os.getenv('REDECODE_PADDING_SECONDS', 0.3))
+    
+    # Diarize-first: erst Sprechertrennung, dann Transkription je Sprecher-Turn parallel
+    DIARIZE_FIRST = os.getenv('DIARIZE_FIRST', 'False').lower() == 'true'
+    DIARIZE_FIRST_MIN_TURN_SECONDS = float(os.getenv('DIARIZE_FIRST_MIN_TURN_SECONDS', 1.5))
+    DIARIZE_FIRST_MAX_TURN_SECONDS = float(os.getenv('DIARIZE_FIRST_MAX_TURN_SECONDS', 120))
+    # Gleichzeitige Whisper-Berechnungen (jeder Worker hält eine eigene Modellinstanz im Speicher)
+    WHISPER_PARALLEL_WORKERS = int(os.getenv('WHISPER_PARALLEL_WORKERS', max(1, min(4, (os.cpu_count() or 2) // 2))))
+    # Höchstzahl freier, geladener Whisper-Instanzen im Pool über alle Modelle (LRU-Verdrängung)
+    WHISPER_POOL_MAX_IDLE = int(os.getenv('WHISPER_POOL_MAX_IDLE', WHISPER_PARALLEL_WORKERS))
+    
+    # Live-Streaming (inkrementelle Transkription während des Meetings)
+    STREAMING_MODEL = os.getenv('STREAMING_MODEL', 'base')
+    STREAMING_STEP_SECONDS = float(os.getenv('STREAMING_STEP_SECONDS', 1.0))
+    STREAMING_MAX_WINDOW_SECONDS = float(os.getenv('STREAMING_MAX_WINDOW_SECONDS', 20))
+    # Sessions ohne neues Audio werden nach dieser Zeit beendet und aufgeräumt
+    STREAMING_IDLE_TIMEOUT_SECONDS = float(os.getenv('STREAMING_IDLE_TIMEOUT_SECONDS', 300))
+    
+    # Speaker Diarization: 'pyannote', 'light' (MFCC + Clustering, ohne Download) oder 'auto'
+    DIARIZATION_ENGINE = os.getenv('DIARIZATION_ENGINE', 'auto')
+    DIARIZATION_ENGINES = ['auto', 'pyannote', 'light']
+    # Langform-Modus: fensterweise Diarization mit globalem Clustering der Sprecher-Embeddings
+    DIARIZATION_LONG_FORM_THRESHOLD_SECONDS = float(os.getenv('DIARIZATION_LONG_FORM_THRESHOLD_SECONDS', 3600))
+    DIARIZATION_WINDOW_SECONDS = float(os.getenv('DIARIZATION_WINDOW_SECONDS', 600))
+    DIARIZATION_CLUSTER_THRESHOLD = float(os.getenv('DIARIZATION_CLUSTER_THRESHOLD', 0.7))
+    
+    # Stimmen-Index für wiederkehrende Teilnehmer (automatische Sprechernamen)
+    SPEAKER_INDEX_PATH = os.getenv('SPEAKER_INDEX_PATH', 'temp/speakers/index.npz')
+    SPEAKER_MATCH_THRESHOLDS = {  # Cosinus-Ähnlichkeit je Diarization-Engine
+        "pyannote": float(os.getenv('SPEAKER_MATCH_THRESHOLD_PYANNOTE', 0.5)),
+        "light": float(os.getenv('SPEAKER_MATCH_THRESHOLD_LIGHT', 0.9))
+    }
     
     # === OLLAMA KONFIGURATION ===
     OLLAMA_BASE_URL = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
@@ -30,6 +111,79 @@ class A2TSettings:
     AUDIO_OUTPUT_FOLDER = os.getenv('AUDIO_OUTPUT_FOLDER', 'temp/processed')
     MAX_AUDIO_SIZE_MB = int(os.getenv('MAX_AUDIO_SIZE_MB', 100))
     
+    # Lautheits-Normalisierung nach EBU R128 beim Konvertieren
+    LOUDNESS_NORMALIZATION = os.getenv('LOUDNESS_NORMALIZATION', 'True').lower() == 'true'
+    LOUDNESS_TARGET_LUFS = float(os.getenv('LOUDNESS_TARGET_LUFS', -23.0))
+    LOUDNESS_TRUE_PEAK_DB = float(os.getenv('LOUDNESS_TRUE_PEAK_DB', -2.0))
+    LOUDNESS_TRUE_PEAK_LIMITING = os.getenv('LOUDNESS_TRUE_PEAK_LIMITING', 'True').lower() == 'true'
+    # 16-kHz-Mono-WAVs, deren Lautheit höchstens so weit (dB) vom Ziel abweicht, bleiben unverändert
+    LOUDNESS_TOLERANCE_DB = float(os.getenv('LOUDNESS_TOLERANCE_DB', 1.0))
+    
+    # Dauerhafte Jobs: Zwischenstände je Stufe/Abschnitt, Fortsetzung nach Neustart
+    JOB_STORE_ENABLED = os.getenv('JOB_STORE_ENABLED', 'True').lower() == 'true'
+    JOB_STORE_PATH = os.getenv('JOB_STORE_PATH', 'temp/jobs')
+    JOB_RETENTION_HOURS = float(os.getenv('JOB_RETENTION_HOURS', 48))
+    # Bei aktivem Job-Store werden längere Aufnahmen abschnittsweise transkribiert
+    # (Zwischenstand je Abschnitt); 0 schaltet das ab
+    CHECKPOINT_CHUNK_SECONDS = float(os.getenv('CHECKPOINT_CHUNK_SECONDS', 300))
+    
+    # Job-Warteschlange: gleichzeitig laufende Jobs, kürzeste erwartete Laufzeit zuerst
+    # (mit Aging, damit lange Jobs nicht verhungern) und gelernte Laufzeit-Schätzung
+    MAX_CONCURRENT_JOBS = int(os.getenv('MAX_CONCURRENT_JOBS', WHISPER_PARALLEL_WORKERS))
+    SCHEDULER_AGING = float(os.getenv('SCHEDULER_AGING', 1.0))
+    JOB_DEFAULT_PRIORITY = os.getenv('JOB_DEFAULT_PRIORITY', 'normal')  # interactive, normal, bulk
+    ETA_MODEL_PATH = os.getenv('ETA_MODEL_PATH', 'temp/jobs/eta_model.json')
+    ETA_OVERHEAD_SECONDS = float(os.getenv('ETA_OVERHEAD_SECONDS', 5.0))
+    
+    # model=auto / deadline_seconds: genauestes Modell, das die Frist voraussichtlich einhält
+    AUTO_MODEL_CANDIDATES = [m.strip() for m in os.getenv('AUTO_MODEL_CANDIDATES', 'tiny,base,small,medium,large-v3').split(',')
+                             if m.strip()]
+    # Frist für model=auto ohne deadline_seconds, als Vielfaches der Audiodauer
+    AUTO_MODEL_DEADLINE_FACTOR = float(os.getenv('AUTO_MODEL_DEADLINE_FACTOR', 1.0))
+    
+    # Stub-Engines statt Whisper/PyAnnote/Ollama (Last- und Durchsatztests ohne Modelle)
+    STUB_ENGINES = os.getenv('STUB_ENGINES', 'False').lower() == 'true'
+    STUB_LATENCY_SECONDS = float(os.getenv('STUB_LATENCY_SECONDS', 0.05))
+    STUB_REAL_TIME_FACTOR = float(os.getenv('STUB_REAL_TIME_FACTOR', 0.05))
+    STUB_MODEL_LOAD_SECONDS = float(os.getenv('STUB_MODEL_LOAD_SECONDS', 0.5))
+    STUB_WORDS_PER_SECOND = float(os.getenv('STUB_WORDS_PER_SECOND', 2.5))
+    STUB_SEGMENT_SECONDS = float(os.getenv('STUB_SEGMENT_SECONDS', 5.0))
+    STUB_SPEAKERS = int(os.getenv('STUB_SPEAKERS', 3))
+    STUB_DIARIZATION_REAL_TIME_FACTOR = float(os.getenv('STUB_DIARIZATION_REAL_TIME_FACTOR', 0.02))
+    STUB_LLM_SECONDS = float(os.getenv('STUB_LLM_SECONDS', 1.0))
+    STUB_PROTOCOL_CHARS = int(os.getenv('STUB_PROTOCOL_CHARS', 2000))
+    STUB_CPU_BOUND = os.getenv('STUB_CPU_BOUND', 'False').lower() == 'true'
+    
+    # Tracing: Spans je Job/Stufe/Ollama-Aufruf als OTLP-JSON-Dateien
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'True').lower() == 'true'
+    TRACE_PATH = os.getenv('TRACE_PATH', 'temp/traces')
+    
+    # Logging: asynchron über eine Queue, Text- oder JSON-Zeilen, Ringpuffer je Job
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')  # text, json
+    JOB_LOG_BUFFER_SIZE = int(os.getenv('JOB_LOG_BUFFER_SIZE', 500))
+    
+    # Opt-in Profiling einzelner Jobs (profile=true): Collapsed Stacks + pstats
+    PROFILE_PATH = os.getenv('PROFILE_PATH', 'temp/profiles')
+    PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', 10))
+    
+    # Rauschreduzierung (Spectral Gating) als optionale Pipeline-Stufe
+    NOISE_REDUCTION_ENABLED = os.getenv('NOISE_REDUCTION_ENABLED', 'False').lower() == 'true'
+    
+    # Stille vor Whisper/PyAnnote herausschneiden (Voice Activity Detection)
+    VAD_ENABLED = os.getenv('VAD_ENABLED', 'False').lower() == 'true'
+    VAD_MARGIN_DB = float(os.getenv('VAD_MARGIN_DB', 12))
+    VAD_MIN_SILENCE_SECONDS = float(os.getenv('VAD_MIN_SILENCE_SECONDS', 1.0))
+    VAD_MIN_SPEECH_SECONDS = float(os.getenv('VAD_MIN_SPEECH_SECONDS', 0.25))
+    VAD_PADDING_SECONDS = float(os.getenv('VAD_PADDING_SECONDS', 0.3))
+    
+    @classmethod
+    def get_decoding_profile(cls, profile: str = None) -> dict:
+        """Gibt die Decoding-Optionen eines Speed-Profils zurück (Default bei unbekanntem Namen)"""
+        if profile not in cls.WHISPER_DECODING_PROFILES:
+            profile = cls.WHISPER_SPEED_PROFILE
+        return dict(cls.WHISPER_DECODING_PROFILES.get(profile, cls.WHISPER_DECODING_PROFILES["balanced"]))
+
     @classmethod
     def get_status(cls) -> dict:
         """Gibt den Status aller Konfigurationen zurück"""
@@ -38,6 +192,9 @@ class A2TSettings:
             "huggingface_token_preview": cls.HUGGINGFACE_TOKEN[:8] + "..." if cls.HUGGINGFACE_TOKEN else "Nicht gesetzt",
             "whisper_model": cls.WHISPER_MODEL,
             "whisper_language": cls.WHISPER_LANGUAGE,
+            "whisper_speed_profile": cls.WHISPER_SPEED_PROFILE,
+            "whisper_speed_profiles": list(cls.WHISPER_DECODING_PROFILES.keys()),
+            "diarization_engine": cls.DIARIZATION_ENGINE,
             "ollama_url": cls.OLLAMA_BASE_URL,
             "ollama_model": cls.OLLAMA_MODEL,
             "flask_config": {
@@ -102,5 +259,8 @@ class A2TSettings:
         print(f"🤖 Ollama URL: {cls.OLLAMA_BASE_URL}")
         print("   → Wird zur Laufzeit getestet")
         
+        if cls.STUB_ENGINES:
+            print("🧪 Stub-Engines aktiv: keine Modelle, simulierte Latenzen (nur für Lasttests)")
+        
         print(f"🌐 Server: {cls.FLASK_HOST}:{cls.FLASK_PORT}")
         print("="*60 + "\n")
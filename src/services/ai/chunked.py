@@ -0,0 +1,138 @@
+# src/services/ai/chunked.py
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import soundfile as sf
+
+from services.ai.whisper_client import WhisperClient
+from services.audio.decoder import FFmpegDecoder, decode_audio
+from services.jobs.cancel import check_cancelled
+from services.jobs.scheduler import PRIORITY_DEFAULT
+
+logger = logging.getLogger(__name__)
+
+class ChunkedTranscriber:
+    """Transkription in Abschnitten mit Zwischenstand nach jedem Abschnitt.
+
+    Die Aufnahme wird etwa alle ``chunk_seconds`` an der leisesten Stelle im
+    Umkreis von ``search_seconds`` geschnitten, damit möglichst kein Wort
+    getrennt wird. Der letzte Text eines Abschnitts wird als Prompt an den
+    nächsten übergeben. Bereits fertige Abschnitte (``completed``) werden
+    übernommen; nach einem Neustart setzt die Transkription daher beim ersten
+    fehlenden Abschnitt fort. Der Schnittplan hängt nur vom Audio ab und ist
+    bei der Fortsetzung identisch. Jeder Abschnitt hält einen Slot des
+    ``compute_gate`` und einen Client aus dem ``whisper_pool``.
+
+    Schlägt ein Abschnitt fehl, wird er über ``transcribe_with_timestamps``
+    mit dessen Fallback-Strategien wiederholt. ``chunk_seconds <= 0``
+    schaltet die Aufteilung ab.
+    """
+
+    def __init__(self, whisper_pool, compute_gate, chunk_seconds: float = 300.0, search_seconds: float = 3.0):
+        self.whisper_pool = whisper_pool
+        self.compute_gate = compute_gate
+        self.chunk_seconds = chunk_seconds
+        self.search_seconds = search_seconds
+        self.decoder = FFmpegDecoder(sample_rate=WhisperClient.SAMPLE_RATE)
+
+    def worthwhile(self, audio_path: str) -> bool:
+        """Lohnt sich die Aufteilung (Aufnahme länger als ein Abschnitt)?"""
+        if self.chunk_seconds <= 0:
+            return False
+        return (self.decoder.probe_duration(audio_path) or 0) > self.chunk_seconds
+
+    def plan_chunks(self, audio: np.ndarray) -> List[tuple]:
+        """Abschnittsgrenzen in Sekunden, jeweils an der leisesten 100-ms-Stelle"""
+        rate = WhisperClient.SAMPLE_RATE
+        duration = len(audio) / rate
+        frame = rate // 10
+        frames = len(audio) // frame
+        energy = np.square(audio[:frames * frame].reshape(frames, frame)).mean(axis=1) if frames else np.zeros(0)
+
+        boundaries = [0.0]
+        while duration - boundaries[-1] > 1.5 * self.chunk_seconds:
+            nominal = boundaries[-1] + self.chunk_seconds
+            first = max(0, int((nominal - self.search_seconds) * 10))
+            last = min(frames, int((nominal + self.search_seconds) * 10) + 1)
+            quietest = first + int(np.argmin(energy[first:last])) if last > first else int(nominal * 10)
+            boundaries.append((quietest + 0.5) / 10)
+        boundaries.append(duration)
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def transcribe(self, audio_path: str, model: str, language: str = "de", profile: str = None,
+                   completed: List[Dict] = None, on_chunk: Callable[[Dict], None] = None) -> Dict:
+        """Transkribiert alle noch fehlenden Abschnitte; Rückgabe im Format von
+        ``transcribe_with_timestamps``.
+
+        ``completed`` und ``on_chunk`` verwenden Einträge der Form
+        ``{"index", "start", "end", "result"}``.
+        """
+        audio = decode_audio(audio_path, WhisperClient.SAMPLE_RATE)
+        duration = len(audio) / WhisperClient.SAMPLE_RATE
+        chunks = self.plan_chunks(audio)
+
+        # Nur Zwischenstände übernehmen, die zum aktuellen Schnittplan passen
+        results = []
+        for entry in completed or []:
+            index = len(results)
+            if index >= len(chunks) or entry.get("index") != index or abs(entry.get("start", -1) - chunks[index][0]) > 1e-3:
+                break
+            results.append(entry["result"])
+        if results:
+            logger.info(f"♻️ [CHUNKED] Resuming after {len(results)}/{len(chunks)} checkpointed chunks")
+
+
+        started_at = time.perf_counter()
+        for index in range(len(results), len(chunks)):
+            check_cancelled()
+            start, end = chunks[index]
+            previous = results[-1]["segments"][-3:] if results else []
+            prompt = " ".join(seg.get("text", "").strip() for seg in previous) or None
+            chunk = audio[int(start * WhisperClient.SAMPLE_RATE):int(end * WhisperClient.SAMPLE_RATE)]
+            with self.compute_gate.hold(PRIORITY_DEFAULT):
+                with self.whisper_pool.client(model) as client:
+                    try:
+                        result = client.transcribe_array(chunk, language=language, offset=start,
+                                                         profile=profile, initial_prompt=prompt)
+                    except Exception as e:
+                        logger.warning(f"⚠️ [CHUNKED] Chunk {index + 1}/{len(chunks)} failed ({e}), "
+                                       f"using fallback strategies")
+                        result = self._transcribe_with_fallback(client, chunk, start, language, profile)
+            results.append(result)
+            if on_chunk:
+                on_chunk({"index": index, "start": start, "end": end, "result": result})
+            logger.info(f"🧩 [CHUNKED] Chunk {index + 1}/{len(chunks)} transcribed ({start:.1f}s - {end:.1f}s)")
+
+        segments = [seg for result in results for seg in result["segments"]]
+        processing_time = sum(result.get("processing_time") or 0 for result in results)
+        logger.info(f"🧩 [CHUNKED] Transcription finished in {time.perf_counter() - started_at:.2f}s")
+        return {
+            "text": "".join(seg.get("text", "") for seg in segments),
+            "segments": segments,
+            "language": results[0].get("language", language) if results else language,
+            "duration": duration,
+            "model_used": results[-1].get("model_used") if results else model,
+            "profile": profile,
+            "processing_time": processing_time,
+            "real_time_factor": processing_time / duration if duration > 0 else None,
+            "chunks": len(chunks)
+        }
+
+    @staticmethod
+    def _transcribe_with_fallback(client: WhisperClient, chunk: np.ndarray, offset: float, language: str, profile: str) -> Dict:
+        """Abschnitt als Datei durch ``transcribe_with_timestamps`` (mehrere Strategien,
+        notfalls tiny-Modell); Zeitstempel auf die Gesamtaufnahme verschoben"""
+        handle, chunk_path = tempfile.mkstemp(suffix=".wav", prefix="a2t_chunk_")
+        os.close(handle)
+        try:
+            sf.write(chunk_path, chunk, WhisperClient.SAMPLE_RATE, subtype='PCM_16')
+            result = client.transcribe_with_timestamps(chunk_path, language=language, profile=profile)
+        finally:
+            os.remove(chunk_path)
+        segments = [dict(seg, start=seg.get("start", 0) + offset, end=seg.get("end", 0) + offset)
+                    for seg in result.get("segments", [])]
+        return dict(result, segments=segments, duration=len(chunk) / WhisperClient.SAMPLE_RATE)
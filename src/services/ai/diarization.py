@@ -1,7 +1,7 @@
 # src/services/ai/diarization.py
+import logging
 import os
 import sys
-import librosa
 import soundfile as sf
 import tempfile
 from dotenv import load_dotenv
@@ -9,27 +9,48 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Skip PyAnnote imports if not available
 try:
     from pyannote.audio import Pipeline
     from pyannote.audio.pipelines import SpeakerDiarization as SpeakerDiarizationPipeline
     PYANNOTE_AVAILABLE = True
 except Exception as e:
-    print(f"⚠️ PyAnnote not available: {e}")
+    logger.warning(f"⚠️ PyAnnote not available: {e}")
     PYANNOTE_AVAILABLE = False
     Pipeline = None
 
 from typing import List, Dict
 
+import math
+import time
+import numpy as np
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.spatial.distance import pdist
+
+from config.settings import A2TSettings
+from services.ai.light_diarization import LightweightDiarization
+from services.audio.decoder import FFmpegDecoder, decode_audio
+from services.jobs.cancel import check_cancelled
+from services.monitoring.metrics import observe_model_load
+from services.monitoring.tracing import tracer
+
 class SpeakerDiarization:
     def __init__(self):
         self.available = False
         self.pipeline = None
         self.version = "unknown"
         self.model_name = "pyannote/speaker-diarization-3.1"
+        self.default_engine = A2TSettings.DIARIZATION_ENGINE
+        self.light_engine = LightweightDiarization()  # no downloads, always available
+        self.decoder = FFmpegDecoder(16000)
+        self.window_seconds = A2TSettings.DIARIZATION_WINDOW_SECONDS
+        self.long_form_threshold = A2TSettings.DIARIZATION_LONG_FORM_THRESHOLD_SECONDS
+        self.cluster_threshold = A2TSettings.DIARIZATION_CLUSTER_THRESHOLD
         
         if not PYANNOTE_AVAILABLE:
-            print("⚠️ PyAnnote Pipeline not available - Speaker Diarization disabled")
+            logger.warning("⚠️ PyAnnote Pipeline not available - Speaker Diarization disabled")
             return
             
         try:
@@ -43,33 +64,35 @@ class SpeakerDiarization:
             # Load HuggingFace token from environment
             hf_token = os.getenv('HUGGINGFACE_TOKEN')
             
+            started_at = time.perf_counter()
             if hf_token:
-                print(f"🔑 Using HuggingFace token: {hf_token[:8]}...")
+                logger.info(f"🔑 Using HuggingFace token: {hf_token[:8]}...")
                 self.pipeline = Pipeline.from_pretrained(
                     self.model_name,
                     use_auth_token=hf_token
                 )
             else:
-                print("🔑 No HuggingFace token found, trying without authentication...")
+                logger.info("🔑 No HuggingFace token found, trying without authentication...")
                 self.pipeline = Pipeline.from_pretrained(self.model_name)
             
             self.available = True
-            print("✅ PyAnnote Speaker Diarization loaded successfully")
+            observe_model_load("pyannote", self.model_name, time.perf_counter() - started_at)
+            logger.info("✅ PyAnnote Speaker Diarization loaded successfully")
         except Exception as e:
-            print(f"⚠️ PyAnnote Pipeline failed to load: {e}")
-            print("💡 To enable Speaker Diarization:")
-            print("   1. Visit https://hf.co/pyannote/speaker-diarization to accept user conditions")
-            print("   2. Create HuggingFace token at https://hf.co/settings/tokens")
-            print("   3. Set HUGGINGFACE_TOKEN in .env file")
+            logger.warning(f"⚠️ PyAnnote Pipeline failed to load: {e}")
+            logger.info("💡 To enable Speaker Diarization:")
+            logger.info("   1. Visit https://hf.co/pyannote/speaker-diarization to accept user conditions")
+            logger.info("   2. Create HuggingFace token at https://hf.co/settings/tokens")
+            logger.info("   3. Set HUGGINGFACE_TOKEN in .env file")
             self.available = False
     
     def _preprocess_audio_for_pyannote(self, audio_path: str) -> str:
         """Convert audio to PyAnnote-compatible format"""
         try:
-            print(f"🔄 Preprocessing audio for PyAnnote: {audio_path}")
+            logger.info(f"🔄 Preprocessing audio for PyAnnote: {audio_path}")
             
-            # Load audio with librosa (handles various formats well)
-            audio, sr = librosa.load(audio_path, sr=16000, mono=True)
+            # Decode in-process (native rate + polyphase resampling to 16 kHz)
+            audio = decode_audio(audio_path, 16000)
             
             # Create temporary WAV file
             temp_dir = tempfile.gettempdir()
@@ -79,35 +102,77 @@ class SpeakerDiarization:
             # Save as WAV with consistent format
             sf.write(temp_path, audio, 16000, format='WAV', subtype='PCM_16')
             
-            print(f"✅ Audio preprocessed and saved to: {temp_path}")
-            print(f"📏 Audio shape: {audio.shape}, Sample rate: 16000")
+            logger.info(f"✅ Audio preprocessed and saved to: {temp_path}")
+            logger.info(f"📏 Audio shape: {audio.shape}, Sample rate: 16000")
             
             return temp_path
             
         except Exception as e:
-            print(f"❌ Audio preprocessing failed: {e}")
+            logger.error(f"❌ Audio preprocessing failed: {e}")
             raise e
             
-    def identify_speakers(self, audio_path: str, num_speakers: int = None) -> List[Dict]:
-        """Speaker Diarization mit PyAnnote oder Fallback"""
-        if not self.available or not self.pipeline:
-            print("⚠️ Speaker Diarization not available - using single speaker fallback")
-            return self._create_single_speaker_fallback(audio_path)
+    def resolve_engine(self, engine: str = None) -> str:
+        """Tatsächlich verwendete Engine: 'pyannote' oder 'light'"""
+        engine = engine or self.default_engine
+        if engine == "light":
+            return "light"
+        if engine == "pyannote" and not (self.available and self.pipeline):
+            logger.warning("⚠️ PyAnnote requested but not available - using lightweight diarization")
+        return "pyannote" if self.available and self.pipeline else "light"
+    
+    def identify_speakers(self, audio_path: str, num_speakers: int = None, engine: str = None,
+                          progress_callback=None, return_embeddings: bool = False):
+        """Speaker Diarization mit PyAnnote oder der leichtgewichtigen MFCC-Engine
+        
+        ``engine``: 'pyannote', 'light' oder 'auto' (PyAnnote falls verfügbar).
+        Aufnahmen über ``DIARIZATION_LONG_FORM_THRESHOLD_SECONDS`` werden in Fenstern
+        verarbeitet; ``progress_callback(window, windows, processed_seconds)``
+        meldet dann den Fortschritt je Fenster.
+        
+        Mit ``return_embeddings`` wird ``(turns, voiceprints)`` zurückgegeben, wobei
+        ``voiceprints = {"engine": ..., "centroids": {sprecher: np.ndarray}}`` die
+        Cluster-Zentren im Embedding-Raum der tatsächlich verwendeten Engine enthält.
+        """
+        speakers, voiceprints = self._diarize(audio_path, num_speakers, engine, progress_callback)
+        tracer.current_span().set_attributes(**{
+            "diarization.engine": voiceprints.get("engine") or "fallback",
+            "diarization.turns": len(speakers),
+            "diarization.speakers": len({s.get("speaker") for s in speakers}),
+            "audio.duration_seconds": max((s.get("end", 0) for s in speakers), default=0.0)
+        })
+        return (speakers, voiceprints) if return_embeddings else speakers
+    
+    def _diarize(self, audio_path: str, num_speakers: int, engine: str, progress_callback):
+        if self.resolve_engine(engine) == "light":
+            return self._identify_speakers_light(audio_path, num_speakers, progress_callback)
+        
+        duration = self.decoder.probe_duration(audio_path) or 0
+        if duration > self.long_form_threshold:
+            try:
+                return self._identify_speakers_windowed(audio_path, num_speakers, duration, progress_callback)
+            except Exception as e:
+                logger.error(f"❌ Windowed speaker diarization failed: {e}")
+                logger.info("🔄 Falling back to lightweight diarization")
+                return self._identify_speakers_light(audio_path, num_speakers, progress_callback)
         
         preprocessed_path = None
         try:
-            print(f"🎭 Starting speaker diarization for: {audio_path}")
+            logger.info(f"🎭 Starting speaker diarization for: {audio_path}")
             
             # Preprocess audio to avoid tensor size issues
             preprocessed_path = self._preprocess_audio_for_pyannote(audio_path)
             
             # Apply diarization on preprocessed audio
+            options = {"num_speakers": num_speakers} if num_speakers else {}
             if num_speakers:
-                print(f"🎭 Running diarization with {num_speakers} speakers")
-                diarization = self.pipeline(preprocessed_path, num_speakers=num_speakers)
+                logger.info(f"🎭 Running diarization with {num_speakers} speakers")
             else:
-                print("🎭 Running diarization with automatic speaker detection")
-                diarization = self.pipeline(preprocessed_path)
+                logger.info("🎭 Running diarization with automatic speaker detection")
+            try:
+                diarization, embeddings = self.pipeline(preprocessed_path, return_embeddings=True, **options)
+            except TypeError:
+                # Older pyannote versions cannot return speaker embeddings
+                diarization, embeddings = self.pipeline(preprocessed_path, **options), None
             
             speakers = []
             for turn, _, speaker in diarization.itertracks(yield_label=True):
@@ -119,24 +184,143 @@ class SpeakerDiarization:
                 })
             
             unique_speakers = len(set(s['speaker'] for s in speakers))
-            print(f"🎭 Speaker diarization found {unique_speakers} unique speakers")
-            print(f"🎭 Total segments: {len(speakers)}")
+            logger.info(f"🎭 Speaker diarization found {unique_speakers} unique speakers")
+            logger.info(f"🎭 Total segments: {len(speakers)}")
             
-            return speakers
+            centroids = {}
+            if embeddings is not None:
+                for label, embedding in zip(diarization.labels(), embeddings):
+                    if not np.isnan(embedding).any():
+                        centroids[label] = np.asarray(embedding, dtype=np.float32)
+            return speakers, {"engine": "pyannote", "centroids": centroids}
             
         except Exception as e:
-            print(f"❌ Speaker Diarization failed: {e}")
-            print("🔄 Falling back to single speaker mode")
-            return self._create_single_speaker_fallback(audio_path)
+            logger.error(f"❌ Speaker Diarization failed: {e}")
+            logger.info("🔄 Falling back to lightweight diarization")
+            return self._identify_speakers_light(audio_path, num_speakers, progress_callback)
         
         finally:
             # Clean up temporary file
             if preprocessed_path and os.path.exists(preprocessed_path):
                 try:
                     os.remove(preprocessed_path)
-                    print(f"🧹 Cleaned up temporary file: {preprocessed_path}")
+                    logger.info(f"🧹 Cleaned up temporary file: {preprocessed_path}")
                 except Exception as e:
-                    print(f"⚠️ Failed to clean up temporary file: {e}")
+                    logger.warning(f"⚠️ Failed to clean up temporary file: {e}")
+    
+    def _identify_speakers_windowed(self, audio_path: str, num_speakers: int, duration: float,
+                                    progress_callback=None):
+        """PyAnnote-Langform-Modus mit konstantem Speicherbedarf.
+        
+        Segmentierung und Embeddings laufen je Fenster auf dem dekodierten Block
+        (keine Zwischendatei, kein Gesamtsignal im Speicher). Die lokalen Sprecher
+        aller Fenster werden anschließend über ihre Embeddings global geclustert,
+        damit die Labels im ganzen Meeting konsistent bleiben.
+        """
+        import torch
+        
+        windows = max(1, math.ceil(duration / self.window_seconds))
+        logger.info(f"🎭 Long recording ({duration / 60:.0f} min): diarizing in {windows} windows of {self.window_seconds:.0f}s")
+        
+        local_turns = []       # (window, lokales Label, start, end)
+        local_speakers = []    # (window, lokales Label)
+        local_embeddings = []
+        offset = 0.0
+        for index, block in enumerate(self.decoder.iter_blocks(audio_path, self.window_seconds)):
+            check_cancelled()
+            waveform = {"waveform": torch.from_numpy(block).unsqueeze(0), "sample_rate": 16000}
+            diarization, embeddings = self.pipeline(waveform, return_embeddings=True)
+            
+            for label_index, label in enumerate(diarization.labels()):
+                local_speakers.append((index, label))
+                local_embeddings.append(embeddings[label_index])
+            for turn, _, label in diarization.itertracks(yield_label=True):
+                local_turns.append((index, label, offset + float(turn.start), offset + float(turn.end)))
+            
+            offset += len(block) / 16000
+            logger.info(f"🎭 Window {index + 1}/{windows} done ({offset / 60:.1f} min)")
+            if progress_callback:
+                progress_callback(index + 1, windows, offset)
+        
+        local_embeddings = np.asarray(local_embeddings, dtype=np.float32)
+        global_labels = self._cluster_window_speakers(local_embeddings, local_speakers, num_speakers)
+        
+        speakers = []
+        for window, label, start, end in sorted(local_turns, key=lambda t: t[2]):
+            speakers.append({
+                "start": start,
+                "end": end,
+                "speaker": global_labels[(window, label)],
+                "duration": end - start
+            })
+        
+        logger.info(f"🎭 Windowed diarization found {len(set(global_labels.values()))} unique speakers")
+        logger.info(f"🎭 Total segments: {len(speakers)}")
+        
+        # Globale Zentren = Mittel der lokalen Embeddings je globalem Sprecher
+        centroids = {}
+        for label in set(global_labels.values()):
+            members = [i for i, key in enumerate(local_speakers) if global_labels[key] == label]
+            vectors = local_embeddings[members]
+            vectors = vectors[~np.isnan(vectors).any(axis=1)]
+            if len(vectors):
+                centroids[label] = vectors.mean(axis=0)
+        return speakers, {"engine": "pyannote", "centroids": centroids}
+    
+    def _cluster_window_speakers(self, embeddings: np.ndarray, local_speakers: List, num_speakers: int = None) -> Dict:
+        """Ordnet jedem (Fenster, lokales Label) ein globales ``SPEAKER_XX`` zu"""
+        if len(local_speakers) == 0:
+            return {}
+        
+        # Sprecher mit zu wenig Sprache haben in PyAnnote NaN-Embeddings
+        valid = np.flatnonzero(~np.isnan(embeddings).any(axis=1))
+        cluster_ids = np.full(len(local_speakers), -1, dtype=np.int64)
+        if len(valid) == 1:
+            cluster_ids[valid] = 0
+        elif len(valid) > 1:
+            tree = linkage(pdist(embeddings[valid], metric='cosine'), method='average')
+            if num_speakers:
+                cluster_ids[valid] = fcluster(tree, num_speakers, criterion='maxclust') - 1
+            else:
+                cluster_ids[valid] = fcluster(tree, self.cluster_threshold, criterion='distance') - 1
+        
+        # Ohne Embedding: häufigster globaler Sprecher desselben Fensters, sonst ein neuer
+        for index in np.flatnonzero(cluster_ids < 0):
+            window = local_speakers[index][0]
+            same_window = [cluster_ids[i] for i, (w, _) in enumerate(local_speakers) if w == window and cluster_ids[i] >= 0]
+            cluster_ids[index] = max(set(same_window), key=same_window.count) if same_window else cluster_ids.max() + 1
+        
+        # Globale Labels nach erstem Auftreten nummerieren
+        names = {}
+        labels = {}
+        for key, cluster_id in zip(local_speakers, cluster_ids):
+            names.setdefault(int(cluster_id), f"SPEAKER_{len(names):02d}")
+            labels[key] = names[int(cluster_id)]
+        return labels
+    
+    def _identify_speakers_light(self, audio_path: str, num_speakers: int = None, progress_callback=None):
+        """Leichtgewichtige Diarization (MFCC-Embeddings + Clustering), ohne Modell-Download.
+        Dekodiert blockweise, der Speicherbedarf hängt nicht von der Aufnahmelänge ab."""
+        try:
+            logger.info(f"🎭 Starting lightweight speaker diarization for: {audio_path}")
+            duration = self.decoder.probe_duration(audio_path)
+            speakers, centroids = self.light_engine.diarize_blocks(
+                self.decoder.iter_blocks(audio_path, self.window_seconds),
+                num_speakers=num_speakers,
+                progress_callback=progress_callback,
+                total_blocks=math.ceil(duration / self.window_seconds) if duration else None,
+                return_embeddings=True
+            )
+            
+            unique_speakers = len(set(s['speaker'] for s in speakers))
+            logger.info(f"🎭 Lightweight diarization found {unique_speakers} unique speakers")
+            logger.info(f"🎭 Total segments: {len(speakers)}")
+            return speakers, {"engine": "light", "centroids": centroids}
+            
+        except Exception as e:
+            logger.error(f"❌ Lightweight diarization failed: {e}")
+            logger.info("🔄 Falling back to single speaker mode")
+            return self._create_single_speaker_fallback(audio_path), {"engine": None, "centroids": {}}
     
     def _create_single_speaker_fallback(self, audio_path: str) -> List[Dict]:
         """Create a single speaker segment for the entire audio duration"""
@@ -144,16 +328,15 @@ class SpeakerDiarization:
             # Try to get audio duration
             duration = 0
             try:
-                audio, sr = librosa.load(audio_path, sr=None)
-                duration = len(audio) / sr
-                print(f"⏱️ Audio duration calculated: {duration:.2f} seconds")
+                duration = self.decoder.probe_duration(audio_path) or len(decode_audio(audio_path, 16000)) / 16000
+                logger.info(f"⏱️ Audio duration calculated: {duration:.2f} seconds")
             except Exception as e:
-                print(f"⚠️ Could not calculate duration: {e}")
+                logger.warning(f"⚠️ Could not calculate duration: {e}")
                 # Fallback to file size estimation
                 try:
                     file_size = os.path.getsize(audio_path)
                     duration = (file_size / 1024 / 1024) * 60  # Rough estimate
-                    print(f"⏱️ Estimated duration from file size: {duration:.2f} seconds")
+                    logger.info(f"⏱️ Estimated duration from file size: {duration:.2f} seconds")
                 except:
                     duration = 300  # 5 minutes default
             
@@ -165,7 +348,7 @@ class SpeakerDiarization:
             }]
             
         except Exception as e:
-            print(f"⚠️ Fallback speaker creation failed: {e}")
+            logger.warning(f"⚠️ Fallback speaker creation failed: {e}")
             return [{
                 "start": 0.0,
                 "end": 300.0,  # 5 minutes default
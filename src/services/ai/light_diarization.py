@@ -0,0 +1,252 @@
+# src/services/ai/light_diarization.py
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.cluster.hierarchy import fcluster, linkage
+from scipy.fft import dct
+from scipy.spatial.distance import pdist, squareform
+from typing import Callable, Dict, Iterable, List, Optional
+
+from services.audio.vad import VoiceActivityDetector
+
+class LightweightDiarization:
+    """Sprechertrennung ohne Modell-Download: MFCC-Embeddings + agglomeratives Clustering.
+
+    1. Log-Mel/MFCC-Merkmale für 25-ms-Frames (vektorisierte STFT)
+    2. Sprachbereiche per ``VoiceActivityDetector``
+    3. Embedding je Gleitfenster (Mittelwert und Streuung der MFCCs)
+    4. Agglomeratives Clustering (Cosinus-Distanz, Average-Linkage); die
+       Sprecherzahl wird über den Silhouette-Wert automatisch bestimmt
+    5. Benachbarte Fenster mit gleichem Sprecher werden zu Turns zusammengefasst
+
+    Für lange Aufnahmen wird nur eine Stichprobe der Fenster geclustert, die
+    übrigen Fenster werden dem nächsten Cluster-Zentrum zugeordnet.
+    """
+
+    def __init__(self, sample_rate: int = 16000, window_seconds: float = 1.5, hop_seconds: float = 0.75,
+                 n_mels: int = 40, n_mfcc: int = 20, max_speakers: int = 8,
+                 min_silhouette: float = 0.08, max_cluster_windows: int = 2000):
+        self.sample_rate = sample_rate
+        self.frame_length = int(0.025 * sample_rate)
+        self.frame_hop = int(0.010 * sample_rate)
+        self.n_fft = 1 << (self.frame_length - 1).bit_length()
+        self.n_mfcc = n_mfcc
+        self.window_frames = int(round(window_seconds / 0.010))
+        self.hop_frames = int(round(hop_seconds / 0.010))
+        self.max_speakers = max_speakers
+        self.min_silhouette = min_silhouette
+        self.max_cluster_windows = max_cluster_windows
+
+        self.analysis_window = np.hamming(self.frame_length).astype(np.float32)
+        self.mel_filters = self._mel_filterbank(n_mels)
+        self.vad = VoiceActivityDetector(sample_rate, min_silence_seconds=0.5, padding_seconds=0.1)
+
+    def _mel_filterbank(self, n_mels: int) -> np.ndarray:
+        """Dreiecksfilter auf der Mel-Skala (n_fft/2+1 × n_mels)"""
+        to_mel = lambda hz: 2595.0 * np.log10(1.0 + hz / 700.0)
+        to_hz = lambda mel: 700.0 * (10 ** (mel / 2595.0) - 1.0)
+        edges = to_hz(np.linspace(to_mel(60.0), to_mel(self.sample_rate / 2 - 200), n_mels + 2))
+        bins = np.fft.rfftfreq(self.n_fft, 1.0 / self.sample_rate)
+        lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+        rising = (bins - lower) / (center - lower)
+        falling = (upper - bins) / (upper - center)
+        return np.maximum(0.0, np.minimum(rising, falling)).T.astype(np.float32)
+
+    def features(self, audio: np.ndarray) -> np.ndarray:
+        """MFCCs je 10-ms-Frame (Frames × n_mfcc-1), ohne c0"""
+        audio = np.asarray(audio, dtype=np.float32)
+        if len(audio) < self.frame_length:
+            return np.zeros((0, self.n_mfcc - 1), dtype=np.float32)
+        emphasized = np.append(audio[0], audio[1:] - 0.97 * audio[:-1])
+        frames = sliding_window_view(emphasized, self.frame_length)[::self.frame_hop] * self.analysis_window
+        power = np.abs(np.fft.rfft(frames, n=self.n_fft, axis=1)) ** 2
+        log_mel = np.log(power @ self.mel_filters + 1e-8)
+        mfcc = dct(log_mel, type=2, axis=1, norm='ortho')[:, 1:self.n_mfcc]
+        return mfcc.astype(np.float32)
+
+    def window_embeddings(self, mfcc: np.ndarray, speech_frames: np.ndarray):
+        """Rohe Embeddings (MFCC-Mittelwert und -Streuung) für Gleitfenster mit
+        überwiegend Sprache. Gibt (Embeddings, Start-Frames der Fenster) zurück."""
+        if len(mfcc) < self.window_frames:
+            return np.zeros((0, 2 * mfcc.shape[1]), dtype=np.float32), np.zeros(0, dtype=np.int64)
+
+        # Fenster-Summen über Kumulativsummen statt Schleifen
+        def window_sums(values):
+            cumulative = np.concatenate([np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)])
+            starts = np.arange(0, len(values) - self.window_frames + 1, self.hop_frames)
+            return cumulative[starts + self.window_frames] - cumulative[starts], starts
+
+        weights = speech_frames.astype(np.float64)[:, None]
+        speech_counts, starts = window_sums(weights)
+        keep = speech_counts[:, 0] >= 0.5 * self.window_frames
+        if not keep.any():
+            return np.zeros((0, 2 * mfcc.shape[1]), dtype=np.float32), np.zeros(0, dtype=np.int64)
+
+        sums, _ = window_sums(mfcc * weights)
+        squares, _ = window_sums(mfcc ** 2 * weights)
+        counts = speech_counts[keep]
+        mean = sums[keep] / counts
+        std = np.sqrt(np.maximum(squares[keep] / counts - mean ** 2, 1e-8))
+
+        return np.hstack([mean, std]).astype(np.float32), starts[keep]
+
+    @staticmethod
+    def normalize(embeddings: np.ndarray) -> np.ndarray:
+        """Standardisierung über alle Fenster der Aufnahme, danach L2-Normierung"""
+        embeddings = (embeddings - embeddings.mean(axis=0)) / (embeddings.std(axis=0) + 1e-8)
+        return embeddings / (np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-8)
+
+    def cluster(self, embeddings: np.ndarray, num_speakers: Optional[int] = None) -> np.ndarray:
+        """Cluster-Label je Embedding (0..k-1)"""
+        if len(embeddings) < 2:
+            return np.zeros(len(embeddings), dtype=np.int64)
+
+        sample = np.arange(len(embeddings))
+        if len(embeddings) > self.max_cluster_windows:
+            sample = np.linspace(0, len(embeddings) - 1, self.max_cluster_windows).astype(np.int64)
+        distances = pdist(embeddings[sample], metric='cosine')
+        tree = linkage(distances, method='average')
+
+        if num_speakers:
+            labels = fcluster(tree, num_speakers, criterion='maxclust') - 1
+        else:
+            labels = self._select_speaker_count(tree, squareform(distances))
+
+        if len(sample) < len(embeddings):
+            labels = self.assign(embeddings, self.centroids(embeddings[sample], labels))
+        return labels
+
+    def _select_speaker_count(self, tree, distance_matrix: np.ndarray) -> np.ndarray:
+        """Sprecherzahl mit bestem Silhouette-Wert; unter ``min_silhouette`` → 1 Sprecher"""
+        best_labels = np.zeros(len(distance_matrix), dtype=np.int64)
+        best_score = self.min_silhouette
+        for k in range(2, min(self.max_speakers, len(distance_matrix) - 1) + 1):
+            labels = fcluster(tree, k, criterion='maxclust') - 1
+            score = self._silhouette(distance_matrix, labels)
+            if score > best_score:
+                best_score, best_labels = score, labels
+        return best_labels
+
+    @staticmethod
+    def _silhouette(distance_matrix: np.ndarray, labels: np.ndarray) -> float:
+        """Mittlerer Silhouette-Wert (vektorisiert über eine One-Hot-Matrix)"""
+        clusters = labels.max() + 1
+        if clusters < 2:
+            return -1.0
+        one_hot = np.eye(clusters)[labels]
+        counts = one_hot.sum(axis=0)
+        mean_distance = distance_matrix @ one_hot  # Summe der Distanzen je Cluster
+        own = mean_distance[np.arange(len(labels)), labels] / np.maximum(counts[labels] - 1, 1)
+        mean_distance /= counts
+        mean_distance[np.arange(len(labels)), labels] = np.inf
+        nearest = mean_distance.min(axis=1)
+        scores = (nearest - own) / np.maximum(np.maximum(own, nearest), 1e-12)
+        scores[counts[labels] <= 1] = 0.0
+        return float(scores.mean())
+
+    @staticmethod
+    def centroids(embeddings: np.ndarray, labels: np.ndarray) -> np.ndarray:
+        """Normierte Cluster-Zentren (k × dim)"""
+        one_hot = np.eye(labels.max() + 1)[labels]
+        centers = one_hot.T @ embeddings
+        return centers / (np.linalg.norm(centers, axis=1, keepdims=True) + 1e-8)
+
+    @staticmethod
+    def assign(embeddings: np.ndarray, centers: np.ndarray) -> np.ndarray:
+        """Nächstes Zentrum je Embedding (Cosinus-Ähnlichkeit, eine Matrixmultiplikation)"""
+        return np.argmax(embeddings @ centers.T, axis=1)
+
+    def diarize(self, audio: np.ndarray, num_speakers: int = None, return_embeddings: bool = False):
+        """Sprecher-Turns ``{start, end, speaker, duration}`` für ein 16-kHz-Signal"""
+        return self.diarize_blocks([audio], num_speakers=num_speakers, return_embeddings=return_embeddings)
+
+    def diarize_blocks(self, blocks: Iterable[np.ndarray], num_speakers: int = None,
+                       progress_callback: Callable = None, total_blocks: int = None,
+                       return_embeddings: bool = False):
+        """Diarization über aufeinanderfolgende Audioblöcke (Langform-Modus).
+
+        Merkmale und Fenster-Embeddings werden pro Block berechnet und der Block
+        danach verworfen; nur die kompakten Embeddings und die Sprachmaske
+        bleiben erhalten. Das Clustering läuft anschließend global über alle
+        Blöcke, die Sprecherlabels sind daher über das ganze Meeting konsistent.
+        ``progress_callback(block, total_blocks, processed_seconds)`` meldet den Fortschritt.
+
+        Mit ``return_embeddings`` wird zusätzlich ``{sprecher: stimmprofil}`` geliefert.
+        Das Stimmprofil ist der normierte Mittelwert der *rohen* Fenster-Embeddings
+        und damit – anders als die pro Aufnahme standardisierten Cluster-Embeddings –
+        zwischen Aufnahmen vergleichbar.
+        """
+        embeddings, starts, speech = [], [], []
+        frame_offset = 0
+        samples = 0
+        for index, block in enumerate(blocks):
+            block = np.asarray(block, dtype=np.float32)
+            block_frames = len(block) // self.frame_hop
+            mfcc = self.features(block)
+            speech_frames = self._speech_frames(block, len(mfcc))
+            block_embeddings, block_starts = self.window_embeddings(mfcc, speech_frames)
+
+            embeddings.append(block_embeddings)
+            starts.append(block_starts + frame_offset)
+            speech.append(np.pad(speech_frames, (0, max(0, block_frames - len(speech_frames))))[:block_frames])
+            frame_offset += block_frames
+            samples += len(block)
+            if progress_callback:
+                progress_callback(index + 1, total_blocks, samples / self.sample_rate)
+
+        duration = samples / self.sample_rate
+        embeddings = np.concatenate(embeddings) if embeddings else np.zeros((0, 1), dtype=np.float32)
+        if len(embeddings) == 0:
+            turns = [{"start": 0.0, "end": duration, "speaker": "SPEAKER_00", "duration": duration}]
+            return (turns, {}) if return_embeddings else turns
+
+        labels = self.cluster(self.normalize(embeddings), num_speakers)
+        turns, names = self._turns(labels, np.concatenate(starts), np.concatenate(speech), duration)
+        if not return_embeddings:
+            return turns
+        voiceprints = self.centroids(embeddings, labels)
+        return turns, {names[label]: voiceprints[label] for label in names}
+
+    def _speech_frames(self, audio: np.ndarray, frame_count: int) -> np.ndarray:
+        """VAD-Bereiche auf das 10-ms-Raster der Merkmale übertragen"""
+        speech = np.zeros(frame_count, dtype=bool)
+        for start, end in self.vad.detect(audio):
+            speech[int(start / 0.010):int(end / 0.010)] = True
+        return speech
+
+    def _turns(self, labels: np.ndarray, starts: np.ndarray, speech_frames: np.ndarray, duration: float):
+        """Gibt (Turns, {Cluster-Label: Sprechername}) zurück"""
+        # Einzelne Ausreißer-Fenster glätten (Label zwischen zwei gleichen Nachbarn)
+        labels = labels.copy()
+        if len(labels) > 2:
+            flips = (labels[:-2] == labels[2:]) & (labels[1:-1] != labels[:-2])
+            labels[1:-1][flips] = labels[:-2][flips]
+
+        # Jeder Sprach-Frame erhält das Label des Fensters mit dem nächsten Mittelpunkt
+        centers = starts + self.window_frames // 2
+        frame_index = np.flatnonzero(speech_frames)
+        nearest = np.clip(np.searchsorted(centers, frame_index), 1, max(len(centers) - 1, 1))
+        if len(centers) > 1:
+            nearest -= (frame_index - centers[nearest - 1]) < (centers[nearest] - frame_index)
+        else:
+            nearest[:] = 0
+        frame_labels = np.full(len(speech_frames), -1, dtype=np.int64)
+        frame_labels[frame_index] = labels[nearest]
+
+        # Sprecher nach erstem Auftreten nummerieren
+        unique, first_seen = np.unique(frame_labels[frame_index], return_index=True)
+        order = {int(label): index for index, label in enumerate(unique[np.argsort(first_seen)])}
+
+        changes = np.flatnonzero(np.diff(np.concatenate([[-1], frame_labels, [-1]])))
+        turns = []
+        for start, end in zip(changes[:-1], changes[1:]):
+            label = frame_labels[start]
+            if label < 0:
+                continue
+            turn_start, turn_end = start * 0.010, min(end * 0.010, duration)
+            turns.append({
+                "start": float(turn_start),
+                "end": float(turn_end),
+                "speaker": f"SPEAKER_{order[int(label)]:02d}",
+                "duration": float(turn_end - turn_start)
+            })
+        return turns, {label: f"SPEAKER_{index:02d}" for label, index in order.items()}
@@ -1,62 +1,18 @@
 # src/services/ai/ollama_client.py
+import logging
 import requests
 import json
 import sys
 from typing import Dict, List
 
-class OllamaClient:
-    def __init__(self, base_url: str = "http://localhost:11434"):
-        self.base_url = base_url
-        self.available = False
-        
-        # Test Ollama connection
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
-            if response.status_code == 200:
-                self.available = True
-                print("✅ Ollama server available")
-            else:
-                print("⚠️ Ollama server not responding")
-        except Exception as e:
-            print(f"⚠️ Ollama not available: {e}")
-            print("💡 Meeting protocols will use fallback generation")
-        
-    def generate_protocol(self, transcript: str, speakers: List[Dict], 
-                         model: str = "llama3") -> str:
-        """Protokoll-Generierung via Ollama mit erweiterten Prompt-Strategien"""
-        
-        if not self.available:
-            print("⚠️ Ollama not available - using fallback protocol generation")
-            return self._generate_fallback_protocol(transcript, speakers)
-        
-        print(f"🤖 [OLLAMA] Using model: {model}")
-        
-        # Enhanced speaker information with names
-        speaker_info = ""
-        if speakers:
-            unique_speakers = {}
-            for speaker in speakers:
-                speaker_id = speaker.get('speaker', speaker.get('original_id', 'Unknown'))
-                speaker_name = speaker.get('name', f"Person {len(unique_speakers) + 1}")
-                if speaker_id not in unique_speakers:
-                    unique_speakers[speaker_id] = speaker_name
-            
-            speaker_info = "TEILNEHMER:\n" + "\n".join([
-                f"- {name} (als {speaker_id} erkannt)" 
-                for speaker_id, name in unique_speakers.items()
-            ])
-        else:
-            speaker_info = "TEILNEHMER:\n- Ein Sprecher erkannt"
-        
-        # Vereinfachter und direkter Prompt für bessere Ergebnisse
-        prompt = f"""Analysiere das folgende Meeting-Transkript und erstelle ein strukturiertes Protokoll.
+from services.jobs.cancel import cancel_requested, check_cancelled
+from services.monitoring.metrics import OLLAMA_FALLBACKS, OLLAMA_REQUESTS
+from services.monitoring.tracing import STATUS_ERROR, tracer
 
-{speaker_info}
+logger = logging.getLogger(__name__)
 
-TRANSKRIPT:
-{transcript}
-
-Erstelle GENAU dieses Format - NUR die 9 Punkte, keine zusätzlichen Informationen:
+# Vorgegebenes 9-Punkte-Format für alle Protokoll-Prompts
+PROTOCOL_FORMAT = """Erstelle GENAU dieses Format - NUR die 9 Punkte, keine zusätzlichen Informationen:
 
 # Meeting-Protokoll
 
@@ -94,23 +50,155 @@ WICHTIG:
 - Kurze Stichpunkte
 - Bei leeren Punkten: "—"
 - Verwende die echten Namen der Teilnehmer"""
+
+class OllamaClient:
+    def __init__(self, base_url: str = "http://localhost:11434"):
+        self.base_url = base_url
+        self.available = False
         
+        # Test Ollama connection
         try:
-            response = requests.post(f'{self.base_url}/api/generate', 
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False
-                }, timeout=30)
-            
+            response = requests.get(f"{self.base_url}/api/tags", timeout=2)
             if response.status_code == 200:
-                return response.json()["response"]
+                self.available = True
+                logger.info("✅ Ollama server available")
             else:
-                print(f"⚠️ Ollama API error: {response.text}")
-                return self._generate_fallback_protocol(transcript, speakers)
+                logger.warning("⚠️ Ollama server not responding")
         except Exception as e:
-            print(f"⚠️ Ollama request failed: {e}")
+            logger.warning(f"⚠️ Ollama not available: {e}")
+            logger.info("💡 Meeting protocols will use fallback generation")
+        
+    def generate_protocol(self, transcript: str, speakers: List[Dict], 
+                         model: str = "llama3") -> str:
+        """Protokoll-Generierung via Ollama mit erweiterten Prompt-Strategien"""
+        
+        if not self.available:
+            logger.warning("⚠️ Ollama not available - using fallback protocol generation")
+            OLLAMA_FALLBACKS.inc(reason="unavailable")
             return self._generate_fallback_protocol(transcript, speakers)
+        
+        logger.info(f"🤖 [OLLAMA] Using model: {model}")
+        
+        speaker_info = self._speaker_info(speakers)
+        
+        # Vereinfachter und direkter Prompt für bessere Ergebnisse
+        prompt = f"""Analysiere das folgende Meeting-Transkript und erstelle ein strukturiertes Protokoll.
+
+{speaker_info}
+
+TRANSKRIPT:
+{transcript}
+
+{PROTOCOL_FORMAT}"""
+        
+        protocol = self._request_generate(prompt, model)
+        return protocol if protocol is not None else self._generate_fallback_protocol(transcript, speakers)
+    
+    def update_protocol(self, previous_protocol: str, new_transcript: str, speakers: List[Dict],
+                        full_transcript: str = None, model: str = "llama3") -> str:
+        """Schreibt ein bestehendes Protokoll mit dem Transkript eines neuen Aufnahmeteils fort.
+        
+        Das bisherige Protokoll dient als Zusammenfassung der früheren Teile, das LLM
+        sieht also nur den neuen Text. Ohne Ollama wird das Fallback-Protokoll aus
+        ``full_transcript`` (bzw. dem neuen Teil) erzeugt.
+        """
+        fallback_transcript = full_transcript or new_transcript
+        if not self.available:
+            logger.warning("⚠️ Ollama not available - using fallback protocol generation")
+            OLLAMA_FALLBACKS.inc(reason="unavailable")
+            return self._generate_fallback_protocol(fallback_transcript, speakers)
+        
+        logger.info(f"🤖 [OLLAMA] Updating protocol with new part using model: {model}")
+        prompt = f"""Ein Meeting wurde in mehreren Teilen aufgezeichnet. Unten steht das Protokoll der bisherigen Teile und das Transkript des neuen Teils. Führe beides zu einem aktualisierten Gesamtprotokoll zusammen.
+
+{self._speaker_info(speakers)}
+
+BISHERIGES PROTOKOLL:
+{previous_protocol}
+
+TRANSKRIPT DES NEUEN TEILS:
+{new_transcript}
+
+{PROTOCOL_FORMAT}
+- Inhalte des bisherigen Protokolls beibehalten, sofern der neue Teil sie nicht ändert"""
+        
+        protocol = self._request_generate(prompt, model)
+        return protocol if protocol is not None else self._generate_fallback_protocol(fallback_transcript, speakers)
+    
+    def _request_generate(self, prompt: str, model: str):
+        """Ein /api/generate-Aufruf als eigener Trace-Span; None bei Fehlern (→ Fallback).
+        Die Antwort wird gestreamt, damit ein abgebrochener Job die Generierung
+        zwischen zwei Teilantworten beenden kann (Verbindung wird geschlossen)."""
+        with tracer.span("ollama.generate", **{"llm.model": model, "llm.prompt_chars": len(prompt)}) as span:
+            try:
+                response = requests.post(f'{self.base_url}/api/generate',
+                    json={
+                        "model": model,
+                        "prompt": prompt,
+                        "stream": True
+                    }, timeout=30, stream=True)
+                span.set_attribute("http.status_code", response.status_code)
+                
+                with response:
+                    if response.status_code != 200:
+                        logger.warning(f"⚠️ Ollama API error: {response.text}")
+                        OLLAMA_REQUESTS.inc(outcome="http_error")
+                        OLLAMA_FALLBACKS.inc(reason="error")
+                        span.set_status(STATUS_ERROR, f"HTTP {response.status_code}")
+                        return None
+                    
+                    parts = []
+                    data = {}
+                    for line in response.iter_lines():
+                        if cancel_requested():
+                            OLLAMA_REQUESTS.inc(outcome="cancelled")
+                            check_cancelled()
+                        if not line:
+                            continue
+                        data = json.loads(line)
+                        parts.append(data.get("response", ""))
+                        if data.get("done"):
+                            break
+                
+                if not data.get("done"):
+                    # Verbindung abgerissen oder Server-Timeout: kein unvollständiges Protokoll speichern
+                    reason = data.get("error") or "stream ended without done"
+                    logger.warning(f"⚠️ Ollama response incomplete after {len(parts)} chunks: {reason}")
+                    OLLAMA_REQUESTS.inc(outcome="incomplete")
+                    OLLAMA_FALLBACKS.inc(reason="error")
+                    span.set_status(STATUS_ERROR, f"incomplete response: {reason}")
+                    return None
+                
+                OLLAMA_REQUESTS.inc(outcome="success")
+                span.set_attributes(**{
+                    "llm.prompt_tokens": data.get("prompt_eval_count"),
+                    "llm.eval_tokens": data.get("eval_count"),
+                    "llm.eval_seconds": data["eval_duration"] / 1e9 if data.get("eval_duration") else None
+                })
+                return "".join(parts)
+            except Exception as e:
+                logger.warning(f"⚠️ Ollama request failed: {e}")
+                OLLAMA_REQUESTS.inc(outcome="exception")
+                OLLAMA_FALLBACKS.inc(reason="error")
+                span.set_status(STATUS_ERROR, f"{type(e).__name__}: {e}")
+                return None
+    
+    def _speaker_info(self, speakers: List[Dict]) -> str:
+        """Teilnehmerliste für den Prompt"""
+        if not speakers:
+            return "TEILNEHMER:\n- Ein Sprecher erkannt"
+        
+        unique_speakers = {}
+        for speaker in speakers:
+            speaker_id = speaker.get('speaker', speaker.get('original_id', 'Unknown'))
+            speaker_name = speaker.get('name', f"Person {len(unique_speakers) + 1}")
+            if speaker_id not in unique_speakers:
+                unique_speakers[speaker_id] = speaker_name
+        
+        return "TEILNEHMER:\n" + "\n".join([
+            f"- {name} (als {speaker_id} erkannt)" 
+            for speaker_id, name in unique_speakers.items()
+        ])
     
     def _generate_fallback_protocol(self, transcript: str, speakers: List[Dict]) -> str:
         """Fallback-Protokoll ohne LLM - mit strukturiertem 9-Punkte-Format"""
@@ -191,22 +279,7 @@ Meeting-Diskussion (automatisch erkannt aus Audio-Transkription)
     def get_structured_protocol_prompt(self, transcript: str, speakers: List[Dict]) -> Dict:
         """Gibt einen strukturierten JSON-Prompt für das 9-Punkte-Protokoll zurück"""
         
-        # Enhanced speaker information with names
-        speaker_info = ""
-        if speakers:
-            unique_speakers = {}
-            for speaker in speakers:
-                speaker_id = speaker.get('speaker', speaker.get('original_id', 'Unknown'))
-                speaker_name = speaker.get('name', f"Person {len(unique_speakers) + 1}")
-                if speaker_id not in unique_speakers:
-                    unique_speakers[speaker_id] = speaker_name
-            
-            speaker_info = "TEILNEHMER:\n" + "\n".join([
-                f"- {name} (als {speaker_id} erkannt)" 
-                for speaker_id, name in unique_speakers.items()
-            ])
-        else:
-            speaker_info = "TEILNEHMER:\n- Ein Sprecher erkannt"
+        speaker_info = self._speaker_info(speakers)
         
         # Strukturierter JSON-Prompt
         prompt_content = f"""Du bist ein professioneller Meeting-Protokollant. Fasse das folgende Transkript sehr kompakt in ein strukturiertes Ergebnisprotokoll mit maximal 9 Punkten zusammen:
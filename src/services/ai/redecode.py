@@ -0,0 +1,154 @@
+# src/services/ai/redecode.py
+import logging
+import time
+import numpy as np
+from typing import Dict, List
+
+from config.settings import A2TSettings
+from services.ai.whisper_client import WhisperClient
+from services.audio.decoder import decode_audio
+from services.jobs.cancel import check_cancelled
+from services.jobs.scheduler import PRIORITY_DEFAULT
+
+logger = logging.getLogger(__name__)
+
+class SelectiveRedecoder:
+    """Dekodiert nur unsichere Whisper-Segmente erneut mit einem größeren Modell.
+
+    Ein Segment gilt als unsicher, wenn ``avg_logprob`` unter der Schwelle liegt
+    oder ``compression_ratio`` auf Wiederholungen hindeutet. Segmente, die
+    Whisper selbst als Stille einstuft (hohe ``no_speech_prob``), werden
+    übersprungen. Benachbarte unsichere Segmente werden zu Bereichen
+    zusammengefasst, neu transkribiert und zurück in das Transkript gesetzt.
+    """
+
+    def __init__(self, whisper_pool, compute_gate):
+        self.whisper_pool = whisper_pool
+        self.compute_gate = compute_gate
+        self.logprob_threshold = A2TSettings.REDECODE_LOGPROB_THRESHOLD
+        self.compression_ratio_threshold = A2TSettings.REDECODE_COMPRESSION_RATIO_THRESHOLD
+        self.no_speech_threshold = A2TSettings.REDECODE_NO_SPEECH_THRESHOLD
+        self.merge_gap = A2TSettings.REDECODE_MERGE_GAP_SECONDS
+        self.padding = A2TSettings.REDECODE_PADDING_SECONDS
+
+    def is_low_confidence(self, segment: Dict) -> bool:
+        """Prüft ein Whisper-Segment anhand seiner Konfidenzwerte"""
+        avg_logprob = segment.get("avg_logprob")
+        if avg_logprob is None:
+            return False
+        if segment.get("no_speech_prob", 0) > self.no_speech_threshold:
+            return False
+        return (avg_logprob < self.logprob_threshold or
+                segment.get("compression_ratio", 0) > self.compression_ratio_threshold)
+
+    def refine(self, audio_path: str, transcript_result: Dict, model: str,
+               language: str = "de", profile: str = None) -> Dict:
+        """Gibt ein neues Transkriptionsergebnis mit verbesserten Segmenten zurück.
+
+        Statistiken zur Neudekodierung stehen unter ``result["redecode"]``.
+        """
+        segments = transcript_result.get("segments", [])
+        duration = transcript_result.get("duration", 0)
+        ranges = self._plan_ranges(segments)
+
+        stats = {
+            "model": model,
+            "ranges": len(ranges),
+            "low_confidence_segments": sum(len(r["indices"]) for r in ranges),
+            "replaced_segments": 0,
+            "redecoded_seconds": 0.0,
+            "redecoded_fraction": 0.0,
+            "processing_time": 0.0
+        }
+
+        if not ranges:
+            logger.info("🎯 [REDECODE] No low-confidence segments found")
+            return dict(transcript_result, redecode=stats)
+
+        logger.info(f"🎯 [REDECODE] {stats['low_confidence_segments']} low-confidence segments in {len(ranges)} ranges, re-decoding with '{model}'")
+
+        audio = decode_audio(audio_path, WhisperClient.SAMPLE_RATE)
+        audio_duration = len(audio) / WhisperClient.SAMPLE_RATE
+        started_at = time.perf_counter()
+        replacements = {}
+
+        for range_info in ranges:
+            check_cancelled()
+            start = max(0.0, range_info["start"] - self.padding)
+            end = min(audio_duration, range_info["end"] + self.padding)
+            if end <= start:
+                continue
+
+            first_index = range_info["indices"][0]
+            prompt = segments[first_index - 1].get("text", "").strip() if first_index > 0 else None
+
+            with self.compute_gate.hold(PRIORITY_DEFAULT):
+                with self.whisper_pool.client(model) as client:
+                    redecoded = client.transcribe_array(
+                        audio[int(start * WhisperClient.SAMPLE_RATE):int(end * WhisperClient.SAMPLE_RATE)],
+                        language=language,
+                        offset=start,
+                        profile=profile,
+                        initial_prompt=prompt
+                    )
+            stats["redecoded_seconds"] += end - start
+
+            # Nur Segmente übernehmen, die im ursprünglichen Bereich liegen (Padding abschneiden)
+            new_segments = [
+                seg for seg in redecoded["segments"]
+                if range_info["start"] <= (seg["start"] + seg["end"]) / 2 <= range_info["end"]
+            ]
+            if not new_segments:
+                continue
+
+            old_logprob = np.mean([segments[i]["avg_logprob"] for i in range_info["indices"]])
+            new_logprob = np.mean([seg.get("avg_logprob", -np.inf) for seg in new_segments])
+            if new_logprob <= old_logprob:
+                continue
+
+            for seg in new_segments:
+                seg["redecoded"] = True
+            replacements[first_index] = (range_info["indices"], new_segments)
+            stats["replaced_segments"] += len(range_info["indices"])
+
+        stats["processing_time"] = time.perf_counter() - started_at
+        total = duration or audio_duration
+        stats["redecoded_fraction"] = stats["redecoded_seconds"] / total if total > 0 else 0.0
+
+        refined_segments = self._splice(segments, replacements)
+        logger.info(f"🎯 [REDECODE] Re-decoded {stats['redecoded_seconds']:.1f}s ({stats['redecoded_fraction']:.1%}), "
+                    f"replaced {stats['replaced_segments']} segments in {stats['processing_time']:.2f}s")
+
+        result = dict(transcript_result)
+        result["segments"] = refined_segments
+        result["text"] = "".join(seg.get("text", "") for seg in refined_segments)
+        result["redecode"] = stats
+        return result
+
+    def _plan_ranges(self, segments: List[Dict]) -> List[Dict]:
+        """Fasst unsichere Segmente mit kleinem Abstand zu Zeitbereichen zusammen"""
+        ranges = []
+        for index, segment in enumerate(segments):
+            if not self.is_low_confidence(segment):
+                continue
+            previous = ranges[-1] if ranges else None
+            if (previous and previous["indices"][-1] == index - 1 and
+                    segment["start"] - previous["end"] <= self.merge_gap):
+                previous["end"] = segment["end"]
+                previous["indices"].append(index)
+            else:
+                ranges.append({"start": segment["start"], "end": segment["end"], "indices": [index]})
+        return ranges
+
+    def _splice(self, segments: List[Dict], replacements: Dict) -> List[Dict]:
+        """Ersetzt die Segmente der verbesserten Bereiche durch die neuen Segmente"""
+        spliced = []
+        skip = set()
+        for index, segment in enumerate(segments):
+            if index in replacements:
+                indices, new_segments = replacements[index]
+                skip.update(indices)
+                spliced.extend(new_segments)
+            if index not in skip:
+                spliced.append(segment)
+        return spliced
@@ -0,0 +1,154 @@
+# src/services/ai/speaker_index.py
+import logging
+import os
+import numpy as np
+from threading import Lock
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+class SpeakerIndex:
+    """Persistenter Index bekannter Stimmen für wiederkehrende Meeting-Teilnehmer.
+
+    Pro Diarization-Engine (``pyannote``, ``light``) liegt eine Matrix
+    L2-normierter Stimmprofile im Speicher; die Suche nach allen Sprechern
+    einer Aufnahme ist eine einzige Matrixmultiplikation (Cosinus-Ähnlichkeit).
+    Gespeichert wird als ``.npz`` – wiederholtes Einlernen mittelt das Profil
+    über alle Beispiele. Die Ähnlichkeitsschwelle ist je Engine einstellbar, da
+    die MFCC-Profile der leichtgewichtigen Engine deutlich enger beieinander liegen.
+    """
+
+    def __init__(self, path: str, thresholds: Dict[str, float] = None, default_threshold: float = 0.75):
+        self.path = path
+        self.thresholds = thresholds or {}
+        self.default_threshold = default_threshold
+        self._lock = Lock()
+        self._names: Dict[str, List[str]] = {}
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._counts: Dict[str, np.ndarray] = {}
+        self._search: Dict[str, np.ndarray] = {}  # transponiert + zusammenhängend für die Suche
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                for engine in {key.rsplit('_', 1)[0] for key in data.files}:
+                    self._names[engine] = [str(name) for name in data[f"{engine}_names"]]
+                    self._vectors[engine] = data[f"{engine}_vectors"].astype(np.float32)
+                    self._counts[engine] = data[f"{engine}_counts"].astype(np.int64)
+                    self._refresh(engine)
+            logger.info(f"🗂️ Speaker index loaded: {sum(len(n) for n in self._names.values())} voices from {self.path}")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load speaker index {self.path}: {e}")
+
+    def _save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        arrays = {}
+        for engine, names in self._names.items():
+            arrays[f"{engine}_names"] = np.array(names, dtype=str)
+            arrays[f"{engine}_vectors"] = self._vectors[engine]
+            arrays[f"{engine}_counts"] = self._counts[engine]
+        temp_path = f"{self.path}.tmp.npz"
+        np.savez(temp_path, **arrays)
+        os.replace(temp_path, self.path)  # atomar, kein halb geschriebener Index
+
+    def _refresh(self, engine: str):
+        self._search[engine] = np.ascontiguousarray(self._vectors[engine].T)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return vectors / (np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-8)
+
+    def enroll(self, name: str, embedding, engine: str) -> Dict:
+        """Stimmprofil unter ``name`` einlernen (bzw. mit vorhandenem Profil mitteln)"""
+        vector = self._normalize(np.asarray(embedding, dtype=np.float32).reshape(-1))
+        with self._lock:
+            names = self._names.setdefault(engine, [])
+            if engine in self._vectors and self._vectors[engine].shape[1] != len(vector):
+                raise ValueError(f"Embedding dimension {len(vector)} does not match index ({self._vectors[engine].shape[1]})")
+
+            if name in names:
+                row = names.index(name)
+                count = self._counts[engine][row]
+                self._vectors[engine][row] = self._normalize(self._vectors[engine][row] * count + vector)
+                self._counts[engine][row] = count + 1
+            else:
+                names.append(name)
+                self._vectors[engine] = np.vstack([self._vectors.get(engine, np.zeros((0, len(vector)), np.float32)), vector])
+                self._counts[engine] = np.append(self._counts.get(engine, np.zeros(0, np.int64)), 1)
+            samples = int(self._counts[engine][names.index(name)])
+            self._refresh(engine)
+            self._save()
+        logger.info(f"🗂️ Enrolled speaker '{name}' ({engine}, {samples} samples)")
+        return {"name": name, "engine": engine, "samples": samples}
+
+    def remove(self, name: str) -> bool:
+        """Entfernt ``name`` aus allen Engines; False falls unbekannt"""
+        removed = False
+        with self._lock:
+            for engine, names in self._names.items():
+                if name in names:
+                    row = names.index(name)
+                    names.pop(row)
+                    self._vectors[engine] = np.delete(self._vectors[engine], row, axis=0)
+                    self._counts[engine] = np.delete(self._counts[engine], row)
+                    self._refresh(engine)
+                    removed = True
+            if removed:
+                self._save()
+        return removed
+
+    def list_speakers(self) -> List[Dict]:
+        speakers = {}
+        with self._lock:
+            for engine, names in self._names.items():
+                for name, count in zip(names, self._counts[engine]):
+                    entry = speakers.setdefault(name, {"name": name, "engines": {}})
+                    entry["engines"][engine] = int(count)
+        return sorted(speakers.values(), key=lambda s: s["name"])
+
+    def match(self, centroids: Dict[str, np.ndarray], engine: str) -> Dict[str, Dict]:
+        """Ordnet Cluster-Zentren bekannten Stimmen zu: ``{label: {name, similarity}}``"""
+        with self._lock:
+            names = list(self._names.get(engine, []))
+            matrix = self._search.get(engine)
+        return match_voiceprints(centroids, names, matrix, self.thresholds.get(engine, self.default_threshold))
+
+
+def match_voiceprints(centroids: Dict[str, np.ndarray], names: List[str], matrix: np.ndarray,
+                      threshold: float) -> Dict[str, Dict]:
+    """Ordnet Stimmprofile Referenzprofilen zu: ``{label: {name, similarity}}``.
+
+    ``matrix`` enthält die L2-normierten Referenzen spaltenweise (dim × len(names)).
+    Alle Ähnlichkeiten entstehen in einer Matrixmultiplikation; jede Referenz
+    wird höchstens einem Sprecher zugeordnet (bester Treffer zuerst).
+    """
+    if not centroids or not names:
+        return {}
+    labels = list(centroids.keys())
+    queries = SpeakerIndex._normalize(np.vstack([np.asarray(centroids[label]).reshape(-1) for label in labels]))
+    if queries.shape[1] != matrix.shape[0]:
+        return {}
+    similarities = queries @ matrix
+
+    # Je Sprecher genügen die k besten Kandidaten (k = Anzahl Sprecher)
+    k = min(len(labels), len(names))
+    columns = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+    candidates = np.take_along_axis(similarities, columns, axis=1)
+
+    matches = {}
+    used = set()
+    for flat in np.argsort(candidates, axis=None)[::-1]:
+        row, position = divmod(int(flat), k)
+        similarity = float(candidates[row, position])
+        if similarity < threshold:
+            break
+        column = int(columns[row, position])
+        if labels[row] in matches or column in used:
+            continue
+        matches[labels[row]] = {"name": names[column], "similarity": similarity}
+        used.add(column)
+    return matches
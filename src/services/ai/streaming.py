@@ -0,0 +1,221 @@
+# src/services/ai/streaming.py
+import logging
+import re
+import time
+import numpy as np
+import soundfile as sf
+from threading import Condition, Thread
+from typing import Dict, List
+
+from services.ai.whisper_client import WhisperClient
+from services.jobs.scheduler import PRIORITY_PREVIEW
+
+logger = logging.getLogger(__name__)
+
+class StreamingTranscriber:
+    """Inkrementelle Whisper-Transkription für Live-Meetings.
+
+    Eingehende 16-kHz-PCM-Blöcke werden auf Platte mitgeschrieben, im Speicher
+    bleibt nur das noch nicht bestätigte Fenster. Ein Worker-Thread dekodiert das
+    Fenster bei jedem neuen Schritt und bestätigt Segmente, sobald zwei
+    aufeinanderfolgende Hypothesen übereinstimmen (Local Agreement). Das letzte
+    Segment bleibt vorläufig, bis es durch neues Audio bestätigt wird.
+
+    Wird das Fenster länger als ``max_window_seconds``, wird Audio davor
+    erzwungen bestätigt bzw. (bei Stille) verworfen. Kommt länger als
+    ``idle_timeout`` kein Audio, beendet sich die Session selbst und ruft
+    ``on_expired`` auf.
+    """
+
+    SAMPLE_RATE = WhisperClient.SAMPLE_RATE
+    FORMATS = {"s16le": np.int16, "f32le": np.float32}
+
+    def __init__(self, session_id: str, whisper_pool, compute_gate, wav_path: str,
+                 model: str = "base", language: str = "de", sample_format: str = "s16le",
+                 step_seconds: float = 1.0, max_window_seconds: float = 20.0,
+                 idle_timeout: float = None, on_expired=None):
+        if sample_format not in self.FORMATS:
+            raise ValueError(f"Unsupported sample format: {sample_format}")
+
+        self.session_id = session_id
+        self.whisper_pool = whisper_pool
+        self.compute_gate = compute_gate
+        self.wav_path = wav_path
+        self.model = model
+        self.language = language
+        self.sample_format = sample_format
+        self.step_samples = int(step_seconds * self.SAMPLE_RATE)
+        self.max_window_samples = int(max_window_seconds * self.SAMPLE_RATE)
+        self.idle_timeout = idle_timeout
+        self.on_expired = on_expired
+
+        self.created_at = time.time()
+        self.last_activity = self.created_at
+        self.closed = False
+        self.expired = False
+        self.error = None
+        self.committed = []     # Bestätigte Segmente (Zeitachse der Gesamtaufnahme)
+        self.tentative = []     # Vorläufige Segmente des aktuellen Fensters
+        self.total_samples = 0
+        self.last_latency = None
+
+        self._window = np.zeros(0, dtype=np.float32)
+        self._window_start = 0  # Sample-Position des Fensteranfangs
+        self._pending_samples = 0
+        self._previous_hypothesis = []
+        self._remainder = b""
+        self._writer = sf.SoundFile(wav_path, mode="w", samplerate=self.SAMPLE_RATE,
+                                    channels=1, format="WAV", subtype="PCM_16")
+        self._condition = Condition()
+        self._worker = Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def feed(self, data: bytes):
+        """Nimmt rohe PCM-Bytes (mono, 16 kHz) entgegen"""
+        dtype = self.FORMATS[self.sample_format]
+        data = self._remainder + data
+        usable = len(data) - len(data) % np.dtype(dtype).itemsize
+        self._remainder = data[usable:]
+
+        samples = np.frombuffer(data[:usable], dtype=dtype)
+        if dtype == np.int16:
+            samples = samples.astype(np.float32) / 32768.0
+        else:
+            samples = samples.astype(np.float32)
+
+        with self._condition:
+            if self.closed:
+                raise RuntimeError("Stream already closed")
+            self._writer.write(samples)
+            self._window = np.concatenate([self._window, samples])
+            self._pending_samples += len(samples)
+            self.total_samples += len(samples)
+            self.last_activity = time.time()
+            self._condition.notify_all()
+
+    def close(self, timeout: float = 120.0) -> str:
+        """Beendet den Stream, bestätigt alle Segmente und gibt den WAV-Pfad zurück"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+        self._worker.join(timeout)
+        self._writer.close()
+        return self.wav_path
+
+    def state(self, since: int = 0) -> Dict:
+        """Aktueller Stand: bestätigte Segmente ab Index ``since`` und vorläufiger Text"""
+        with self._condition:
+            return {
+                "session_id": self.session_id,
+                "closed": self.closed,
+                "duration": self.total_samples / self.SAMPLE_RATE,
+                "committed_until": self._window_start / self.SAMPLE_RATE,
+                "committed_count": len(self.committed),
+                "committed": self.committed[since:],
+                "tentative": list(self.tentative),
+                "latency_seconds": self.last_latency,
+                "error": self.error
+            }
+
+    def _run(self):
+        while True:
+            with self._condition:
+                expired = False
+                while not self.closed and self._pending_samples < self.step_samples:
+                    idle = time.time() - self.last_activity
+                    if self.idle_timeout is None:
+                        self._condition.wait()
+                    elif idle >= self.idle_timeout:
+                        expired = True
+                        break
+                    else:
+                        self._condition.wait(self.idle_timeout - idle)
+                if expired:
+                    self._expire()
+                closing = self.closed
+                window = self._window.copy()
+                window_start = self._window_start
+                self._pending_samples = 0
+
+            if len(window) > 0:
+                try:
+                    self._decode(window, window_start, final=closing)
+                except Exception as e:
+                    logger.warning(f"⚠️ [STREAM {self.session_id[:8]}] Decoding failed: {e}")
+                    self.error = str(e)
+
+            if expired:
+                if self.on_expired:
+                    try:
+                        self.on_expired(self)
+                    except Exception as e:
+                        logger.warning(f"⚠️ [STREAM {self.session_id[:8]}] Cleanup after idle timeout failed: {e}")
+                return
+            if closing:
+                return
+
+    def _expire(self):
+        """Verlassene Session beenden (unter ``_condition`` aufgerufen)"""
+        logger.warning(f"⚠️ [STREAM {self.session_id[:8]}] No audio for {self.idle_timeout:.0f}s, closing session")
+        self.closed = True
+        self.expired = True
+        self.error = "Stream closed after idle timeout"
+        self._window = np.zeros(0, dtype=np.float32)
+        self._writer.close()
+
+    def _decode(self, window: np.ndarray, window_start: int, final: bool):
+        started_at = time.perf_counter()
+        offset = window_start / self.SAMPLE_RATE
+        prompt = " ".join(seg["text"] for seg in self.committed[-3:]) or None
+
+        with self.compute_gate.hold(PRIORITY_PREVIEW):
+            with self.whisper_pool.client(self.model) as client:
+                result = client.transcribe_array(window, language=self.language, offset=offset,
+                                                 profile="fast", initial_prompt=prompt)
+
+        hypothesis = [
+            {"start": seg["start"], "end": seg["end"], "text": seg.get("text", "").strip()}
+            for seg in result["segments"] if seg.get("text", "").strip()
+        ]
+
+        # Fenster zu lang: Audio vor den letzten max_window_samples wird auf jeden Fall abgeschnitten
+        overflow = 0 if final else len(window) - self.max_window_samples
+        if final:
+            commit_count = len(hypothesis)
+        else:
+            commit_count = self._agreed_prefix(self._previous_hypothesis, hypothesis)
+            if overflow > 0:
+                # Alles außer dem letzten Segment erzwingen, ebenso jedes Segment,
+                # das im abgeschnittenen Teil beginnt (auch ein einzelnes langes)
+                commit_count = max(commit_count, len(hypothesis) - 1)
+                while (commit_count < len(hypothesis)
+                       and hypothesis[commit_count]["start"] * self.SAMPLE_RATE - window_start < overflow):
+                    commit_count += 1
+
+        newly_committed = hypothesis[:commit_count]
+        with self._condition:
+            for seg in newly_committed:
+                seg["final"] = True
+                self.committed.append(seg)
+            cut = int(newly_committed[-1]["end"] * self.SAMPLE_RATE) - window_start if newly_committed else 0
+            cut = min(max(cut, overflow, 0), len(self._window))
+            if cut > 0:
+                self._window = self._window[cut:]
+                self._window_start += cut
+            self.tentative = [dict(seg, final=False) for seg in hypothesis[commit_count:]]
+            self.last_latency = time.perf_counter() - started_at
+
+        self._previous_hypothesis = hypothesis[commit_count:]
+
+    @staticmethod
+    def _agreed_prefix(previous: List[Dict], current: List[Dict]) -> int:
+        """Anzahl führender Segmente, die in beiden Hypothesen gleich sind (ohne das letzte)"""
+        def normalize(text: str) -> str:
+            return re.sub(r"[^\w\s]", "", text.lower()).strip()
+
+        count = 0
+        for prev_seg, cur_seg in zip(previous, current[:-1]):
+            if normalize(prev_seg["text"]) != normalize(cur_seg["text"]):
+                break
+            count += 1
+        return count
@@ -0,0 +1,192 @@
+# src/services/ai/stubs.py
+import logging
+import time
+import zlib
+from typing import Dict, List
+
+import numpy as np
+import soundfile as sf
+
+from config.settings import A2TSettings
+from services.ai.ollama_client import OllamaClient
+from services.ai.whisper_client import WhisperClient
+from services.audio.decoder import FFmpegDecoder
+from services.monitoring.metrics import WHISPER_REAL_TIME_FACTOR, observe_model_load
+
+logger = logging.getLogger(__name__)
+
+# Relative Rechenzeit je Modell (small = 1), angelehnt an ``relative_speed``
+MODEL_COST = {"tiny": 0.25, "base": 0.4, "small": 1.0, "medium": 2.5,
+              "large": 5.0, "large-v2": 5.0, "large-v3": 5.0}
+
+WORDS = ("wir", "sollten", "das", "Budget", "bis", "Freitag", "klären", "und", "danach", "den",
+         "Termin", "mit", "dem", "Team", "abstimmen", "ich", "übernehme", "die", "Aufgabe", "gut")
+
+def _work(seconds: float, cpu_bound: bool):
+    """Simulierte Rechenzeit: schlafen (GPU/Native-Code) oder Python-Schleife (hält das GIL)"""
+    if seconds <= 0:
+        return
+    if not cpu_bound:
+        time.sleep(seconds)
+        return
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+def _audio_duration(audio_path: str) -> float:
+    try:
+        return sf.info(audio_path).duration
+    except Exception:
+        return FFmpegDecoder(16000).probe_duration(audio_path) or 0.0
+
+def _seed(*parts) -> int:
+    return zlib.crc32(":".join(str(part) for part in parts).encode())
+
+
+class StubWhisperClient:
+    """Whisper-Ersatz für Last- und Durchsatztests ohne Modelle.
+
+    Gleiche Schnittstelle wie ``WhisperClient``; die Rechenzeit beträgt
+    ``latency + Dauer · real_time_factor · MODEL_COST[modell]``, die Ausgabe
+    enthält ``words_per_second`` Wörter je Audiosekunde in Segmenten von
+    ``segment_seconds``. Inhalte sind je Datei und Modell deterministisch.
+    """
+
+    AVAILABLE_MODELS = WhisperClient.AVAILABLE_MODELS
+    SAMPLE_RATE = WhisperClient.SAMPLE_RATE
+
+    def __init__(self, model_size: str = "small"):
+        self.latency = A2TSettings.STUB_LATENCY_SECONDS
+        self.real_time_factor = A2TSettings.STUB_REAL_TIME_FACTOR
+        self.model_load_seconds = A2TSettings.STUB_MODEL_LOAD_SECONDS
+        self.words_per_second = A2TSettings.STUB_WORDS_PER_SECOND
+        self.segment_seconds = A2TSettings.STUB_SEGMENT_SECONDS
+        self.cpu_bound = A2TSettings.STUB_CPU_BOUND
+        self.model = None
+        self.device = "stub"
+        self.version = "stub"
+        self.model_path = "stub"
+        self.current_model_size = None
+        self.load_model(model_size)
+
+    def load_model(self, model_size: str):
+        if model_size not in self.AVAILABLE_MODELS:
+            model_size = "small"
+        started_at = time.perf_counter()
+        _work(self.model_load_seconds * MODEL_COST.get(model_size, 1.0), self.cpu_bound)
+        self.current_model_size = model_size
+        observe_model_load("whisper", model_size, time.perf_counter() - started_at)
+        logger.info(f"🧪 [STUB] Whisper model '{model_size}' ready")
+
+    def get_model_info(self) -> Dict:
+        model_info = self.AVAILABLE_MODELS.get(self.current_model_size, {})
+        return {
+            "size_mb": int(model_info.get("size", "0").split()[0]) if "MB" in model_info.get("size", "") else 0,
+            "speed": model_info.get("relative_speed", "unknown"),
+            "description": "Stub engine (no model loaded)",
+            "model_name": self.current_model_size
+        }
+
+    def _transcribe(self, duration: float, language: str, offset: float, profile: str, seed: int) -> Dict:
+        started_at = time.perf_counter()
+        _work(self.latency + duration * self.real_time_factor * MODEL_COST.get(self.current_model_size, 1.0),
+              self.cpu_bound)
+        rng = np.random.default_rng(seed)
+        segments = []
+        position = 0.0
+        while position < duration:
+            end = min(duration, position + self.segment_seconds)
+            words = rng.choice(WORDS, size=max(1, int(round((end - position) * self.words_per_second))))
+            text = " " + " ".join(words).capitalize() + "."
+            segments.append({
+                "id": len(segments), "seek": int(position * 100), "start": offset + position, "end": offset + end,
+                "text": text, "tokens": [], "temperature": 0.0,
+                "avg_logprob": float(rng.uniform(-0.8, -0.1)), "compression_ratio": 1.4,
+                "no_speech_prob": float(rng.uniform(0.0, 0.1))
+            })
+            position = end
+        processing_time = time.perf_counter() - started_at
+        if duration > 0:
+            WHISPER_REAL_TIME_FACTOR.observe(processing_time / duration, model=self.current_model_size)
+        return {
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": language,
+            "duration": duration,
+            "model_used": self.current_model_size,
+            "profile": profile,
+            "processing_time": processing_time,
+            "real_time_factor": processing_time / duration if duration > 0 else None
+        }
+
+    def transcribe_with_timestamps(self, audio_path: str, language: str = "de", model_override: str = None,
+                                   profile: str = None) -> Dict:
+        if model_override and model_override != self.current_model_size:
+            self.load_model(model_override)
+        duration = _audio_duration(audio_path)
+        return self._transcribe(duration, language, 0.0, profile, _seed(audio_path, self.current_model_size))
+
+    def transcribe_array(self, audio: np.ndarray, language: str = "de", offset: float = 0.0,
+                         profile: str = None, initial_prompt: str = None) -> Dict:
+        duration = len(audio) / self.SAMPLE_RATE
+        return self._transcribe(duration, language, offset, profile, _seed(offset, duration, self.current_model_size))
+
+
+class StubDiarization:
+    """Diarization-Ersatz: wechselnde Sprecher-Turns mit fester Rechenzeit je Audiosekunde"""
+
+    def __init__(self):
+        self.available = False
+        self.pipeline = None
+        self.version = "stub"
+        self.model_name = "stub"
+        self.speakers = A2TSettings.STUB_SPEAKERS
+        self.real_time_factor = A2TSettings.STUB_DIARIZATION_REAL_TIME_FACTOR
+        self.cpu_bound = A2TSettings.STUB_CPU_BOUND
+
+    def resolve_engine(self, engine: str = None) -> str:
+        return "light"
+
+    def identify_speakers(self, audio_path: str, num_speakers: int = None, engine: str = None,
+                          progress_callback=None, return_embeddings: bool = False):
+        duration = _audio_duration(audio_path)
+        _work(duration * self.real_time_factor, self.cpu_bound)
+        rng = np.random.default_rng(_seed(audio_path))
+        count = max(1, num_speakers or self.speakers)
+
+        speakers = []
+        position = 0.0
+        while position < duration:
+            end = min(duration, position + float(rng.uniform(3.0, 15.0)))
+            speakers.append({"start": position, "end": end, "speaker": f"SPEAKER_{len(speakers) % count:02d}"})
+            position = end
+        if progress_callback:
+            progress_callback(1, 1, duration)
+        if not return_embeddings:
+            return speakers
+        centroids = {f"SPEAKER_{i:02d}": rng.standard_normal(32).astype(np.float32) for i in range(count)}
+        return speakers, {"engine": "stub", "centroids": centroids}
+
+
+class StubOllamaClient(OllamaClient):
+    """Ollama-Ersatz ohne Server: feste Antwortzeit und Protokollgröße"""
+
+    def __init__(self, base_url: str = None):
+        self.base_url = base_url or "stub://ollama"
+        self.available = True
+        self.latency = A2TSettings.STUB_LLM_SECONDS
+        self.protocol_chars = A2TSettings.STUB_PROTOCOL_CHARS
+
+    def _stub_protocol(self, transcript: str, speakers: List[Dict]) -> str:
+        _work(self.latency, False)  # Wartezeit auf den entfernten Server, kein lokaler Rechenaufwand
+        protocol = self._generate_fallback_protocol(transcript, speakers)
+        if len(protocol) < self.protocol_chars:
+            protocol += "\n" + "—" * (self.protocol_chars - len(protocol) - 1)
+        return protocol[:self.protocol_chars]
+
+    def generate_protocol(self, transcript: str, speakers: List[Dict], model: str = "llama3") -> str:
+        return self._stub_protocol(transcript, speakers)
+
+    def update_protocol(self, previous_protocol: str, new_transcript: str, speakers: List[Dict],
+                        full_transcript: str = None, model: str = "llama3") -> str:
+        return self._stub_protocol(full_transcript or new_transcript, speakers)
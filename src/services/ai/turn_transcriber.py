@@ -0,0 +1,173 @@
+# src/services/ai/turn_transcriber.py
+import logging
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List
+
+from services.ai.whisper_client import WhisperClient
+from services.audio.decoder import decode_audio
+from services.jobs.cancel import check_cancelled
+from services.jobs.scheduler import PRIORITY_DEFAULT
+
+logger = logging.getLogger(__name__)
+
+class TurnTranscriber:
+    """Diarize-first: transkribiert eine Aufnahme Sprecher-Turn für Sprecher-Turn.
+
+    Die Diarization-Turns werden zu lückenlosen Abschnitten erweitert (Grenze in
+    der Mitte zwischen zwei Turns), aufeinanderfolgende Turns desselben Sprechers
+    und zu kurze Turns zusammengelegt und sehr lange Turns geteilt. Jeder
+    Abschnitt wird einzeln auf einem eigenen Pool-Client transkribiert; jedes
+    Whisper-Segment gehört damit genau einem Sprecher, ein Überlappungsabgleich
+    entfällt. Die längsten Abschnitte werden zuerst vergeben, damit sich die
+    Arbeit gleichmäßig auf die Worker verteilt.
+    """
+
+    def __init__(self, whisper_pool, compute_gate, workers: int = 2,
+                 min_turn_seconds: float = 1.5, max_turn_seconds: float = 120.0):
+        self.whisper_pool = whisper_pool
+        self.compute_gate = compute_gate
+        self.workers = max(1, workers)
+        self.min_turn_seconds = min_turn_seconds
+        self.max_turn_seconds = max_turn_seconds
+
+    def plan_turns(self, speakers: List[Dict], duration: float) -> List[Dict]:
+        """Leitet aus den Diarization-Turns die zu transkribierenden Abschnitte ab"""
+        turns = sorted(
+            (t for t in speakers if t.get("end", 0) > t.get("start", 0)),
+            key=lambda t: t.get("start", 0)
+        )
+        if not turns or duration <= 0:
+            return [{"start": 0.0, "end": max(duration, 0.0), "speaker": "Speaker_1"}] if duration > 0 else []
+
+        # Lückenlos: Grenze jeweils in der Mitte zwischen zwei Turns (auch bei Überlappung)
+        pieces = []
+        for index, turn in enumerate(turns):
+            start = 0.0 if index == 0 else (turns[index - 1]["end"] + turn["start"]) / 2
+            end = duration if index == len(turns) - 1 else (turn["end"] + turns[index + 1]["start"]) / 2
+            start, end = max(0.0, start), min(duration, end)
+            if pieces:
+                start = max(start, pieces[-1]["end"])
+            if end > start:
+                pieces.append({"start": start, "end": end, "speaker": turn["speaker"]})
+
+        # Gleicher Sprecher hintereinander → ein Abschnitt
+        merged = []
+        for piece in pieces:
+            if merged and merged[-1]["speaker"] == piece["speaker"]:
+                merged[-1]["end"] = piece["end"]
+            else:
+                merged.append(dict(piece))
+
+        # Zu kurze Abschnitte dem Vorgänger (am Anfang dem Nachfolger) zuschlagen
+        planned = []
+        for index, piece in enumerate(merged):
+            if piece["end"] - piece["start"] >= self.min_turn_seconds:
+                if planned and planned[-1]["speaker"] == piece["speaker"]:
+                    planned[-1]["end"] = piece["end"]
+                else:
+                    planned.append(piece)
+            elif planned:
+                planned[-1]["end"] = piece["end"]
+            elif index + 1 < len(merged):
+                merged[index + 1]["start"] = piece["start"]
+            else:
+                planned.append(piece)
+
+        # Lange Monologe teilen, damit sie die Parallelisierung nicht ausbremsen
+        turns_out = []
+        for piece in planned:
+            length = piece["end"] - piece["start"]
+            parts = max(1, int(-(-length // self.max_turn_seconds)))
+            for part in range(parts):
+                turns_out.append({
+                    "start": piece["start"] + length * part / parts,
+                    "end": piece["start"] + length * (part + 1) / parts,
+                    "speaker": piece["speaker"]
+                })
+        return turns_out
+
+    def transcribe(self, audio_path: str, speakers: List[Dict], model: str,
+                   language: str = "de", profile: str = None,
+                   progress_callback: Callable[[int, int, float], None] = None,
+                   completed: List[Dict] = None, on_turn: Callable[[Dict], None] = None) -> Dict:
+        """Transkribiert alle Abschnitte parallel; Rückgabe im Format von
+        ``transcribe_with_timestamps``, jedes Segment trägt zusätzlich ``speaker``.
+
+        ``progress_callback(done, total, transcribed_seconds)`` wird nach jedem
+        fertigen Abschnitt aufgerufen. ``completed`` (bereits transkribierte Abschnitte)
+        und ``on_turn`` verwenden Einträge der Form ``{"index", "start", "end", "result"}``.
+        """
+        audio = decode_audio(audio_path, WhisperClient.SAMPLE_RATE)
+        duration = len(audio) / WhisperClient.SAMPLE_RATE
+        turns = self.plan_turns(speakers, duration)
+        workers = min(self.workers, len(turns)) or 1
+        logger.info(f"🎭 [DIARIZE-FIRST] {len(speakers)} diarization turns -> {len(turns)} sections on {workers} workers")
+
+        def transcribe_turn(turn: Dict) -> Dict:
+            check_cancelled()
+            start_sample = int(turn["start"] * WhisperClient.SAMPLE_RATE)
+            end_sample = int(turn["end"] * WhisperClient.SAMPLE_RATE)
+            with self.compute_gate.hold(PRIORITY_DEFAULT):
+                with self.whisper_pool.client(model) as client:
+                    return client.transcribe_array(
+                        audio[start_sample:end_sample],
+                        language=language,
+                        offset=turn["start"],
+                        profile=profile
+                    )
+
+        started_at = time.perf_counter()
+        results = [None] * len(turns)
+        done_seconds = 0.0
+        for entry in completed or []:
+            index = entry.get("index", -1)
+            if 0 <= index < len(turns) and abs(entry.get("start", -1) - turns[index]["start"]) < 1e-3:
+                results[index] = entry["result"]
+                done_seconds += turns[index]["end"] - turns[index]["start"]
+        resumed = sum(result is not None for result in results)
+        if resumed:
+            logger.info(f"♻️ [DIARIZE-FIRST] Resuming with {resumed}/{len(turns)} checkpointed sections")
+
+        # Längste Abschnitte zuerst (LPT), Ergebnis wieder in zeitlicher Reihenfolge
+        order = sorted((i for i in range(len(turns)) if results[i] is None),
+                       key=lambda i: turns[i]["end"] - turns[i]["start"], reverse=True)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="turn-whisper") as executor:
+            # Kontext (aktive Job-Zeitbilanz) an die Worker-Threads weitergeben
+            futures = {executor.submit(contextvars.copy_context().run, transcribe_turn, turns[i]): i
+                       for i in order}
+            for done, future in enumerate(as_completed(futures), start=resumed + 1):
+                index = futures[future]
+                results[index] = future.result()
+                done_seconds += turns[index]["end"] - turns[index]["start"]
+                if on_turn:
+                    on_turn({"index": index, "start": turns[index]["start"], "end": turns[index]["end"],
+                             "result": results[index]})
+                if progress_callback:
+                    progress_callback(done, len(turns), done_seconds)
+
+        segments = []
+        processing_time = 0.0
+        for turn, result in zip(turns, results):
+            processing_time += result.get("processing_time") or 0
+            for segment in result["segments"]:
+                segment["end"] = min(segment.get("end", 0), turn["end"])
+                segments.append(dict(segment, speaker=turn["speaker"]))
+
+        wall_time = time.perf_counter() - started_at
+        logger.info(f"🎭 [DIARIZE-FIRST] Transcribed {len(turns)} sections in {wall_time:.2f}s "
+                    f"({processing_time:.2f}s compute, {processing_time / wall_time if wall_time else 0:.1f}x parallel)")
+
+        return {
+            "text": "".join(seg.get("text", "") for seg in segments),
+            "segments": segments,
+            "language": results[0]["language"] if results else language,
+            "duration": duration,
+            "model_used": results[0]["model_used"] if results else model,
+            "profile": profile,
+            "processing_time": wall_time,
+            "real_time_factor": wall_time / duration if duration > 0 else None,
+            "turns": len(turns),
+            "workers": workers
+        }
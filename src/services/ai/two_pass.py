@@ -0,0 +1,141 @@
+# src/services/ai/two_pass.py
+import logging
+import time
+from typing import Callable, Dict, List
+
+from services.ai.whisper_client import WhisperClient
+from services.audio.decoder import decode_audio
+from services.jobs.cancel import check_cancelled
+from services.jobs.scheduler import PRIORITY_PREVIEW, PRIORITY_REFINE
+
+logger = logging.getLogger(__name__)
+
+class TwoPassTranscriber:
+    """Zwei-Pass-Transkription: schnelle Vorschau, danach fensterweise Verfeinerung.
+
+    Pass 1 transkribiert die komplette Aufnahme mit einem kleinen Modell (tiny/base)
+    und veröffentlicht das Ergebnis sofort. Pass 2 transkribiert die Aufnahme in
+    Fenstern mit dem angeforderten Modell und ersetzt die Vorschau-Segmente
+    Fenster für Fenster. Jedes Fenster belegt den Rechen-Slot nur kurz und mit
+    niedriger Priorität, damit Vorschauen anderer Jobs dazwischen laufen können.
+    """
+
+    def __init__(self, whisper_pool, compute_gate, window_seconds: float = 60.0):
+        self.whisper_pool = whisper_pool
+        self.compute_gate = compute_gate
+        self.window_seconds = window_seconds
+
+    def transcribe(self, audio_path: str, preview_model: str, final_model: str,
+                   language: str = "de", profile: str = None,
+                   on_update: Callable[[str, Dict], None] = None) -> Dict:
+        """Führt beide Pässe aus und gibt das verfeinerte Ergebnis im Format von
+        ``transcribe_with_timestamps`` zurück.
+
+        ``on_update(pass_name, partial)`` wird nach der Vorschau und nach jedem
+        verfeinerten Fenster aufgerufen (pass_name: "preview", "refining").
+        """
+        on_update = on_update or (lambda pass_name, partial: None)
+
+        audio = decode_audio(audio_path, WhisperClient.SAMPLE_RATE)
+        duration = len(audio) / WhisperClient.SAMPLE_RATE
+        logger.info(f"⏩ [TWO-PASS] Audio loaded: {duration:.2f}s, preview '{preview_model}' -> final '{final_model}'")
+
+        # Pass 1: Vorschau mit kleinem Modell und schnellem Profil
+        with self.compute_gate.hold(PRIORITY_PREVIEW):
+            with self.whisper_pool.client(preview_model) as client:
+                preview = client.transcribe_array(audio, language=language, profile="fast")
+
+        preview_segments = preview["segments"]
+        logger.info(f"⏩ [TWO-PASS] Preview ready: {len(preview_segments)} segments in {preview['processing_time']:.2f}s")
+        on_update("preview", self._partial(preview_segments, preview_model, 0.0, duration))
+
+        # Pass 2: Verfeinerung Fenster für Fenster
+        windows = self._plan_windows(preview_segments, duration)
+        refined_segments = []
+        processing_time = 0.0
+        model_used = final_model
+        started_at = time.perf_counter()
+
+        for index, (window_start, window_end) in enumerate(windows):
+            check_cancelled()
+            start_sample = int(window_start * WhisperClient.SAMPLE_RATE)
+            end_sample = int(window_end * WhisperClient.SAMPLE_RATE)
+
+            # Letzten Text als Prompt übergeben, damit der Kontext über Fenstergrenzen erhalten bleibt
+            prompt = " ".join(seg.get("text", "").strip() for seg in refined_segments[-3:]) or None
+
+            with self.compute_gate.hold(PRIORITY_REFINE):
+                with self.whisper_pool.client(final_model) as client:
+                    window_result = client.transcribe_array(
+                        audio[start_sample:end_sample],
+                        language=language,
+                        offset=window_start,
+                        profile=profile,
+                        initial_prompt=prompt
+                    )
+
+            refined_segments.extend(window_result["segments"])
+            processing_time += window_result["processing_time"]
+            model_used = window_result["model_used"]
+
+            # Verbleibende Vorschau-Segmente hinter dem verfeinerten Bereich anhängen
+            remaining_preview = [
+                seg for seg in preview_segments
+                if (seg.get("start", 0) + seg.get("end", 0)) / 2 >= window_end
+            ]
+            on_update("refining", self._partial(
+                refined_segments + remaining_preview, model_used, window_end, duration
+            ))
+            logger.info(f"⏩ [TWO-PASS] Window {index + 1}/{len(windows)} refined ({window_start:.1f}s - {window_end:.1f}s)")
+
+        logger.info(f"⏩ [TWO-PASS] Refinement completed in {time.perf_counter() - started_at:.2f}s")
+
+        return {
+            "text": "".join(seg.get("text", "") for seg in refined_segments),
+            "segments": refined_segments,
+            "language": preview.get("language", language),
+            "duration": duration,
+            "model_used": model_used,
+            "profile": profile,
+            "processing_time": processing_time,
+            "real_time_factor": processing_time / duration if duration > 0 else None,
+            "preview_model": preview_model,
+            "preview_processing_time": preview["processing_time"]
+        }
+
+    def _plan_windows(self, preview_segments: List[Dict], duration: float) -> List[tuple]:
+        """Teilt die Aufnahme in Fenster, deren Grenzen auf Vorschau-Segmentenden liegen"""
+        windows = []
+        window_start = 0.0
+
+        for segment in preview_segments:
+            segment_end = min(segment.get("end", 0), duration)
+            if segment_end - window_start >= self.window_seconds:
+                windows.append((window_start, segment_end))
+                window_start = segment_end
+
+        # Ohne passende Segmentgrenzen in festen Schritten weiter teilen
+        while duration - window_start > 1.5 * self.window_seconds:
+            windows.append((window_start, window_start + self.window_seconds))
+            window_start += self.window_seconds
+
+        if duration - window_start > 0 or not windows:
+            windows.append((window_start, duration))
+
+        return windows
+
+    def _partial(self, segments: List[Dict], model: str, refined_until: float, duration: float) -> Dict:
+        return {
+            "transcript": "".join(seg.get("text", "") for seg in segments),
+            "segments": [
+                {
+                    "start": seg.get("start", 0),
+                    "end": seg.get("end", 0),
+                    "text": seg.get("text", "")
+                }
+                for seg in segments
+            ],
+            "model": model,
+            "refined_until": refined_until,
+            "duration": duration
+        }
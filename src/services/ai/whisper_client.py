@@ -1,11 +1,25 @@
 # src/services/ai/whisper_client.py
+import logging
 import whisper
-import librosa
 import numpy as np
 from typing import Dict, List
 import os
+import time
+from contextlib import contextmanager
+from threading import Lock
+
+from config.settings import A2TSettings
+from services.audio.decoder import decode_audio
+from services.monitoring.metrics import (
+    WHISPER_REAL_TIME_FACTOR, observe_model_load, record_cache
+)
+from services.monitoring.tracing import tracer
+
+logger = logging.getLogger(__name__)
 
 class WhisperClient:
+    SAMPLE_RATE = 16000  # Whisper arbeitet intern immer mit 16 kHz
+    
     # Available Whisper models with descriptions
     AVAILABLE_MODELS = {
         "tiny": {"size": "39 MB", "relative_speed": "~32x", "description": "Schnellstes Modell, geringste Qualität"},
@@ -28,13 +42,15 @@ class WhisperClient:
     def load_model(self, model_size: str):
         """Load or reload Whisper model"""
         try:
-            print(f"🔄 Loading Whisper model: {model_size}")
+            logger.info(f"🔄 Loading Whisper model: {model_size}")
             if model_size not in self.AVAILABLE_MODELS:
-                print(f"⚠️ Unknown model {model_size}, falling back to 'small'")
+                logger.warning(f"⚠️ Unknown model {model_size}, falling back to 'small'")
                 model_size = "small"
             
+            started_at = time.perf_counter()
             self.model = whisper.load_model(model_size)
             self.current_model_size = model_size
+            observe_model_load("whisper", model_size, time.perf_counter() - started_at)
             
             # Update device information
             import torch
@@ -47,13 +63,13 @@ class WhisperClient:
                 self.version = 'unknown'
             
             model_info = self.AVAILABLE_MODELS[model_size]
-            print(f"✅ Whisper model '{model_size}' loaded successfully")
-            print(f"📊 Model size: {model_info['size']}, Speed: {model_info['relative_speed']}")
+            logger.info(f"✅ Whisper model '{model_size}' loaded successfully")
+            logger.info(f"📊 Model size: {model_info['size']}, Speed: {model_info['relative_speed']}")
             return True
         except Exception as e:
-            print(f"❌ Failed to load Whisper model '{model_size}': {e}")
+            logger.error(f"❌ Failed to load Whisper model '{model_size}': {e}")
             if model_size != "small":
-                print("🔄 Falling back to 'small' model...")
+                logger.info("🔄 Falling back to 'small' model...")
                 return self.load_model("small")
             return False
     
@@ -66,55 +82,70 @@ class WhisperClient:
             "description": model_info.get("description", "No description"),
             "model_name": self.current_model_size
         }
+    
+    def _get_decode_options(self, profile: str = None) -> Dict:
+        """Whisper-Decoding-Optionen für ein Speed-Profil (fast, balanced, accurate)"""
+        options = A2TSettings.get_decoding_profile(profile)
+        options["fp16"] = False  # Ensure no FP16 issues
+        return options
         
-    def transcribe_with_timestamps(self, audio_path: str, language: str = "de", model_override: str = None) -> Dict:
+    def transcribe_with_timestamps(self, audio_path: str, language: str = "de", model_override: str = None,
+                                   profile: str = None) -> Dict:
         """Whisper Transkription mit Zeitstempeln und robustem Fallback-System"""
         
+        if profile not in A2TSettings.WHISPER_DECODING_PROFILES:
+            profile = A2TSettings.WHISPER_SPEED_PROFILE
+        decode_options = self._get_decode_options(profile)
+        processing_time = 0.0
+        
         # Check if model change is requested
+        if model_override:
+            record_cache("whisper_model", model_override == self.current_model_size)
         if model_override and model_override != self.current_model_size:
-            print(f"🔄 Model change requested: {self.current_model_size} -> {model_override}")
+            logger.info(f"🔄 Model change requested: {self.current_model_size} -> {model_override}")
             if not self.load_model(model_override):
-                print(f"⚠️ Failed to load {model_override}, using current model: {self.current_model_size}")
+                logger.warning(f"⚠️ Failed to load {model_override}, using current model: {self.current_model_size}")
         
         try:
-            print(f"🎤 Starting Whisper transcription with model '{self.current_model_size}' for: {audio_path}")
+            logger.info(f"🎤 Starting Whisper transcription with model '{self.current_model_size}' for: {audio_path}")
+            logger.info(f"⚡ Speed profile: {profile}")
             
             # Verify audio file exists
             if not os.path.exists(audio_path):
                 raise FileNotFoundError(f"Audio file not found: {audio_path}")
             
-            print("🚀 Starting Whisper transcription...")
+            logger.info("🚀 Starting Whisper transcription...")
             
             # Try multiple transcription strategies with increasing simplicity
             result = None
             last_error = None
+            started_at = time.perf_counter()
             
             # Strategy 1: Simple direct transcription (most reliable)
             try:
-                print("🔄 Strategy 1: Direct transcription")
+                logger.info("🔄 Strategy 1: Direct transcription")
                 result = self.model.transcribe(
                     audio_path, 
                     language=language,
                     verbose=False,
-                    fp16=False  # Ensure no FP16 issues
+                    **decode_options
                 )
-                print("✅ Direct transcription successful")
+                logger.info("✅ Direct transcription successful")
                 
             except Exception as e1:
-                print(f"⚠️ Direct transcription failed: {e1}")
+                logger.warning(f"⚠️ Direct transcription failed: {e1}")
                 last_error = e1
                 
                 # Strategy 2: Try with explicit audio loading
                 try:
-                    print("🔄 Strategy 2: Manual audio loading")
-                    import librosa
+                    logger.info("🔄 Strategy 2: Manual audio loading")
                     
-                    # Load audio with librosa for better compatibility
-                    audio_data, sr = librosa.load(audio_path, sr=16000, mono=True)
+                    # Decode in-process (native rate + polyphase resampling to 16 kHz)
+                    audio_data = decode_audio(audio_path, self.SAMPLE_RATE)
                     
                     # Ensure minimum length (avoid empty audio)
                     if len(audio_data) < 1600:  # 0.1 seconds minimum
-                        print(f"⚠️ Very short audio ({len(audio_data)} samples), padding")
+                        logger.warning(f"⚠️ Very short audio ({len(audio_data)} samples), padding")
                         audio_data = np.pad(audio_data, (0, 1600 - len(audio_data)))
                     
                     # Normalize audio to prevent issues
@@ -125,65 +156,67 @@ class WhisperClient:
                         audio_data, 
                         language=language,
                         verbose=False,
-                        fp16=False
+                        **decode_options
                     )
-                    print("✅ Manual loading transcription successful")
+                    logger.info("✅ Manual loading transcription successful")
                     
                 except Exception as e2:
-                    print(f"⚠️ Manual loading failed: {e2}")
+                    logger.warning(f"⚠️ Manual loading failed: {e2}")
                     last_error = e2
                     
                     # Strategy 3: Try with minimal parameters
                     try:
-                        print("🔄 Strategy 3: Minimal parameters")
+                        logger.info("🔄 Strategy 3: Minimal parameters")
                         result = self.model.transcribe(audio_path)
-                        print("✅ Minimal transcription successful")
+                        logger.info("✅ Minimal transcription successful")
                         
                     except Exception as e3:
-                        print(f"⚠️ Minimal transcription failed: {e3}")
+                        logger.warning(f"⚠️ Minimal transcription failed: {e3}")
                         last_error = e3
                         
                         # Strategy 4: Try with different model (fallback to tiny)
                         if self.current_model_size != "tiny":
                             try:
-                                print("🔄 Strategy 4: Fallback to tiny model")
+                                logger.info("🔄 Strategy 4: Fallback to tiny model")
                                 original_model = self.current_model_size
                                 if self.load_model("tiny"):
                                     result = self.model.transcribe(
                                         audio_path,
                                         language=language,
                                         verbose=False,
-                                        fp16=False
+                                        **decode_options
                                     )
-                                    print("✅ Tiny model transcription successful")
+                                    logger.info("✅ Tiny model transcription successful")
                                     # Restore original model
                                     self.load_model(original_model)
                                     
                             except Exception as e4:
-                                print(f"⚠️ Tiny model fallback failed: {e4}")
+                                logger.warning(f"⚠️ Tiny model fallback failed: {e4}")
                                 last_error = e4
                                 # Restore original model
                                 self.load_model(original_model)
             
             if not result:
                 raise Exception(f"All transcription strategies failed. Last error: {last_error}")
+            
+            processing_time = time.perf_counter() - started_at
                 
-            print(f"✅ Whisper transcription completed!")
-            print(f"📝 Text length: {len(result.get('text', ''))}")
-            print(f"📊 Segments found: {len(result.get('segments', []))}")
+            logger.info(f"✅ Whisper transcription completed!")
+            logger.info(f"📝 Text length: {len(result.get('text', ''))}")
+            logger.info(f"📊 Segments found: {len(result.get('segments', []))}")
             
             # Calculate duration from segments or estimate from audio
             duration = 0
             if result.get('segments') and len(result['segments']) > 0:
                 last_segment = result['segments'][-1]
                 duration = last_segment.get('end', 0)
-                print(f"⏱️ Duration from segments: {duration:.2f} seconds")
+                logger.info(f"⏱️ Duration from segments: {duration:.2f} seconds")
             
-            # If duration is still 0 or not available, try librosa
+            # If duration is still 0 or not available, decode the audio
             if duration == 0:
-                print("⏱️ No duration from segments, calculating from audio file...")
+                logger.info("⏱️ No duration from segments, calculating from audio file...")
                 try:
-                    # Use a timeout approach for librosa loading
+                    # Use a timeout approach for audio decoding
                     import signal
                     
                     def timeout_handler(signum, frame):
@@ -195,33 +228,36 @@ class WhisperClient:
                         signal.alarm(5)
                     
                     try:
-                        audio, sr = librosa.load(audio_path, sr=None)
-                        duration = len(audio) / sr
-                        print(f"⏱️ Calculated duration from librosa: {duration:.2f} seconds")
+                        audio = decode_audio(audio_path, self.SAMPLE_RATE)
+                        duration = len(audio) / self.SAMPLE_RATE
+                        logger.info(f"⏱️ Calculated duration from decoded audio: {duration:.2f} seconds")
                     finally:
                         if os.name != 'nt':  # Unix systems
                             signal.alarm(0)  # Cancel alarm
                             
                 except (TimeoutError, Exception) as e:
-                    print(f"⚠️ Could not calculate duration with librosa: {e}")
+                    logger.warning(f"⚠️ Could not calculate duration from audio: {e}")
                     # Final fallback: estimate from file size (very rough)
                     try:
                         file_size = os.path.getsize(audio_path)
                         # Rough estimate: ~1MB per minute for MP3
                         duration = (file_size / 1024 / 1024) * 60
-                        print(f"⏱️ Estimated duration from file size: {duration:.2f} seconds")
+                        logger.info(f"⏱️ Estimated duration from file size: {duration:.2f} seconds")
                     except Exception as e2:
-                        print(f"⚠️ File size estimation failed: {e2}")
+                        logger.warning(f"⚠️ File size estimation failed: {e2}")
                         duration = 0
             
             # Update result with calculated duration and model info
             result['duration'] = duration
             result['model_used'] = self.current_model_size
             
-            print(f"✅ Transcription completed with model '{self.current_model_size}'. Duration: {duration:.2f}s")
+            logger.info(f"✅ Transcription completed with model '{self.current_model_size}'. Duration: {duration:.2f}s")
+            if duration > 0:
+                logger.info(f"⚡ Real-time factor: {processing_time / duration:.3f} ({processing_time:.2f}s processing)")
+                WHISPER_REAL_TIME_FACTOR.observe(processing_time / duration, model=self.current_model_size)
             
         except Exception as e:
-            print(f"⚠️ Whisper transcription failed: {e}")
+            logger.warning(f"⚠️ Whisper transcription failed: {e}")
             # Create minimal fallback result
             result = {
                 "text": "Transcription failed",
@@ -231,51 +267,112 @@ class WhisperClient:
                 "model_used": self.current_model_size
             }
 
+        tracer.current_span().set_attributes(**{
+            "whisper.model": result.get("model_used", self.current_model_size),
+            "whisper.profile": profile,
+            "audio.duration_seconds": result.get("duration", 0),
+            "whisper.real_time_factor": processing_time / result["duration"] if result.get("duration") else None
+        })
         return {
             "text": result.get("text", ""),
             "segments": result.get("segments", []),
             "language": result.get("language", "de"),
             "duration": result.get("duration", 0),
-            "model_used": result.get("model_used", self.current_model_size)
+            "model_used": result.get("model_used", self.current_model_size),
+            "profile": profile,
+            "processing_time": processing_time,
+            "real_time_factor": processing_time / result["duration"] if result.get("duration") else None
+        }
+    
+    def transcribe_array(self, audio: np.ndarray, language: str = "de", offset: float = 0.0,
+                         profile: str = None, initial_prompt: str = None) -> Dict:
+        """Transkribiert einen bereits dekodierten 16-kHz-Ausschnitt.
+        
+        Zeitstempel werden um ``offset`` Sekunden verschoben, damit die Segmente
+        direkt auf der Zeitachse der Gesamtaufnahme liegen. Fehler werden an den
+        Aufrufer weitergereicht.
+        """
+        if profile not in A2TSettings.WHISPER_DECODING_PROFILES:
+            profile = A2TSettings.WHISPER_SPEED_PROFILE
+        decode_options = self._get_decode_options(profile)
+        
+        audio = np.asarray(audio, dtype=np.float32)
+        if len(audio) < 1600:  # 0.1 seconds minimum
+            audio = np.pad(audio, (0, 1600 - len(audio)))
+        
+        duration = len(audio) / self.SAMPLE_RATE
+        with tracer.span("whisper.transcribe", **{"whisper.model": self.current_model_size, "whisper.profile": profile,
+                                                  "audio.offset_seconds": offset,
+                                                  "audio.duration_seconds": duration}) as span:
+            started_at = time.perf_counter()
+            result = self.model.transcribe(
+                audio,
+                language=language,
+                verbose=False,
+                initial_prompt=initial_prompt,
+                **decode_options
+            )
+            processing_time = time.perf_counter() - started_at
+            span.set_attribute("whisper.segments", len(result.get("segments", [])))
+        
+        if duration > 0:
+            WHISPER_REAL_TIME_FACTOR.observe(processing_time / duration, model=self.current_model_size)
+        
+        segments = []
+        for segment in result.get("segments", []):
+            segment = dict(segment)
+            segment["start"] = segment.get("start", 0) + offset
+            segment["end"] = segment.get("end", 0) + offset
+            segments.append(segment)
+        
+        return {
+            "text": result.get("text", ""),
+            "segments": segments,
+            "language": result.get("language", language),
+            "duration": duration,
+            "model_used": self.current_model_size,
+            "profile": profile,
+            "processing_time": processing_time,
+            "real_time_factor": processing_time / duration if duration > 0 else None
         }
     
     def _preprocess_audio_for_whisper(self, audio_path: str) -> str:
         """Preprocess audio for better Whisper compatibility"""
         try:
-            print(f"🔄 Preprocessing audio for Whisper: {audio_path}")
+            logger.info(f"🔄 Preprocessing audio for Whisper: {audio_path}")
             
             # Check if file exists and is readable
             if not os.path.exists(audio_path):
-                print(f"❌ Audio file not found: {audio_path}")
+                logger.error(f"❌ Audio file not found: {audio_path}")
                 return audio_path
             
             file_size = os.path.getsize(audio_path)
-            print(f"📏 Original file size: {file_size} bytes")
+            logger.info(f"📏 Original file size: {file_size} bytes")
             
-            # Try to load audio with librosa
-            print("🔄 Loading audio with librosa...")
-            audio, sr = librosa.load(audio_path, sr=16000, mono=True)
-            print(f"✅ Audio loaded: {len(audio)} samples at {sr}Hz")
+            # Decode in-process (native rate + polyphase resampling to 16 kHz)
+            logger.info("🔄 Decoding audio...")
+            audio = decode_audio(audio_path, self.SAMPLE_RATE)
+            logger.info(f"✅ Audio loaded: {len(audio)} samples at {self.SAMPLE_RATE}Hz")
             
             # Handle empty or very short audio
             if len(audio) == 0:
-                print("⚠️ Empty audio file detected")
+                logger.warning("⚠️ Empty audio file detected")
                 # Create minimal silence
                 audio = np.zeros(16000)  # 1 second of silence
-                print("✅ Created 1 second of silence as fallback")
+                logger.info("✅ Created 1 second of silence as fallback")
             elif len(audio) < 1600:  # Less than 0.1 seconds
-                print(f"⚠️ Very short audio detected: {len(audio)} samples, padding...")
+                logger.warning(f"⚠️ Very short audio detected: {len(audio)} samples, padding...")
                 # Pad to at least 1 second
                 audio = np.pad(audio, (0, 16000 - len(audio)), mode='constant')
-                print(f"✅ Padded to {len(audio)} samples")
+                logger.info(f"✅ Padded to {len(audio)} samples")
             
             # Normalize audio to prevent overflow
             if np.max(np.abs(audio)) > 0:
                 max_val = np.max(np.abs(audio))
                 audio = audio / max_val * 0.95
-                print(f"✅ Audio normalized (max: {max_val:.3f})")
+                logger.info(f"✅ Audio normalized (max: {max_val:.3f})")
             else:
-                print("⚠️ Audio appears to be silent")
+                logger.warning("⚠️ Audio appears to be silent")
             
             # Create temporary preprocessed file
             import tempfile
@@ -283,7 +380,7 @@ class WhisperClient:
             temp_filename = f"whisper_preprocessed_{os.path.basename(audio_path)}.wav"
             temp_path = os.path.join(temp_dir, temp_filename)
             
-            print(f"💾 Saving preprocessed audio to: {temp_path}")
+            logger.info(f"💾 Saving preprocessed audio to: {temp_path}")
             
             # Save as WAV with consistent format
             import soundfile as sf
@@ -292,15 +389,88 @@ class WhisperClient:
             # Verify saved file
             if os.path.exists(temp_path):
                 saved_size = os.path.getsize(temp_path)
-                print(f"✅ Preprocessed file saved: {saved_size} bytes")
+                logger.info(f"✅ Preprocessed file saved: {saved_size} bytes")
                 return temp_path
             else:
-                print(f"❌ Failed to save preprocessed file")
+                logger.error(f"❌ Failed to save preprocessed file")
                 return audio_path
             
         except Exception as e:
-            print(f"❌ Audio preprocessing failed: {e}")
+            logger.error(f"❌ Audio preprocessing failed: {e}")
             import traceback
             traceback.print_exc()
-            print("🔄 Using original file")
-            return audio_path
\ No newline at end of file
+            logger.info("🔄 Using original file")
+            return audio_path
+
+
+class WhisperClientPool:
+    """Hält zusätzliche WhisperClient-Instanzen je Modellgröße vor.
+    
+    Jede Instanz wird exklusiv ausgeliehen, damit parallele Jobs sich nicht
+    gegenseitig das Modell austauschen. Freie Instanzen bleiben geladen und
+    werden beim nächsten Ausleihen wiederverwendet. Ein ``primary``-Client
+    (der Haupt-Client des Dienstes) wird ebenfalls verliehen, solange er frei
+    ist und das gewünschte Modell bereits geladen hat; erst sonst entsteht
+    eine weitere Instanz, so liegt dasselbe Modell nicht unnötig doppelt im RAM.
+    Insgesamt bleiben höchstens ``max_idle_total`` freie Instanzen geladen; darüber
+    wird die am längsten unbenutzte verworfen (``primary`` zählt nicht mit).
+    """
+    
+    def __init__(self, max_idle_per_model: int = 1, client_factory=None, primary: "WhisperClient" = None,
+                 max_idle_total: int = None):
+        self.max_idle_per_model = max_idle_per_model
+        self.max_idle_total = max_idle_total
+        self.client_factory = client_factory or WhisperClient
+        self.primary = primary
+        self._primary_busy = False
+        self._idle = {}
+        self._lru = []  # freie Instanzen, am längsten unbenutzte zuerst
+        self._lock = Lock()
+    
+    @contextmanager
+    def client(self, model_size: str):
+        """Leiht einen WhisperClient mit geladenem ``model_size`` aus"""
+        with self._lock:
+            idle = self._idle.get(model_size, [])
+            client = idle.pop() if idle else None
+            if client is not None:
+                self._lru.remove(client)
+            if client is None and self.primary is not None and not self._primary_busy \
+                    and self.primary.current_model_size == model_size:
+                client = self.primary
+                self._primary_busy = True
+        record_cache("whisper_pool", client is not None)
+        
+        if client is None:
+            logger.info(f"🆕 Creating pooled Whisper client for model '{model_size}'")
+            client = self.client_factory(model_size=model_size)
+        
+        try:
+            yield client
+        finally:
+            with self._lock:
+                if client is self.primary:
+                    self._primary_busy = False
+                else:
+                    idle = self._idle.setdefault(client.current_model_size, [])
+                    if len(idle) < self.max_idle_per_model:
+                        idle.append(client)
+                        self._lru.append(client)
+                    self._evict()
+    
+    def _evict(self):
+        """Am längsten unbenutzte freie Instanzen über ``max_idle_total`` verwerfen (unter ``_lock``)"""
+        while self.max_idle_total is not None and len(self._lru) > max(0, self.max_idle_total):
+            client = self._lru.pop(0)
+            self._idle[client.current_model_size].remove(client)
+            logger.info(f"🗑️ Evicting idle pooled Whisper client for model '{client.current_model_size}'")
+    
+    def idle_clients(self) -> List["WhisperClient"]:
+        """Alle derzeit freien zusätzlichen Instanzen, ohne ``primary`` (z.B. für Speicherangaben)"""
+        with self._lock:
+            return [client for clients in self._idle.values() for client in clients]
+    
+    def resident_models(self) -> List[str]:
+        """Modelle, für die aktuell eine geladene, freie Instanz bereitsteht"""
+        with self._lock:
+            return [model for model, clients in self._idle.items() if clients]
@@ -0,0 +1,187 @@
+# src/services/audio/decoder.py
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import numpy as np
+import soundfile as sf
+from typing import Iterator, Optional
+
+from services.audio.resampler import Resampler, resample
+from services.monitoring.metrics import time_stage
+
+logger = logging.getLogger(__name__)
+
+class FFmpegDecoder:
+    """Dekodiert beliebige Audioformate über eine FFmpeg-Pipe direkt in NumPy.
+
+    Dekodiert wird in der Original-Samplerate: WAV/FLAC/OGG direkt über
+    soundfile, alle anderen Formate als Mono-PCM (float32) über die FFmpeg-Pipe.
+    Die Daten werden in Blöcken fester Größe in einen wiederverwendeten Puffer
+    gelesen und blockweise vom Polyphasen-``Resampler`` auf die Ziel-Samplerate
+    gebracht (bei 16-kHz-Quellen entfällt dieser Schritt). Es entstehen keine
+    Zwischendateien, der Speicherbedarf ist unabhängig von der Aufnahmelänge.
+    """
+
+    BYTES_PER_SAMPLE = 4  # f32le
+    STDERR_TAIL_BYTES = 4096  # Ende der FFmpeg-Fehlerausgabe für die Fehlermeldung
+
+    def __init__(self, sample_rate: int = 16000, block_seconds: float = 10.0, ffmpeg_binary: str = None):
+        self.sample_rate = sample_rate
+        self.block_seconds = block_seconds
+        self.ffmpeg_binary = ffmpeg_binary or os.environ.get('FFMPEG_BINARY') or shutil.which('ffmpeg')
+
+        # ffprobe liegt normalerweise neben ffmpeg
+        self.ffprobe_binary = None
+        if self.ffmpeg_binary:
+            directory, name = os.path.split(self.ffmpeg_binary)
+            candidate = os.path.join(directory, name.replace('ffmpeg', 'ffprobe'))
+            self.ffprobe_binary = candidate if os.path.exists(candidate) else shutil.which('ffprobe')
+
+    @property
+    def available(self) -> bool:
+        return bool(self.ffmpeg_binary)
+
+    @staticmethod
+    def _soundfile_info(audio_path: str):
+        """Header über libsndfile lesen, None falls das Format nicht unterstützt wird"""
+        try:
+            return sf.info(audio_path)
+        except Exception:
+            return None
+
+    def _ffprobe(self, audio_path: str, entry: str) -> Optional[float]:
+        if not self.ffprobe_binary:
+            return None
+        try:
+            output = subprocess.run(
+                [self.ffprobe_binary, '-v', 'error', '-select_streams', 'a:0', '-show_entries', entry,
+                 '-of', 'default=noprint_wrappers=1:nokey=1', audio_path],
+                capture_output=True, text=True, timeout=10, check=True
+            ).stdout.strip().splitlines()
+            return float(output[0]) if output and output[0] != 'N/A' else None
+        except Exception:
+            return None
+
+    def probe_duration(self, audio_path: str) -> Optional[float]:
+        """Dauer aus dem Container-Header (ohne zu dekodieren), None falls unbekannt"""
+        info = self._soundfile_info(audio_path)
+        if info is not None and info.samplerate > 0:
+            return info.frames / info.samplerate
+        return self._ffprobe(audio_path, 'format=duration')
+
+    def probe_sample_rate(self, audio_path: str) -> Optional[int]:
+        """Original-Samplerate des ersten Audiostreams, None falls unbekannt"""
+        info = self._soundfile_info(audio_path)
+        if info is not None:
+            return info.samplerate
+        rate = self._ffprobe(audio_path, 'stream=sample_rate')
+        return int(rate) if rate else None
+
+    def iter_blocks(self, audio_path: str, block_seconds: float = None) -> Iterator[np.ndarray]:
+        """Liefert das dekodierte Signal als Folge von float32-Blöcken (Ziel-Samplerate).
+
+        Jeder gelieferte Block ist eine Kopie und darf vom Aufrufer behalten werden.
+        """
+        block_seconds = block_seconds or self.block_seconds
+        info = self._soundfile_info(audio_path)
+        if info is not None:
+            source_rate = info.samplerate
+            blocks = self._iter_soundfile(audio_path, int(block_seconds * source_rate))
+        elif self.available:
+            # Unbekannte Rate: FFmpeg resampelt ausnahmsweise selbst
+            source_rate = self.probe_sample_rate(audio_path) or self.sample_rate
+            blocks = self._iter_ffmpeg(audio_path, source_rate, int(block_seconds * source_rate))
+        else:
+            raise RuntimeError("FFmpeg not available")
+
+        resampler = Resampler(source_rate, self.sample_rate)
+        for block in blocks:
+            block = resampler.process(block)
+            if len(block):
+                yield block
+        tail = resampler.flush()
+        if len(tail):
+            yield tail
+
+    @staticmethod
+    def _iter_soundfile(audio_path: str, block_samples: int) -> Iterator[np.ndarray]:
+        for block in sf.blocks(audio_path, blocksize=block_samples, dtype='float32', always_2d=True):
+            yield block[:, 0].copy() if block.shape[1] == 1 else block.mean(axis=1)
+
+    def _iter_ffmpeg(self, audio_path: str, source_rate: int, block_samples: int) -> Iterator[np.ndarray]:
+        buffer = bytearray(block_samples * self.BYTES_PER_SAMPLE)
+        view = memoryview(buffer)
+
+        # stderr in eine temporäre Datei statt einer Pipe: bei vielen Fehlermeldungen
+        # würde eine volle Pipe FFmpeg blockieren, während hier noch stdout gelesen wird
+        stderr_file = tempfile.TemporaryFile()
+        process = subprocess.Popen(
+            [self.ffmpeg_binary, '-nostdin', '-v', 'error', '-i', audio_path,
+             '-f', 'f32le', '-acodec', 'pcm_f32le', '-ac', '1', '-ar', str(source_rate), '-'],
+            stdout=subprocess.PIPE, stderr=stderr_file
+        )
+        try:
+            while True:
+                filled = 0
+                while filled < len(buffer):
+                    read = process.stdout.readinto(view[filled:])
+                    if not read:
+                        break
+                    filled += read
+
+                usable = filled - filled % self.BYTES_PER_SAMPLE
+                if usable:
+                    yield np.frombuffer(buffer, dtype=np.float32, count=usable // self.BYTES_PER_SAMPLE).copy()
+                if filled < len(buffer):
+                    break
+
+            process.wait()
+            if process.returncode != 0:
+                stderr_file.seek(max(0, stderr_file.seek(0, os.SEEK_END) - self.STDERR_TAIL_BYTES))
+                error = stderr_file.read().decode(errors='replace').strip()
+                raise RuntimeError(f"FFmpeg decoding failed ({process.returncode}): {error}")
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            stderr_file.close()
+
+    def decode(self, audio_path: str) -> np.ndarray:
+        """Dekodiert die komplette Datei in einen vorab angelegten Puffer"""
+        if not self.available and self._soundfile_info(audio_path) is None:
+            import librosa
+            logger.warning("⚠️ FFmpeg not available, decoding with librosa")
+            audio, source_rate = librosa.load(audio_path, sr=None, mono=True)
+            return resample(audio, source_rate, self.sample_rate)
+
+        duration = self.probe_duration(audio_path)
+        capacity = int(((duration or 60.0) + 1.0) * self.sample_rate)
+        audio = np.empty(capacity, dtype=np.float32)
+        length = 0
+
+        for block in self.iter_blocks(audio_path):
+            if length + len(block) > len(audio):
+                # Header-Dauer war zu kurz oder unbekannt: Puffer verdoppeln
+                grown = np.empty(max(len(audio) * 2, length + len(block)), dtype=np.float32)
+                grown[:length] = audio[:length]
+                audio = grown
+            audio[length:length + len(block)] = block
+            length += len(block)
+
+        return audio[:length]
+
+
+_default_decoder = None
+
+def decode_audio(audio_path: str, sample_rate: int = 16000) -> np.ndarray:
+    """Dekodiert eine Audiodatei zu Mono-float32 mit ``sample_rate`` (geteilter Decoder)"""
+    global _default_decoder
+    with time_stage("decode"):
+        if sample_rate != 16000:
+            return FFmpegDecoder(sample_rate).decode(audio_path)
+        if _default_decoder is None:
+            _default_decoder = FFmpegDecoder(sample_rate)
+        return _default_decoder.decode(audio_path)
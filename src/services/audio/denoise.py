@@ -0,0 +1,158 @@
+# src/services/audio/denoise.py
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Iterable, Iterator
+
+class SpectralGate:
+    """Rauschreduzierung per STFT Spectral Gating, blockweise und vektorisiert.
+
+    Das Rauschprofil (Mittelwert und Streuung der Leistung je Frequenzband in dB)
+    wird aus den energieärmsten Frames der Aufnahme geschätzt. Zeit-Frequenz-
+    Zellen unterhalb der daraus abgeleiteten Schwelle werden gedämpft. Die
+    Verarbeitung läuft über überlappende Blöcke mit Overlap-Add, der Speicher-
+    bedarf hängt daher nur von der Blockgröße ab, nicht von der Aufnahmelänge.
+    """
+
+    def __init__(self, sample_rate: int = 16000, n_fft: int = 512, hop_length: int = 128,
+                 threshold_std: float = 1.5, reduction_db: float = 12.0,
+                 noise_frames: int = 400, smoothing_bins: int = 3):
+        if n_fft % hop_length != 0:
+            raise ValueError("n_fft must be a multiple of hop_length")
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.threshold_std = threshold_std
+        self.reduction_gain = 10 ** (-reduction_db / 20)
+        self.noise_frames = noise_frames
+        self.smoothing_bins = smoothing_bins
+
+        self.window = np.hanning(n_fft + 1)[:-1].astype(np.float32)  # periodisches Hann-Fenster
+        # Normierung für Analyse- und Synthesefenster beim Overlap-Add
+        self.ola_norm = float(np.sum(self.window ** 2) / hop_length)
+
+    def estimate_noise_profile(self, blocks: Iterable[np.ndarray]) -> np.ndarray:
+        """Rauschschwelle je Frequenzband (dB) aus den leisesten Frames aller Blöcke"""
+        candidates = None
+        candidate_energy = None
+
+        for block in blocks:
+            power_db = self._power_db(self._frames(np.asarray(block, dtype=np.float32)))
+            if len(power_db) == 0:
+                continue
+            energy = power_db.mean(axis=1)
+            if candidates is None:
+                candidates, candidate_energy = power_db, energy
+            else:
+                candidates = np.concatenate([candidates, power_db])
+                candidate_energy = np.concatenate([candidate_energy, energy])
+            # Nur die leisesten Frames behalten → konstanter Speicher
+            if len(candidate_energy) > self.noise_frames:
+                keep = np.argpartition(candidate_energy, self.noise_frames)[:self.noise_frames]
+                candidates, candidate_energy = candidates[keep], candidate_energy[keep]
+
+        if candidates is None:
+            return np.full(self.n_fft // 2 + 1, -np.inf, dtype=np.float32)
+        return candidates.mean(axis=0) + self.threshold_std * candidates.std(axis=0)
+
+    def process_blocks(self, blocks: Iterable[np.ndarray], noise_threshold_db: np.ndarray) -> Iterator[np.ndarray]:
+        """Filtert einen Strom von Audioblöcken und liefert gleich lange Ausgabeblöcke"""
+        overlap = self.n_fft - self.hop_length
+        pending = np.zeros(overlap, dtype=np.float32)   # Eingabe ohne vollständigen Frame
+        ola_tail = np.zeros(overlap, dtype=np.float32)  # Überlappung für den nächsten Block
+        to_skip = overlap  # Verzögerung durch das vorangestellte Padding
+        input_length = 0
+        output_length = 0
+
+        def run(samples):
+            nonlocal pending, ola_tail, to_skip, output_length
+            buffer = np.concatenate([pending, samples])
+            output, pending, ola_tail = self._process(buffer, ola_tail, noise_threshold_db)
+            if to_skip:
+                skipped = min(to_skip, len(output))
+                output, to_skip = output[skipped:], to_skip - skipped
+            output_length += len(output)
+            return output
+
+        for block in blocks:
+            block = np.asarray(block, dtype=np.float32)
+            input_length += len(block)
+            output = run(block)
+            if len(output):
+                yield output
+
+        # Restliche Samples mit Stille aus dem Puffer schieben
+        output = run(np.zeros(overlap + self.hop_length, dtype=np.float32))
+        excess = output_length - input_length
+        if excess > 0:
+            output = output[:len(output) - excess]
+        if len(output):
+            yield output
+
+    def process_array(self, audio: np.ndarray, block_seconds: float = 30.0) -> np.ndarray:
+        """Komplettes Signal filtern (intern ebenfalls blockweise)"""
+        audio = np.asarray(audio, dtype=np.float32)
+        block_size = int(block_seconds * self.sample_rate)
+        blocks = lambda: (audio[i:i + block_size] for i in range(0, len(audio), block_size))
+        noise_threshold_db = self.estimate_noise_profile(blocks())
+        output = list(self.process_blocks(blocks(), noise_threshold_db))
+        return np.concatenate(output) if output else np.zeros(0, dtype=np.float32)
+
+    def _frames(self, samples: np.ndarray) -> np.ndarray:
+        if len(samples) < self.n_fft:
+            return np.zeros((0, self.n_fft), dtype=np.float32)
+        return sliding_window_view(samples, self.n_fft)[::self.hop_length] * self.window
+
+    @staticmethod
+    def _power_db(frames: np.ndarray) -> np.ndarray:
+        spectrum = np.fft.rfft(frames, axis=1)
+        return 10.0 * np.log10(np.abs(spectrum) ** 2 + 1e-12)
+
+    def _process(self, buffer: np.ndarray, ola_tail: np.ndarray, noise_threshold_db: np.ndarray):
+        """Ein Pufferstück filtern. Gibt (fertige Ausgabe, Rest-Eingabe, OLA-Rest) zurück."""
+        frames = self._frames(buffer)
+        frame_count = len(frames)
+        if frame_count == 0:
+            return np.zeros(0, dtype=np.float32), buffer, ola_tail
+
+        spectrum = np.fft.rfft(frames, axis=1)
+        power_db = 10.0 * np.log10(np.abs(spectrum) ** 2 + 1e-12)
+
+        # Gate-Maske mit Glättung über Frequenz und Zeit gegen "musical noise"
+        mask = (power_db > noise_threshold_db).astype(np.float32)
+        if self.smoothing_bins > 1:
+            mask = self._moving_average(self._moving_average(mask, axis=1), axis=0)
+        gain = self.reduction_gain + (1.0 - self.reduction_gain) * mask
+
+        output_frames = np.fft.irfft(spectrum * gain, n=self.n_fft, axis=1).astype(np.float32)
+        output_frames *= self.window / self.ola_norm
+
+        # Vektorisiertes Overlap-Add: n_fft = ratio * hop
+        ratio = self.n_fft // self.hop_length
+        ola = np.zeros((frame_count - 1) * self.hop_length + self.n_fft, dtype=np.float32)
+        ola[:len(ola_tail)] += ola_tail
+        shaped = output_frames.reshape(frame_count, ratio, self.hop_length)
+        for k in range(ratio):
+            start = k * self.hop_length
+            ola[start:start + frame_count * self.hop_length] += shaped[:, k, :].reshape(-1)
+
+        consumed = frame_count * self.hop_length
+        return ola[:consumed], buffer[consumed:], ola[consumed:]
+
+    def _moving_average(self, values: np.ndarray, axis: int) -> np.ndarray:
+        """Zentrierter gleitender Mittelwert über ``smoothing_bins`` Werte (Kumulativsumme)"""
+        width = self.smoothing_bins
+        before = width // 2
+        pad = [(0, 0), (0, 0)]
+        pad[axis] = (before + 1, width - 1 - before)
+        cumulative = np.cumsum(np.pad(values, pad, mode="edge"), axis=axis)
+        upper = np.take(cumulative, np.arange(width, cumulative.shape[axis]), axis=axis)
+        lower = np.take(cumulative, np.arange(0, cumulative.shape[axis] - width), axis=axis)
+        return (upper - lower) / width
+
+    def get_cost(self, processing_seconds: float, audio_seconds: float) -> Dict:
+        """Rechenaufwand je Audiominute"""
+        return {
+            "processing_time": processing_seconds,
+            "audio_seconds": audio_seconds,
+            "seconds_per_audio_minute": processing_seconds / (audio_seconds / 60) if audio_seconds > 0 else 0.0
+        }
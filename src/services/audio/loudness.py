@@ -0,0 +1,174 @@
+# src/services/audio/loudness.py
+import numpy as np
+from scipy import signal
+from scipy.ndimage import minimum_filter1d, uniform_filter1d
+from typing import Dict, Iterable, Iterator
+
+class LoudnessMeter:
+    """Inkrementelle Lautheitsmessung nach ITU-R BS.1770 / EBU R128.
+
+    Die Samples laufen durch das K-Filter (High-Shelf + Hochpass) mit
+    durchgereichtem Filterzustand, pro 100-ms-Schritt wird nur die mittlere
+    Energie gespeichert. Daraus entstehen am Ende die 400-ms-Blöcke mit 75 %
+    Überlappung und die integrierte Lautheit mit absolutem (-70 LUFS) und
+    relativem (-10 LU) Gate. Zusätzlich wird der True-Peak (4-fach überabgetastet)
+    ermittelt.
+    """
+
+    def __init__(self, sample_rate: int = 16000):
+        self.sample_rate = sample_rate
+        self.step = int(round(0.1 * sample_rate))
+        self._filters = self._k_weighting(sample_rate)
+        self._states = [signal.lfilter_zi(b, a) * 0.0 for b, a in self._filters]
+        self._pending = np.zeros(0, dtype=np.float64)
+        self._step_energies = []
+        self.true_peak = 0.0
+        self.samples = 0
+
+    @staticmethod
+    def _k_weighting(sample_rate: int):
+        """K-Filter-Koeffizienten für beliebige Abtastraten (bilineare Transformation)"""
+        # Stufe 1: High-Shelf (+4 dB oberhalb ~1.7 kHz)
+        gain_db, q, fc = 3.999843853973347, 0.7071752369554196, 1681.974450955533
+        k = np.tan(np.pi * fc / sample_rate)
+        vh = 10 ** (gain_db / 20)
+        vb = vh ** 0.4996667741545416
+        a0 = 1.0 + k / q + k * k
+        shelf = (
+            np.array([(vh + vb * k / q + k * k) / a0, 2.0 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0]),
+            np.array([1.0, 2.0 * (k * k - 1.0) / a0, (1.0 - k / q + k * k) / a0])
+        )
+        # Stufe 2: Hochpass (RLB-Gewichtung, ~38 Hz)
+        q, fc = 0.5003270373238773, 38.13547087602444
+        k = np.tan(np.pi * fc / sample_rate)
+        a0 = 1.0 + k / q + k * k
+        highpass = (
+            np.array([1.0, -2.0, 1.0]),
+            np.array([1.0, 2.0 * (k * k - 1.0) / a0, (1.0 - k / q + k * k) / a0])
+        )
+        return [shelf, highpass]
+
+    def update(self, block: np.ndarray):
+        block = np.asarray(block, dtype=np.float64)
+        if len(block) == 0:
+            return
+        self.samples += len(block)
+        self.true_peak = max(self.true_peak, true_peak(block))
+
+        filtered = block
+        for index, (b, a) in enumerate(self._filters):
+            filtered, self._states[index] = signal.lfilter(b, a, filtered, zi=self._states[index])
+
+        filtered = np.concatenate([self._pending, filtered])
+        steps = len(filtered) // self.step
+        if steps:
+            squares = filtered[:steps * self.step].reshape(steps, self.step) ** 2
+            self._step_energies.extend(squares.mean(axis=1))
+        self._pending = filtered[steps * self.step:]
+
+    def integrated_loudness(self) -> float:
+        """Integrierte Lautheit in LUFS (-inf bei Stille oder < 400 ms)"""
+        energies = np.asarray(self._step_energies)
+        if len(energies) < 4:
+            return float('-inf')
+        # 400-ms-Blöcke = Mittel aus 4 aufeinanderfolgenden 100-ms-Schritten
+        blocks = np.convolve(energies, np.full(4, 0.25), mode='valid')
+        loudness = -0.691 + 10.0 * np.log10(blocks + 1e-20)
+
+        gated = blocks[loudness > -70.0]
+        if len(gated) == 0:
+            return float('-inf')
+        relative_gate = -0.691 + 10.0 * np.log10(gated.mean()) - 10.0
+        gated = blocks[(loudness > -70.0) & (loudness > relative_gate)]
+        if len(gated) == 0:
+            return float('-inf')
+        return float(-0.691 + 10.0 * np.log10(gated.mean()))
+
+    def result(self) -> Dict:
+        return {
+            "integrated_lufs": self.integrated_loudness(),
+            "true_peak_dbtp": float(20.0 * np.log10(self.true_peak)) if self.true_peak > 0 else float('-inf'),
+            "duration": self.samples / self.sample_rate
+        }
+
+
+def oversampled_peaks(block: np.ndarray, oversampling: int = 4) -> np.ndarray:
+    """Betrag des überabgetasteten Signals, als Maximum je Original-Sample.
+
+    Die Ränder werden gespiegelt fortgesetzt, damit an Blockgrenzen kein
+    Einschwingen des Interpolationsfilters als Peak erscheint.
+    """
+    pad = min(16, len(block) - 1)
+    padded = np.pad(block, pad, mode='reflect') if pad > 0 else block
+    upsampled = np.abs(signal.resample_poly(padded, oversampling, 1))
+    upsampled = upsampled[pad * oversampling:(pad + len(block)) * oversampling]
+    return np.maximum(upsampled.reshape(-1, oversampling).max(axis=1), np.abs(block))
+
+
+def true_peak(block: np.ndarray, oversampling: int = 4) -> float:
+    """True-Peak (linear) über 4-fache Überabtastung"""
+    if len(block) == 0:
+        return 0.0
+    return float(oversampled_peaks(np.asarray(block, dtype=np.float64), oversampling).max())
+
+
+class LoudnessNormalizer:
+    """Normalisiert auf eine Ziel-Lautheit (Standard -23 LUFS nach EBU R128).
+
+    Arbeitet direkt auf bereits dekodierten Samples: erst Messung, dann
+    konstante Verstärkung. Optional verhindert ein True-Peak-Limiter, dass die
+    Verstärkung das Peak-Limit (Standard -2 dBTP) überschreitet.
+    """
+
+    def __init__(self, sample_rate: int = 16000, target_lufs: float = -23.0,
+                 true_peak_limit_db: float = -2.0, limit_true_peak: bool = True,
+                 max_gain_db: float = 30.0):
+        self.sample_rate = sample_rate
+        self.target_lufs = target_lufs
+        self.true_peak_limit_db = true_peak_limit_db
+        self.limit_true_peak = limit_true_peak
+        self.max_gain_db = max_gain_db
+        # Limiter: 5 ms Halte-/Glättungsfenster
+        self.limiter_window = max(1, int(0.005 * sample_rate))
+
+    def measure_blocks(self, blocks: Iterable[np.ndarray]) -> Dict:
+        meter = LoudnessMeter(self.sample_rate)
+        for block in blocks:
+            meter.update(block)
+        return meter.result()
+
+    def gain_db(self, measurement: Dict) -> float:
+        """Verstärkung, um die Ziel-Lautheit zu erreichen (0 bei Stille)"""
+        loudness = measurement.get("integrated_lufs", float('-inf'))
+        if not np.isfinite(loudness):
+            return 0.0
+        return float(np.clip(self.target_lufs - loudness, -self.max_gain_db, self.max_gain_db))
+
+    def apply_blocks(self, blocks: Iterable[np.ndarray], gain_db: float) -> Iterator[np.ndarray]:
+        gain = 10 ** (gain_db / 20)
+        for block in blocks:
+            block = np.asarray(block, dtype=np.float32) * gain
+            if self.limit_true_peak:
+                block = self.limit(block)
+            yield block
+
+    def limit(self, block: np.ndarray) -> np.ndarray:
+        """True-Peak-Limiter: glatte Absenkung nur dort, wo das Limit überschritten wird"""
+        limit = 10 ** (self.true_peak_limit_db / 20)
+        if len(block) == 0:
+            return block
+        peaks = oversampled_peaks(block)
+        if peaks.max() <= limit:
+            return block
+        reduction = np.minimum(1.0, limit / np.maximum(peaks, 1e-12))
+        # Minimum halten, dann glätten → keine harten Sprünge in der Verstärkung
+        reduction = minimum_filter1d(reduction, size=2 * self.limiter_window + 1)
+        reduction = uniform_filter1d(reduction, size=self.limiter_window)
+        return (block * reduction).astype(np.float32)
+
+    def normalize(self, audio: np.ndarray):
+        """Normalisiert ein komplettes Signal; gibt (audio, statistik) zurück"""
+        measurement = self.measure_blocks([audio])
+        gain_db = self.gain_db(measurement)
+        normalized = next(self.apply_blocks([audio], gain_db), np.zeros(0, dtype=np.float32))
+        return normalized, dict(measurement, gain_db=gain_db, target_lufs=self.target_lufs)
@@ -1,29 +1,115 @@
 # src/services/audio/processor.py
+import logging
 from pydub import AudioSegment
-import subprocess
-import librosa
+import time
 import soundfile as sf
+from typing import Dict
+
+from config.settings import A2TSettings
+from services.audio.decoder import FFmpegDecoder
+from services.audio.denoise import SpectralGate
+from services.audio.loudness import LoudnessMeter, LoudnessNormalizer
+
+logger = logging.getLogger(__name__)
 
 class AudioProcessor:
     def __init__(self):
         self.target_sample_rate = 16000  # Whisper-optimiert
+        self.block_seconds = 30.0
+        self.decoder = FFmpegDecoder(self.target_sample_rate, block_seconds=self.block_seconds)
+        self.spectral_gate = SpectralGate(self.target_sample_rate)
+        self.loudness = LoudnessNormalizer(
+            self.target_sample_rate,
+            target_lufs=A2TSettings.LOUDNESS_TARGET_LUFS,
+            true_peak_limit_db=A2TSettings.LOUDNESS_TRUE_PEAK_DB,
+            limit_true_peak=A2TSettings.LOUDNESS_TRUE_PEAK_LIMITING
+        )
+    
+    def load(self, input_path: str):
+        """Audio als Mono-float32 mit Ziel-Samplerate dekodieren (FFmpeg-Pipe)"""
+        return self.decoder.decode(input_path)
+    
+    def iter_blocks(self, input_path: str, block_seconds: float = None):
+        """Audio blockweise dekodieren, ohne die ganze Datei im Speicher zu halten"""
+        return self.decoder.iter_blocks(input_path, block_seconds or self.block_seconds)
         
     def normalize_audio(self, input_path: str, output_path: str) -> str:
-        """Audio-Normalisierung mit FFmpeg (Whitepaper-konform)"""
-        cmd = [
-            'ffmpeg', '-i', input_path,
-            '-af', 'loudnorm=I=-23:TP=-2:LRA=7',
-            '-ar', str(self.target_sample_rate),
-            '-y', output_path
-        ]
-        subprocess.run(cmd, check=True)
+        """Lautheits-Normalisierung nach EBU R128 (-23 LUFS, True-Peak -2 dBTP), in-process"""
+        measurement = self.loudness.measure_blocks(self.iter_blocks(input_path))
+        gain_db = self.loudness.gain_db(measurement)
+        with sf.SoundFile(output_path, mode='w', samplerate=self.target_sample_rate, channels=1,
+                          format='WAV', subtype='PCM_16') as output_file:
+            for block in self.loudness.apply_blocks(self.iter_blocks(input_path), gain_db):
+                output_file.write(block.clip(-1.0, 1.0))
         return output_path
+    
+    def create_loudness_meter(self) -> LoudnessMeter:
+        """Messgerät, das während der Dekodierung mit den Blöcken gefüttert wird"""
+        return LoudnessMeter(self.target_sample_rate)
+    
+    def measure_loudness_file(self, wav_path: str) -> Dict:
+        """Lautheit einer vorhandenen Ziel-WAV nur lesend messen; ``within_tolerance``
+        gibt an, ob die Normalisierung sie um höchstens ``LOUDNESS_TOLERANCE_DB``
+        ändern würde (und kein True-Peak-Limit überschritten ist)"""
+        meter = self.create_loudness_meter()
+        block_size = int(self.block_seconds * self.target_sample_rate)
+        for block in sf.blocks(wav_path, blocksize=block_size, dtype='float32'):
+            meter.update(block)
+        measurement = meter.result()
+        gain_db = self.loudness.gain_db(measurement)
+        peak_ok = (not self.loudness.limit_true_peak
+                   or measurement["true_peak_dbtp"] <= self.loudness.true_peak_limit_db)
+        return dict(measurement, gain_db=gain_db, target_lufs=self.loudness.target_lufs,
+                    within_tolerance=abs(gain_db) <= A2TSettings.LOUDNESS_TOLERANCE_DB and peak_ok)
+    
+    def normalize_loudness_in_place(self, wav_path: str, measurement: Dict) -> Dict:
+        """Wendet die Normalisierungs-Verstärkung direkt in einer WAV-Datei an.
+        
+        Die Messung stammt aus dem Dekodierdurchlauf, es ist daher weder ein
+        zweites Dekodieren noch eine Zwischendatei nötig.
+        """
+        gain_db = self.loudness.gain_db(measurement)
+        stats = dict(measurement, gain_db=gain_db, target_lufs=self.loudness.target_lufs)
+        if abs(gain_db) < 0.1 and not self.loudness.limit_true_peak:
+            return stats
+        
+        block_size = int(self.block_seconds * self.target_sample_rate)
+        with sf.SoundFile(wav_path, mode='r+') as wav_file:
+            position = 0
+            while position < wav_file.frames:
+                wav_file.seek(position)
+                block = wav_file.read(block_size, dtype='float32')
+                if len(block) == 0:
+                    break
+                normalized = next(self.loudness.apply_blocks([block], gain_db))
+                wav_file.seek(position)
+                wav_file.write(normalized.clip(-1.0, 1.0))
+                position += len(block)
+        return stats
         
     def reduce_noise(self, input_path: str, output_path: str) -> str:
         """Rauschreduzierung für bessere Transkription"""
-        # Librosa für Rauschfilterung
-        y, sr = librosa.load(input_path, sr=self.target_sample_rate)
-        # Noise reduction algorithm
-        y_denoised = librosa.effects.preemphasis(y)
-        sf.write(output_path, y_denoised, sr)
-        return output_path
\ No newline at end of file
+        self.denoise_file(input_path, output_path)
+        return output_path
+    
+    def denoise_file(self, input_path: str, output_path: str) -> Dict:
+        """Spectral-Gating-Rauschreduzierung mit konstantem Speicherbedarf.
+        
+        Pass 1 schätzt das Rauschprofil aus den leisesten Frames, Pass 2 filtert
+        Block für Block direkt in die Ausgabedatei. Gibt den Rechenaufwand zurück.
+        """
+        started_at = time.perf_counter()
+        noise_threshold_db = self.spectral_gate.estimate_noise_profile(self.iter_blocks(input_path))
+        
+        audio_samples = 0
+        with sf.SoundFile(output_path, mode='w', samplerate=self.target_sample_rate, channels=1,
+                          format='WAV', subtype='PCM_16') as output_file:
+            for block in self.spectral_gate.process_blocks(self.iter_blocks(input_path), noise_threshold_db):
+                output_file.write(block.clip(-1.0, 1.0))
+                audio_samples += len(block)
+        
+        cost = self.spectral_gate.get_cost(time.perf_counter() - started_at,
+                                           audio_samples / self.target_sample_rate)
+        logger.info(f"🔇 Noise reduction: {cost['audio_seconds']:.1f}s audio in {cost['processing_time']:.2f}s "
+                    f"({cost['seconds_per_audio_minute']:.3f}s per audio minute)")
+        return cost
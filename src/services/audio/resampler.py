@@ -0,0 +1,91 @@
+# src/services/audio/resampler.py
+import numpy as np
+from math import gcd
+from scipy import signal
+
+class Resampler:
+    """Zustandsbehaftetes Polyphasen-Resampling für Audioblöcke.
+
+    Das Verhältnis wird auf ganze Zahlen gekürzt (48 kHz → 16 kHz = 1:3,
+    44,1 kHz → 16 kHz = 160:441). ``scipy.signal.upfirdn`` wertet pro
+    Ausgabeprobe nur die passende Phase des Tiefpassfilters aus, das
+    hochgetastete Signal wird nie erzeugt. Der Filterverlauf wird über
+    Blockgrenzen hinweg fortgeführt, das Ergebnis entspricht daher
+    ``scipy.signal.resample_poly`` auf dem Gesamtsignal. Bei gleicher
+    Samplerate werden die Blöcke unverändert durchgereicht.
+    """
+
+    def __init__(self, source_rate: int, target_rate: int = 16000, window=('kaiser', 5.0)):
+        self.source_rate = int(source_rate)
+        self.target_rate = int(target_rate)
+        divisor = gcd(self.source_rate, self.target_rate)
+        self.up = self.target_rate // divisor
+        self.down = self.source_rate // divisor
+        self.passthrough = self.up == self.down
+
+        self._input_count = 0
+        self._next_output = 0
+        if self.passthrough:
+            return
+
+        # Gleiches Filterdesign wie resample_poly
+        max_rate = max(self.up, self.down)
+        self.delay = 10 * max_rate
+        self._taps = (signal.firwin(2 * self.delay + 1, 1.0 / max_rate, window=window) * self.up).astype(np.float32)
+        self.taps_per_phase = -(-len(self._taps) // self.up)
+
+        # Eingangspuffer beginnt mit Nullen als "Vergangenheit"
+        self._buffer = np.zeros(self.taps_per_phase - 1, dtype=np.float32)
+        self._buffer_start = -(self.taps_per_phase - 1)
+
+    def process(self, block: np.ndarray) -> np.ndarray:
+        """Nimmt einen Eingabeblock auf und liefert alle bereits berechenbaren Ausgaben"""
+        block = np.asarray(block, dtype=np.float32)
+        if self.passthrough:
+            return block
+        self._input_count += len(block)
+        self._buffer = np.concatenate([self._buffer, block])
+        return self._emit(final=False)
+
+    def flush(self) -> np.ndarray:
+        """Liefert die restlichen Ausgaben am Ende des Signals"""
+        if self.passthrough:
+            return np.zeros(0, dtype=np.float32)
+        self._buffer = np.concatenate([self._buffer, np.zeros(self.taps_per_phase, dtype=np.float32)])
+        return self._emit(final=True)
+
+    def _emit(self, final: bool) -> np.ndarray:
+        if final:
+            end = -(-self._input_count * self.up // self.down)
+        else:
+            # Ausgabe n braucht Eingaben bis (n * down + delay) // up
+            last_input = self._input_count - 1
+            end = ((last_input + 1) * self.up - 1 - self.delay) // self.down + 1
+        end = max(end, self._next_output)
+
+        output = np.zeros(0, dtype=np.float32)
+        if end > self._next_output:
+            # Position der ersten Ausgabe im (gedachten) hochgetasteten Puffer. upfirdn
+            # liefert nur Vielfache von ``down``, der Rest wird als Filterverzögerung vorangestellt.
+            position = self._next_output * self.down + self.delay - self._buffer_start * self.up
+            first = -(-position // self.down)
+            shift = first * self.down - position
+            taps = np.concatenate([np.zeros(shift, dtype=np.float32), self._taps]) if shift else self._taps
+            output = signal.upfirdn(taps, self._buffer, self.up, self.down)[first:first + end - self._next_output]
+        self._next_output = end
+
+        # Nicht mehr benötigte Eingaben verwerfen
+        keep_from = (self._next_output * self.down + self.delay) // self.up - (self.taps_per_phase - 1)
+        drop = min(max(0, keep_from - self._buffer_start), len(self._buffer))
+        self._buffer = self._buffer[drop:]
+        self._buffer_start += drop
+
+        return output.astype(np.float32, copy=False)
+
+
+def resample(audio: np.ndarray, source_rate: int, target_rate: int = 16000) -> np.ndarray:
+    """Resampelt ein komplettes Signal (intern über denselben Polyphasen-Pfad)"""
+    resampler = Resampler(source_rate, target_rate)
+    if resampler.passthrough:
+        return np.asarray(audio, dtype=np.float32)
+    return np.concatenate([resampler.process(audio), resampler.flush()])
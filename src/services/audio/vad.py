@@ -0,0 +1,156 @@
+# src/services/audio/vad.py
+import numpy as np
+from typing import Dict, List, Tuple
+
+class VoiceActivityDetector:
+    """Schnelle, energiebasierte Sprach-/Stille-Erkennung (vollständig vektorisiert).
+
+    Die Schwelle passt sich an den Grundrauschpegel der Aufnahme an: Frames, die
+    deutlich lauter als das untere Energie-Perzentil sind, gelten als Sprache.
+    Kurze Pausen innerhalb von Sprache werden geschlossen, kurze Ausreißer
+    verworfen und die Sprachbereiche leicht erweitert, damit keine Wortanfänge
+    abgeschnitten werden.
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: float = 30.0, margin_db: float = 12.0,
+                 min_level_db: float = -60.0, min_speech_seconds: float = 0.25,
+                 min_silence_seconds: float = 1.0, padding_seconds: float = 0.3):
+        self.sample_rate = sample_rate
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.frame_seconds = self.frame_length / sample_rate
+        self.margin_db = margin_db
+        self.min_level_db = min_level_db
+        self.min_speech_frames = max(1, int(round(min_speech_seconds / self.frame_seconds)))
+        self.min_silence_frames = max(1, int(round(min_silence_seconds / self.frame_seconds)))
+        self.padding_frames = int(round(padding_seconds / self.frame_seconds))
+
+    def speech_mask(self, audio: np.ndarray) -> np.ndarray:
+        """Bool-Maske pro Frame (True = Sprache)"""
+        frame_count = len(audio) // self.frame_length
+        if frame_count == 0:
+            return np.zeros(0, dtype=bool)
+
+        frames = np.asarray(audio[:frame_count * self.frame_length], dtype=np.float32)
+        frames = frames.reshape(frame_count, self.frame_length)
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+
+        noise_floor = np.percentile(energy_db, 10)
+        threshold = max(noise_floor + self.margin_db, self.min_level_db)
+        mask = energy_db > threshold
+
+        # Kurze Pausen schließen, kurze Ausreißer entfernen, dann Ränder erweitern
+        mask = self._fill_runs(mask, value=False, max_length=self.min_silence_frames)
+        mask = self._fill_runs(mask, value=True, max_length=self.min_speech_frames)
+        if self.padding_frames > 0 and mask.any():
+            kernel = np.ones(2 * self.padding_frames + 1)
+            mask = np.convolve(mask.astype(np.float32), kernel, mode="same") > 0
+        return mask
+
+    def detect(self, audio: np.ndarray) -> List[Tuple[float, float]]:
+        """Sprachbereiche als (start, end) in Sekunden"""
+        mask = self.speech_mask(audio)
+        starts, ends = self._runs(mask, True)
+        duration = len(audio) / self.sample_rate
+        return [
+            (float(start * self.frame_seconds), float(min(end * self.frame_seconds, duration)))
+            for start, end in zip(starts, ends)
+        ]
+
+    def compact(self, audio: np.ndarray, gap_seconds: float = 0.2) -> Tuple[np.ndarray, "SpeechTimeline"]:
+        """Schneidet Stille heraus. Zwischen den Sprachbereichen bleibt eine kurze
+        Pause, damit Whisper die Übergänge als Satzgrenzen erkennt."""
+        regions = self.detect(audio)
+        timeline = SpeechTimeline(regions, len(audio) / self.sample_rate, gap_seconds)
+        if not regions:
+            return np.zeros(0, dtype=np.float32), timeline
+
+        gap = np.zeros(int(gap_seconds * self.sample_rate), dtype=np.float32)
+        pieces = []
+        for index, (start, end) in enumerate(regions):
+            if index > 0:
+                pieces.append(gap)
+            pieces.append(np.asarray(audio[int(start * self.sample_rate):int(end * self.sample_rate)], dtype=np.float32))
+        return np.concatenate(pieces), timeline
+
+    def _fill_runs(self, mask: np.ndarray, value: bool, max_length: int) -> np.ndarray:
+        """Invertiert innere Läufe von ``value``, die kürzer als ``max_length`` sind"""
+        starts, ends = self._runs(mask, value)
+        short = (ends - starts) < max_length
+        if value is False:
+            # Stille am Anfang/Ende ist keine Pause zwischen Sprache
+            short &= (starts > 0) & (ends < len(mask))
+        result = mask.copy()
+        for start, end in zip(starts[short], ends[short]):
+            result[start:end] = not value
+        return result
+
+    @staticmethod
+    def _runs(mask: np.ndarray, value: bool) -> Tuple[np.ndarray, np.ndarray]:
+        """Start- und End-Indizes (exklusiv) aller Läufe mit ``value``"""
+        padded = np.concatenate([[False], mask == value, [False]]).astype(np.int8)
+        changes = np.flatnonzero(np.diff(padded))
+        return changes[0::2], changes[1::2]
+
+
+class SpeechTimeline:
+    """Bildet Zeitstempel der verdichteten Sprach-Audio zurück auf die Originalaufnahme ab"""
+
+    def __init__(self, regions: List[Tuple[float, float]], original_duration: float, gap_seconds: float = 0.2):
+        self.regions = regions
+        self.original_duration = original_duration
+        self.gap_seconds = gap_seconds
+
+        lengths = np.array([end - start for start, end in regions], dtype=np.float64)
+        self._original_starts = np.array([start for start, _ in regions], dtype=np.float64)
+        self._lengths = lengths
+        self._compact_starts = np.concatenate([[0.0], np.cumsum(lengths + gap_seconds)[:-1]]) if len(regions) else np.zeros(0)
+        self.speech_duration = float(lengths.sum())
+
+    def to_original(self, compact_time: float) -> float:
+        """Zeitpunkt der verdichteten Audio → Zeitpunkt der Originalaufnahme"""
+        if not self.regions:
+            return compact_time
+        index = max(0, int(np.searchsorted(self._compact_starts, compact_time, side="right")) - 1)
+        within = min(max(compact_time - self._compact_starts[index], 0.0), self._lengths[index])
+        return float(self._original_starts[index] + within)
+
+    def remap_segments(self, segments: List[Dict]) -> List[Dict]:
+        """Verschiebt start/end von Whisper-Segmenten auf die Originalzeitachse"""
+        remapped = []
+        for segment in segments:
+            segment = dict(segment)
+            segment["start"] = self.to_original(segment.get("start", 0))
+            segment["end"] = self.to_original(segment.get("end", 0))
+            remapped.append(segment)
+        return remapped
+
+    def remap_turns(self, turns: List[Dict]) -> List[Dict]:
+        """Bildet Sprecher-Turns ab und teilt sie an herausgeschnittener Stille"""
+        if not self.regions:
+            return turns
+        compact_ends = self._compact_starts + self._lengths
+        remapped = []
+        for turn in turns:
+            start, end = turn.get("start", 0), turn.get("end", 0)
+            first = max(0, int(np.searchsorted(self._compact_starts, start, side="right")) - 1)
+            last = max(0, int(np.searchsorted(self._compact_starts, end, side="right")) - 1)
+            for index in range(first, last + 1):
+                piece_start = max(start, self._compact_starts[index])
+                piece_end = min(end, compact_ends[index])
+                if piece_end <= piece_start:
+                    continue
+                original_start = self.to_original(piece_start)
+                original_end = self.to_original(piece_end)
+                remapped.append(dict(turn, start=original_start, end=original_end,
+                                     duration=original_end - original_start))
+        return remapped
+
+    def get_stats(self) -> Dict:
+        skipped = max(0.0, self.original_duration - self.speech_duration)
+        return {
+            "original_duration": self.original_duration,
+            "speech_duration": self.speech_duration,
+            "skipped_seconds": skipped,
+            "skipped_fraction": skipped / self.original_duration if self.original_duration > 0 else 0.0,
+            "speech_regions": len(self.regions)
+        }
@@ -0,0 +1,2 @@
+# src/services/jobs/__init__.py
+"""Job Scheduling Services"""
@@ -0,0 +1,58 @@
+# src/services/jobs/cancel.py
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Event
+from typing import Optional
+
+
+class JobCancelled(BaseException):
+    """Abbruch eines Jobs.
+
+    Erbt bewusst von ``BaseException``: die Pipeline fängt Fehler vielerorts
+    mit ``except Exception`` ab und rechnet mit Ersatzergebnissen weiter; ein
+    Abbruch soll diese Fallbacks nicht auslösen, sondern bis zum Job-Thread
+    durchlaufen.
+    """
+
+
+class CancelToken:
+    """Abbruchwunsch für einen Joblauf; die Pipeline prüft ihn kooperativ
+    zwischen Stufen und Abschnitten (``check``)"""
+
+    def __init__(self):
+        self._event = Event()
+        self.reason = None
+
+    def cancel(self, reason: str = "cancelled"):
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise JobCancelled(self.reason)
+
+
+_current: ContextVar[Optional[CancelToken]] = ContextVar("a2t_cancel_token", default=None)
+
+@contextmanager
+def cancellation_scope(token: CancelToken):
+    """Macht ``token`` im aktuellen Kontext (inkl. kopierter Worker-Kontexte) verfügbar"""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+def check_cancelled():
+    """Bricht mit ``JobCancelled`` ab, wenn der Job des aktuellen Kontexts abgebrochen wurde"""
+    token = _current.get()
+    if token is not None:
+        token.check()
+
+def cancel_requested() -> bool:
+    token = _current.get()
+    return token is not None and token.cancelled
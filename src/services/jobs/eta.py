@@ -0,0 +1,153 @@
+# src/services/jobs/eta.py
+import json
+import os
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+# Startwerte für den Real-Time-Factor (Rechenzeit / Audiodauer) auf CPU,
+# bis für eine Kombination abgeschlossene Jobs vorliegen
+PRIOR_WHISPER_RTF = {"tiny": 0.1, "base": 0.15, "small": 0.35, "medium": 0.8,
+                     "large": 1.5, "large-v2": 1.5, "large-v3": 1.5}
+PRIOR_DIARIZATION_RTF = {"light": 0.03, "pyannote": 0.25, "auto": 0.25}
+# Ladezeit eines noch nicht geladenen Whisper-Modells in Sekunden
+PRIOR_LOAD_SECONDS = {"tiny": 1.0, "base": 2.0, "small": 5.0, "medium": 15.0,
+                      "large": 30.0, "large-v2": 30.0, "large-v3": 30.0}
+
+# Whisper-Modelle nach Genauigkeit, bestes zuletzt
+MODELS_BY_ACCURACY = ("tiny", "base", "small", "medium", "large", "large-v2", "large-v3")
+
+
+class RuntimeModel:
+    """Lernt den Real-Time-Factor je (Whisper-Modell, Diarization-Engine).
+
+    Erwartete Laufzeit eines Jobs = ``overhead_seconds + RTF · Audiodauer``,
+    zuzüglich der Ladezeit, falls das Whisper-Modell noch nicht geladen ist.
+    Jeder abgeschlossene Job fließt als gleitender Mittelwert ein (Ladezeiten
+    getrennt je Modell); die ersten Beobachtungen werden mit dem Startwert
+    gemittelt, danach gewichtet ``alpha`` neue Jobs stärker als alte. Mit
+    ``path`` bleibt das Modell über Neustarts erhalten.
+    """
+
+    def __init__(self, path: str = None, alpha: float = 0.2, overhead_seconds: float = 5.0):
+        self.path = path
+        self.alpha = alpha
+        self.overhead_seconds = overhead_seconds
+        self._entries: Dict[str, Dict] = {}
+        self._lock = Lock()
+        # Schreiben außerhalb von _lock, damit Schätzungen nie auf Platten-I/O warten;
+        # _version verhindert, dass ein älterer Stand einen neueren überschreibt
+        self._save_lock = Lock()
+        self._version = 0
+        self._saved_version = 0
+        if path:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def _key(model: str, engine: str) -> str:
+        return f"{model}/{engine or 'auto'}"
+
+    @staticmethod
+    def prior(model: str, engine: str) -> float:
+        return PRIOR_WHISPER_RTF.get(model, 0.35) + PRIOR_DIARIZATION_RTF.get(engine or "auto", 0.25)
+
+    def real_time_factor(self, model: str, engine: str) -> float:
+        with self._lock:
+            entry = self._entries.get(self._key(model, engine))
+        return entry["rtf"] if entry else self.prior(model, engine)
+
+    def load_seconds(self, model: str) -> float:
+        with self._lock:
+            entry = self._entries.get(f"load/{model}")
+        return entry["seconds"] if entry else PRIOR_LOAD_SECONDS.get(model, 5.0)
+
+    def estimate(self, duration: Optional[float], model: str, engine: str, loaded: bool = True) -> Optional[float]:
+        """Erwartete Laufzeit in Sekunden, None bei unbekannter Audiodauer"""
+        if duration is None:
+            return None
+        seconds = self.overhead_seconds + self.real_time_factor(model, engine) * duration
+        return seconds if loaded else seconds + self.load_seconds(model)
+
+    def _update(self, key: str, field: str, value: float, prior: float):
+        with self._lock:
+            entry = self._entries.get(key) or {field: prior, "samples": 0}
+            weight = max(self.alpha, 1.0 / (entry["samples"] + 2))
+            self._entries[key] = {field: entry[field] + weight * (value - entry[field]), "samples": entry["samples"] + 1}
+            self._version += 1
+            version = self._version
+            snapshot = {k: dict(e) for k, e in self._entries.items()}
+        self._save(snapshot, version)
+
+    def _save(self, entries: Dict, version: int):
+        if not self.path:
+            return
+        with self._save_lock:
+            if version <= self._saved_version:
+                return
+            temp_path = f"{self.path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, indent=2)
+                os.replace(temp_path, self.path)
+                self._saved_version = version
+            except OSError:
+                pass
+
+    def observe(self, duration: Optional[float], seconds: float, model: str, engine: str,
+                load_seconds: float = 0.0):
+        """Laufzeit eines abgeschlossenen Jobs einrechnen; ``load_seconds`` (im Job
+        angefallene Whisper-Ladezeit) zählt nicht zum Real-Time-Factor"""
+        if not duration or duration <= 0 or seconds <= 0:
+            return
+        if load_seconds > 0:
+            self._update(f"load/{model}", "seconds", load_seconds, PRIOR_LOAD_SECONDS.get(model, 5.0))
+        rtf = max(0.0, seconds - load_seconds - self.overhead_seconds) / duration
+        self._update(self._key(model, engine), "rtf", rtf, self.prior(model, engine))
+
+    def select_model(self, duration: Optional[float], engine: str, deadline_seconds: float,
+                     wait_seconds: float = 0.0, candidates: List[str] = MODELS_BY_ACCURACY,
+                     resident: List[str] = ()) -> Tuple[Optional[str], Dict]:
+        """Genauestes Modell aus ``candidates``, dessen Wartezeit plus erwartete
+        Laufzeit (inkl. Ladezeit nicht geladener Modelle) ``deadline_seconds``
+        einhält; sonst das schnellste. Liefert (Modell, Begründung)."""
+        ranked = sorted(candidates, key=lambda m: MODELS_BY_ACCURACY.index(m) if m in MODELS_BY_ACCURACY else -1)
+        selection = {"deadline_seconds": deadline_seconds, "audio_duration": duration,
+                     "wait_seconds": round(wait_seconds, 1), "diarization_engine": engine, "candidates": []}
+        if duration is None or not ranked:
+            selection["reason"] = "audio duration unknown, no estimate possible"
+            return None, selection
+
+        chosen = None
+        fastest = None
+        for model in reversed(ranked):
+            loaded = model in resident
+            predicted = wait_seconds + self.estimate(duration, model, engine, loaded=loaded)
+            meets = predicted <= deadline_seconds
+            selection["candidates"].append({"model": model, "predicted_seconds": round(predicted, 1),
+                                            "resident": loaded, "meets_deadline": meets})
+            if meets and chosen is None:
+                chosen = (model, predicted)
+            if fastest is None or predicted < fastest[1]:
+                fastest = (model, predicted)
+
+        if chosen is not None:
+            model, predicted = chosen
+            selection["reason"] = (f"most accurate model expected to finish in {predicted:.0f}s "
+                                   f"(deadline {deadline_seconds:.0f}s)")
+        else:
+            model, predicted = fastest
+            selection["reason"] = (f"no model meets the {deadline_seconds:.0f}s deadline, "
+                                   f"using the fastest (expected {predicted:.0f}s)")
+        selection["model"] = model
+        selection["predicted_seconds"] = round(predicted, 1)
+        selection["meets_deadline"] = chosen is not None
+        return model, selection
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Gelernte Werte je Kombination (für Monitoring)"""
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._entries.items()}
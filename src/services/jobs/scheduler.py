@@ -0,0 +1,211 @@
+# src/services/jobs/scheduler.py
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from threading import Condition
+from typing import Optional
+
+from services.jobs.cancel import JobCancelled
+
+# Prioritäten für Rechenarbeit (kleiner = wichtiger)
+PRIORITY_PREVIEW = 0
+PRIORITY_DEFAULT = 5
+PRIORITY_REFINE = 10
+
+# Job-Prioritäten für die Warteschlange (kleiner = wichtiger)
+JOB_PRIORITIES = {"interactive": 0, "normal": 5, "bulk": 10}
+
+class PriorityGate:
+    """Begrenzt gleichzeitige Whisper-Rechenarbeit und vergibt freie Slots nach Priorität.
+    
+    Wartende mit höherer Priorität (kleinerer Wert) werden zuerst bedient,
+    innerhalb einer Priorität in Ankunftsreihenfolge. Lange Arbeiten sollten den
+    Slot in kleinen Abschnitten halten, damit wichtigere Arbeit dazwischen passt.
+    """
+    
+    def __init__(self, slots: int = 1):
+        self.slots = slots
+        self._busy = 0
+        self._waiters = []
+        self._counter = itertools.count()
+        self._condition = Condition()
+    
+    def acquire(self, priority: int = PRIORITY_DEFAULT):
+        with self._condition:
+            ticket = (priority, next(self._counter))
+            heapq.heappush(self._waiters, ticket)
+            while self._busy >= self.slots or self._waiters[0] != ticket:
+                self._condition.wait()
+            heapq.heappop(self._waiters)
+            self._busy += 1
+            # Weitere freie Slots an den nächsten Wartenden weitergeben
+            self._condition.notify_all()
+    
+    def release(self):
+        with self._condition:
+            self._busy -= 1
+            self._condition.notify_all()
+    
+    @contextmanager
+    def hold(self, priority: int = PRIORITY_DEFAULT):
+        """Kontextmanager um acquire/release"""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+    
+    def waiting(self) -> int:
+        """Anzahl wartender Anfragen"""
+        with self._condition:
+            return len(self._waiters)
+    
+    def active(self) -> int:
+        """Anzahl belegter Slots"""
+        with self._condition:
+            return self._busy
+
+
+class JobAdmission:
+    """Lässt höchstens ``slots`` Jobs gleichzeitig laufen, Wartende nach Priorität
+    und erwarteter Laufzeit.
+
+    Freie Slots gehen zuerst an die wichtigste Prioritätsklasse (kleiner Wert,
+    siehe ``JOB_PRIORITIES``), darin an den Job mit dem höchsten
+    Antwortverhältnis ``(aging · Wartezeit + erwartete Laufzeit) / erwartete
+    Laufzeit`` (Highest Response Ratio Next): kurze Jobs ziehen an langen
+    vorbei, lange Jobs steigen mit der Wartezeit auf und verhungern nicht.
+    Jobs ohne Schätzung zählen mit ``default_seconds``.
+    """
+
+    def __init__(self, slots: int = 1, aging: float = 1.0, default_seconds: float = 600.0):
+        self.slots = slots
+        self.aging = aging
+        self.default_seconds = default_seconds
+        self._waiting = {}  # key -> [erwartete Laufzeit, Ankunft, zugelassen, Priorität]
+        self._running = {}  # key -> [erwartete Laufzeit, Start]
+        self._withdrawn = set()
+        self._condition = Condition()
+
+    def _expected(self, seconds) -> float:
+        return max(1.0, seconds if seconds is not None else self.default_seconds)
+
+    def _ordered(self, now: float):
+        """Wartende (noch nicht zugelassene) Jobs in Vergabereihenfolge"""
+        def rank(item):
+            expected, arrived, _, priority = item[1]
+            return priority, -(self.aging * (now - arrived) + expected) / expected
+        pending = [item for item in self._waiting.items() if not item[1][2]]
+        return sorted(pending, key=rank)
+
+    def _dispatch(self):
+        # Zugelassene, aber noch nicht gestartete Jobs belegen ihren Slot bereits
+        busy = len(self._running) + sum(1 for entry in self._waiting.values() if entry[2])
+        admitted = 0
+        for key, entry in self._ordered(time.monotonic()):
+            if busy + admitted >= self.slots:
+                break
+            entry[2] = True
+            admitted += 1
+        if admitted:
+            self._condition.notify_all()
+
+    def acquire(self, key: str, expected_seconds: float = None, priority: int = PRIORITY_DEFAULT):
+        """Blockiert, bis der Job ``key`` einen Slot erhält; ``JobCancelled``, wenn
+        er vorher mit ``withdraw`` aus der Warteschlange genommen wird"""
+        with self._condition:
+            entry = [self._expected(expected_seconds), time.monotonic(), False, priority]
+            self._waiting[key] = entry
+            self._dispatch()
+            while not entry[2] and key not in self._withdrawn:
+                self._condition.wait()
+            del self._waiting[key]
+            if key in self._withdrawn:
+                self._withdrawn.discard(key)
+                if entry[2]:
+                    self._dispatch()  # schon zugeteilten Slot weitergeben
+                raise JobCancelled("removed from queue")
+            self._running[key] = [entry[0], time.monotonic()]
+
+    def release(self, key: str):
+        with self._condition:
+            self._running.pop(key, None)
+            self._dispatch()
+
+    def withdraw(self, key: str) -> bool:
+        """Wartenden Job aus der Warteschlange nehmen; False, wenn er nicht wartet"""
+        with self._condition:
+            if key not in self._waiting:
+                return False
+            self._withdrawn.add(key)
+            self._condition.notify_all()
+            return True
+
+    @contextmanager
+    def hold(self, key: str, expected_seconds: float = None, priority: int = PRIORITY_DEFAULT):
+        """Kontextmanager um acquire/release"""
+        self.acquire(key, expected_seconds, priority)
+        try:
+            yield
+        finally:
+            self.release(key)
+
+    def update(self, key: str, expected_seconds: float):
+        """Schätzung eines wartenden oder laufenden Jobs anpassen"""
+        with self._condition:
+            entry = self._waiting.get(key) or self._running.get(key)
+            if entry is not None:
+                entry[0] = self._expected(expected_seconds)
+
+    def position(self, key: str) -> Optional[int]:
+        """Platz in der Warteschlange (0 = nächster), None wenn nicht wartend"""
+        with self._condition:
+            keys = [k for k, _ in self._ordered(time.monotonic())]
+        return keys.index(key) if key in keys else None
+
+    def _slot_times(self, now: float):
+        """Heap der Zeitpunkte (ab jetzt), zu denen die Slots frei werden"""
+        free_at = [max(0.0, expected - (now - started)) for expected, started in self._running.values()]
+        free_at += [0.0] * max(0, self.slots - len(free_at))
+        heapq.heapify(free_at)
+        return free_at
+
+    def estimated_start(self, key: str) -> Optional[float]:
+        """Sekunden bis zum voraussichtlichen Start von ``key`` (0 wenn laufend).
+
+        Simuliert die Slots: laufende Jobs belegen sie noch ihre Restlaufzeit,
+        Wartende folgen in der aktuellen Vergabereihenfolge.
+        """
+        with self._condition:
+            now = time.monotonic()
+            if key in self._running:
+                return 0.0
+            if key not in self._waiting:
+                return None
+            free_at = self._slot_times(now)
+            for other, (expected, _, _, _) in self._ordered(now):
+                start = heapq.heappop(free_at)
+                if other == key:
+                    return start
+                heapq.heappush(free_at, start + expected)
+            return 0.0  # bereits zugelassen, Start steht unmittelbar bevor
+
+    def estimated_wait(self, priority: int = PRIORITY_DEFAULT) -> float:
+        """Sekunden, bis ein jetzt eingereihter Job starten könnte (hinter allen
+        Wartenden gleicher oder höherer Priorität)"""
+        with self._condition:
+            now = time.monotonic()
+            free_at = self._slot_times(now)
+            for _, (expected, _, _, other_priority) in self._ordered(now):
+                if other_priority <= priority:
+                    heapq.heappush(free_at, heapq.heappop(free_at) + expected)
+            return free_at[0]
+
+    def waiting(self) -> int:
+        with self._condition:
+            return len(self._waiting)
+
+    def active(self) -> int:
+        with self._condition:
+            return len(self._running)
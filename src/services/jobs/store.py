@@ -0,0 +1,125 @@
+# src/services/jobs/store.py
+import json
+import os
+import shutil
+import time
+from threading import Lock
+from typing import Dict, List, Optional
+
+def _to_json(value):
+    """numpy-Werte (Skalare, Arrays) JSON-tauglich machen"""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+class JobCheckpoint:
+    """Zwischenstände eines Jobs in einem eigenen Verzeichnis.
+
+    Stufen-Ergebnisse (Transkript, Diarization, Ergebnis) werden atomar als JSON
+    ersetzt, Teil-Ergebnisse (Transkriptions-Chunks, Sprecher-Turns) zeilenweise an
+    eine JSONL-Datei angehängt und per fsync festgeschrieben. Eine beim Absturz
+    halb geschriebene letzte Zeile wird beim Laden verworfen.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str, extension: str = "json") -> str:
+        return os.path.join(self.directory, f"{name}.{extension}")
+
+    def load(self, name: str):
+        """Gespeicherte Stufe ``name`` oder None"""
+        try:
+            with open(self._path(name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, name: str, data):
+        path = self._path(name)
+        temp_path = f"{path}.tmp"
+        with self._lock:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, default=_to_json)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+
+    def load_chunks(self, name: str) -> List[Dict]:
+        """Alle vollständig geschriebenen Einträge von ``name``; ein abgeschnittenes
+        Dateiende wird entfernt, damit weitere Einträge sauber angehängt werden"""
+        chunks = []
+        path = self._path(name, "jsonl")
+        with self._lock:
+            try:
+                with open(path, "rb") as f:
+                    valid_bytes = 0
+                    for line in f:
+                        try:
+                            if not line.endswith(b"\n"):
+                                raise ValueError("incomplete line")
+                            chunks.append(json.loads(line))
+                        except ValueError:
+                            break
+                        valid_bytes += len(line)
+                if valid_bytes < os.path.getsize(path):
+                    os.truncate(path, valid_bytes)
+            except OSError:
+                pass
+        return chunks
+
+    def append_chunk(self, name: str, data):
+        line = json.dumps(data, ensure_ascii=False, default=_to_json)
+        with self._lock:
+            with open(self._path(name, "jsonl"), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def clear(self, *names: str):
+        """Entfernt die angegebenen Stufen (JSON und JSONL)"""
+        with self._lock:
+            for name in names:
+                for extension in ("json", "jsonl"):
+                    try:
+                        os.remove(self._path(name, extension))
+                    except OSError:
+                        pass
+
+
+class JobStore:
+    """Dauerhafte Ablage von Jobs unter ``root/<job_id>/``.
+
+    ``job.json`` enthält Optionen und Status des Jobs, daneben liegen die
+    Zwischenstände (``JobCheckpoint``). Nach einem Neustart lassen sich
+    unterbrochene Jobs damit ab dem letzten Zwischenstand fortsetzen.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def checkpoint(self, job_id: str) -> JobCheckpoint:
+        return JobCheckpoint(os.path.join(self.root, job_id))
+
+    def load_jobs(self, max_age_hours: Optional[float] = None) -> List[Dict]:
+        """Alle gespeicherten Jobs (älteste zuerst); abgelaufene werden gelöscht"""
+        records = []
+        for job_id in os.listdir(self.root):
+            directory = os.path.join(self.root, job_id)
+            if not os.path.isdir(directory):
+                continue
+            record = JobCheckpoint(directory).load("job")
+            if record is None:
+                continue
+            age_hours = (time.time() - os.path.getmtime(os.path.join(directory, "job.json"))) / 3600
+            if max_age_hours is not None and age_hours > max_age_hours:
+                self.delete(job_id)
+                continue
+            records.append(record)
+        return sorted(records, key=lambda r: r.get("created_at", ""))
+
+    def delete(self, job_id: str):
+        shutil.rmtree(os.path.join(self.root, job_id), ignore_errors=True)
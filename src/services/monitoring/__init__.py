@@ -0,0 +1,2 @@
+# src/services/monitoring/__init__.py
+"""Monitoring Services"""
@@ -0,0 +1,175 @@
+# src/services/monitoring/logs.py
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, List, Optional
+
+_job_id: ContextVar[Optional[str]] = ContextVar("a2t_log_job_id", default=None)
+_stage: ContextVar[Optional[str]] = ContextVar("a2t_log_stage", default=None)
+
+@contextmanager
+def job_context(job_id: str):
+    """Ordnet alle Log-Einträge im aktuellen Kontext (inkl. kopierter Worker-Kontexte) dem Job zu"""
+    token = _job_id.set(job_id)
+    try:
+        yield
+    finally:
+        _job_id.reset(token)
+
+@contextmanager
+def stage_context(stage: str):
+    token = _stage.set(stage)
+    try:
+        yield
+    finally:
+        _stage.reset(token)
+
+
+class ContextFilter(logging.Filter):
+    """Ergänzt ``job_id`` und ``stage`` aus dem Kontext des aufrufenden Threads
+    (explizit per ``extra`` gesetzte Werte haben Vorrang)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "job_id", None) is None:
+            record.job_id = _job_id.get()
+        if getattr(record, "stage", None) is None:
+            record.stage = _stage.get()
+        return True
+
+
+class JobLogStore:
+    """Begrenzte Ringpuffer der Log-Einträge je Job.
+
+    Jeder Job behält höchstens ``max_records`` Einträge; sind mehr als
+    ``max_jobs`` Puffer vorhanden, wird der am längsten nicht beschriebene
+    verworfen. Einträge sind je Job fortlaufend nummeriert (``seq``), damit
+    Clients mit ``since`` nur neue Einträge abholen.
+    """
+
+    def __init__(self, max_records: int = 500, max_jobs: int = 200):
+        self.max_records = max_records
+        self.max_jobs = max_jobs
+        self._buffers: "OrderedDict[str, deque]" = OrderedDict()
+        self._sequence: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def append(self, job_id: str, entry: Dict):
+        with self._lock:
+            buffer = self._buffers.get(job_id)
+            if buffer is None:
+                buffer = self._buffers[job_id] = deque(maxlen=self.max_records)
+                while len(self._buffers) > self.max_jobs:
+                    evicted, _ = self._buffers.popitem(last=False)
+                    self._sequence.pop(evicted, None)
+            else:
+                self._buffers.move_to_end(job_id)
+            seq = self._sequence.get(job_id, 0) + 1
+            self._sequence[job_id] = seq
+            buffer.append(dict(entry, seq=seq))
+
+    def get(self, job_id: str, since: int = 0, min_level: int = logging.NOTSET) -> Optional[List[Dict]]:
+        """Einträge nach ``since`` (None, wenn für den Job kein Puffer existiert)"""
+        with self._lock:
+            buffer = self._buffers.get(job_id)
+            if buffer is None:
+                return None
+            return [entry for entry in buffer
+                    if entry["seq"] > since and logging.getLevelName(entry["level"]) >= min_level]
+
+    def drop(self, job_id: str):
+        with self._lock:
+            self._buffers.pop(job_id, None)
+            self._sequence.pop(job_id, None)
+
+
+def _entry(record: logging.LogRecord) -> Dict:
+    entry = {
+        "ts": round(record.created, 3),
+        "level": record.levelname,
+        "logger": record.name,
+        "job_id": getattr(record, "job_id", None),
+        "stage": getattr(record, "stage", None),
+        "thread": record.threadName,
+        "message": record.getMessage(),
+    }
+    if record.exc_info:
+        entry["exception"] = logging.Formatter().formatException(record.exc_info)
+    return entry
+
+
+class JobBufferHandler(logging.Handler):
+    """Legt Einträge mit ``job_id`` im Ringpuffer des Jobs ab"""
+
+    def __init__(self, store: JobLogStore):
+        super().__init__()
+        self.store = store
+
+    def emit(self, record: logging.LogRecord):
+        job_id = getattr(record, "job_id", None)
+        if job_id:
+            self.store.append(job_id, _entry(record))
+
+
+class JsonFormatter(logging.Formatter):
+    """Eine JSON-Zeile je Eintrag"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(_entry(record), ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    """Lesbare Zeile mit Job- und Stufen-Kennung, z.B. ``[1a2b3c4d/transcribe]``"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(job_tag)s%(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        job_id = getattr(record, "job_id", None)
+        stage = getattr(record, "stage", None)
+        tag = "/".join(part for part in (job_id[:8] if job_id else None, stage) if part)
+        record.job_tag = f"[{tag}] " if tag else ""
+        return super().format(record)
+
+
+job_logs = JobLogStore()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def setup_logging(level: str = "INFO", log_format: str = "text", buffer_size: int = 500):
+    """Asynchrones Logging: Aufrufer legen Einträge nur in eine Queue, ein
+    Hintergrund-Thread schreibt sie nach stdout, in die Job-Ringpuffer und in
+    bereits am Root-Logger konfigurierte Handler (z.B. Logdatei aus main.py).
+    Mehrfache Aufrufe sind wirkungslos."""
+    global _listener
+    if _listener is not None:
+        return
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+    job_logs.max_records = buffer_size
+
+    formatter = JsonFormatter() if log_format == "json" else TextFormatter()
+    handlers = []
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        if isinstance(handler, logging.StreamHandler) and getattr(handler, "stream", None) in (sys.stdout, sys.stderr):
+            continue  # ersetzt durch den eigenen Konsolen-Handler
+        handler.setFormatter(formatter)
+        handlers.append(handler)
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(formatter)
+    handlers += [console, JobBufferHandler(job_logs)]
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)  # Queue beim Beenden noch leeren
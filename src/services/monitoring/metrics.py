@@ -0,0 +1,251 @@
+# src/services/monitoring/metrics.py
+import math
+import time
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from services.jobs.cancel import check_cancelled
+from services.monitoring.logs import stage_context
+from services.monitoring.timing import current_timings, record_model_load
+from services.monitoring.tracing import tracer
+
+class _Metric:
+    """Gemeinsame Basis: Name, Hilfetext, Labelnamen und threadsichere Werte je Labelkombination"""
+
+    metric_type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _label_text(self, key: Tuple[str, ...], extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{self._label_text(key)} {_format(value)}" for key, value in values]
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.metric_type}"] + self.samples()
+
+
+class Counter(_Metric):
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """Gauge mit gesetzten Werten oder einer Funktion, die beim Abruf ausgewertet wird.
+
+    Die Funktion liefert eine Zahl (ohne Labels) oder ``{label-tuple: wert}``.
+    """
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable):
+        self._function = function
+
+    def samples(self) -> List[str]:
+        if self._function is not None:
+            try:
+                value = self._function()
+            except Exception:
+                return []
+            values = value.items() if isinstance(value, dict) else [((), value)]
+            return [f"{self.name}{self._label_text(tuple(map(str, key)))} {_format(v)}" for key, v in values]
+        return super().samples()
+
+
+class Histogram(_Metric):
+    """Histogramm mit festen Bucket-Grenzen (kumulativ ausgegeben, inkl. ``_sum``/``_count``)"""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}  # [count je Bucket..., +Inf, sum]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Misst die Dauer des ``with``-Blocks in Sekunden"""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = [(key, list(values)) for key, values in self._series.items()]
+        lines = []
+        for key, values in series:
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (math.inf,), values[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == math.inf else _format(bound)
+                lines.append(f"{self.name}_bucket{self._label_text(key, [('le', le)])} {_format(cumulative)}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_format(values[-1])}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {_format(cumulative)}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Prozessinterne Sammlung aller Metriken, Ausgabe im Prometheus-Textformat"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), **kwargs) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, **kwargs))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# === Pipeline ===
+PIPELINE_STAGE_SECONDS = registry.histogram(
+    "a2t_pipeline_stage_seconds", "Duration of pipeline stages", ["stage"]
+)
+JOBS_FINISHED = registry.counter(
+    "a2t_jobs_finished_total", "Finished jobs by final status", ["status"]
+)
+JOBS = registry.gauge(
+    "a2t_jobs", "Known jobs by current status", ["status"]
+)
+COMPUTE_QUEUE_LENGTH = registry.gauge(
+    "a2t_compute_queue_length", "Whisper work waiting for a compute slot"
+)
+COMPUTE_ACTIVE_WORKERS = registry.gauge(
+    "a2t_compute_active_workers", "Compute slots currently in use"
+)
+COMPUTE_SLOTS = registry.gauge(
+    "a2t_compute_slots", "Configured number of compute slots"
+)
+
+# === Modelle ===
+WHISPER_REAL_TIME_FACTOR = registry.histogram(
+    "a2t_whisper_real_time_factor", "Whisper processing time divided by audio duration", ["model"],
+    buckets=(0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 3, 5)
+)
+MODEL_LOAD_SECONDS = registry.histogram(
+    "a2t_model_load_seconds", "Model load duration", ["kind", "model"],
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300)
+)
+MODEL_LOADS = registry.counter(
+    "a2t_model_loads_total", "Model (re)loads", ["kind", "model"]
+)
+CACHE_REQUESTS = registry.counter(
+    "a2t_cache_requests_total", "Cache lookups by result (hit/miss)", ["cache", "result"]
+)
+
+# === Ollama ===
+OLLAMA_REQUESTS = registry.counter(
+    "a2t_ollama_requests_total", "Ollama generate requests by outcome", ["outcome"]
+)
+OLLAMA_FALLBACKS = registry.counter(
+    "a2t_ollama_fallbacks_total", "Protocols generated by the keyword fallback", ["reason"]
+)
+
+
+@contextmanager
+def time_stage(stage: str):
+    """Kontextmanager: Dauer einer Pipeline-Stufe erfassen (Histogramm, Trace-Span,
+    Stufe für Log-Einträge und, falls im Kontext ein Job aktiv ist, dessen
+    Zeitbilanz); liefert den Span. Vor Beginn der Stufe wird ein Abbruch des
+    Jobs geprüft."""
+    check_cancelled()
+    timings = current_timings()
+    with tracer.span(stage, stage=stage) as span, PIPELINE_STAGE_SECONDS.time(stage=stage), stage_context(stage):
+        if timings is None:
+            yield span
+        else:
+            with timings.stage(stage):
+                yield span
+
+
+def observe_model_load(kind: str, model: str, seconds: float):
+    """Modell-Ladevorgang in Metriken und Zeitbilanz des aktuellen Jobs erfassen"""
+    MODEL_LOAD_SECONDS.observe(seconds, kind=kind, model=model)
+    MODEL_LOADS.inc(kind=kind, model=model)
+    record_model_load(kind, model, seconds)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
@@ -0,0 +1,101 @@
+# src/services/monitoring/profiler.py
+import logging
+import cProfile
+import os
+import sys
+import time
+from collections import Counter
+from threading import Event, Thread, current_thread, enumerate as enumerate_threads
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+COLLAPSED_FILE = "profile.collapsed"
+PSTATS_FILE = "profile.pstats"
+
+# Threads, die nur warten bzw. selbst messen, verfälschen das Profil
+_IGNORED_THREADS = ("job-profiler", "rss-sampler")
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    path = code.co_filename.replace("\\", "/").split("/")
+    return f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+
+
+class JobProfiler:
+    """Opt-in-Profiling eines einzelnen Jobs.
+
+    Ein Sampling-Thread liest alle ``interval`` Sekunden die Stacks sämtlicher
+    Threads (``sys._current_frames``) und zählt sie im Collapsed-Stack-Format
+    (``thread;frame;frame N``, direkt für flamegraph.pl/speedscope). Da auch
+    Worker-Threads und parallel laufende Jobs erfasst werden, beginnt jeder
+    Stack mit dem Thread-Namen. Zusätzlich läuft der Job-Thread selbst unter
+    cProfile; die Statistik wird als pstats-Datei abgelegt. Jobs ohne Profiling
+    sind davon nicht betroffen.
+    """
+
+    def __init__(self, directory: str, interval: float = 0.01):
+        self.directory = directory
+        self.interval = interval
+        self.samples = Counter()
+        self.finished = False
+        self._stop = Event()
+
+    @property
+    def collapsed_path(self) -> str:
+        return os.path.join(self.directory, COLLAPSED_FILE)
+
+    @property
+    def pstats_path(self) -> str:
+        return os.path.join(self.directory, PSTATS_FILE)
+
+    def run(self, function, *args, **kwargs):
+        """Führt ``function`` unter Profiling aus und schreibt danach die Profile"""
+        sampler = Thread(target=self._sample, name="job-profiler", daemon=True)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:  # Python 3.12+: nur ein cProfile gleichzeitig
+            logger.warning(f"⚠️ [PROFILE] cProfile unavailable ({e}), sampling only")
+            profile = None
+        sampler.start()
+        started_at = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            if profile is not None:
+                profile.disable()
+            self._stop.set()
+            sampler.join()
+            self._write(profile)
+            logger.info(f"🔬 [PROFILE] {sum(self.samples.values())} samples in "
+                        f"{time.perf_counter() - started_at:.1f}s written to {self.directory}")
+
+    def _sample(self):
+        own = current_thread().ident
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in enumerate_threads()}
+            for ident, frame in sys._current_frames().items():
+                name = names.get(ident, str(ident))
+                if ident == own or name.startswith(_IGNORED_THREADS):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(name)
+                self.samples[";".join(reversed(stack))] += 1
+
+    def _write(self, profile: Optional[cProfile.Profile]):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.collapsed_path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        if profile is not None:
+            profile.dump_stats(self.pstats_path)
+        self.finished = True
+
+    def files(self) -> Dict[str, str]:
+        """Vorhandene Profil-Dateien nach Format"""
+        paths = {"collapsed": self.collapsed_path, "pstats": self.pstats_path}
+        return {fmt: path for fmt, path in paths.items() if os.path.exists(path)}
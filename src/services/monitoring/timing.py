@@ -0,0 +1,207 @@
+# src/services/monitoring/timing.py
+import itertools
+import os
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock, Thread
+from typing import Dict, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def current_rss_bytes() -> Optional[int]:
+    """Aktueller Resident Set Size des Prozesses (psutil, sonst /proc)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+def peak_rss_bytes() -> Optional[int]:
+    """Höchster RSS seit Prozessstart"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024  # Linux: KiB
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+    return None
+
+def parameter_bytes(obj, depth: int = 3, _seen=None) -> int:
+    """Speicher der Modellparameter (torch-Module) in ``obj``.
+
+    Objekte ohne eigene Tensor-Parameter (z.B. pyannote-Pipelines) werden bis
+    ``depth`` Ebenen tief nach enthaltenen Modulen durchsucht.
+    """
+    seen = _seen if _seen is not None else set()
+    if obj is None or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    parameters = getattr(obj, "parameters", None)
+    if callable(parameters):
+        try:
+            tensors = list(parameters())
+            if tensors and all(hasattr(t, "numel") for t in tensors):
+                return sum(t.numel() * t.element_size() for t in tensors)
+        except Exception:
+            pass
+    if depth <= 0:
+        return 0
+    if isinstance(obj, dict):
+        children = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        children = obj
+    elif hasattr(obj, "__dict__"):
+        children = vars(obj).values()
+    else:
+        return 0
+    return sum(parameter_bytes(child, depth - 1, seen) for child in children
+               if not isinstance(child, (str, bytes, int, float, bool)))
+
+
+class _RssSampler:
+    """Ein gemeinsamer Hintergrund-Thread misst den RSS, solange Stufen laufen,
+    und merkt sich je laufender Stufe das Maximum."""
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self._peaks: Dict[int, int] = {}
+        self._lock = Lock()
+        self._tokens = itertools.count()
+        self._thread = None
+
+    def start(self) -> int:
+        rss = current_rss_bytes() or 0
+        with self._lock:
+            token = next(self._tokens)
+            self._peaks[token] = rss
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._run, name="rss-sampler", daemon=True)
+                self._thread.start()
+        return token
+
+    def stop(self, token: int) -> int:
+        rss = current_rss_bytes() or 0
+        with self._lock:
+            return max(self._peaks.pop(token, 0), rss)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._peaks:
+                    self._thread = None
+                    return
+            rss = current_rss_bytes()
+            if rss is None:
+                return
+            with self._lock:
+                for token, peak in self._peaks.items():
+                    if rss > peak:
+                        self._peaks[token] = rss
+            time.sleep(self.interval)
+
+
+_sampler = _RssSampler()
+_current: ContextVar[Optional["JobTimings"]] = ContextVar("a2t_job_timings", default=None)
+
+
+class JobTimings:
+    """Zeit- und Ressourcenbilanz eines Jobs je Pipeline-Stufe.
+
+    Pro Stufe werden Aufrufe, Wall-Zeit, CPU-Zeit des Prozesses (enthält
+    Worker-Threads und parallel laufende Jobs) bzw. des aufrufenden Threads und
+    der höchste RSS während der Stufe summiert. Verschachtelte Stufen (z.B.
+    ``decode`` innerhalb von ``transcribe``) werden jeweils separat gezählt.
+    Modell-Ladezeiten, die der Job auslöst, landen unter ``model_loads``.
+    """
+
+    def __init__(self):
+        self.created_at = time.time()
+        self.stages: Dict[str, Dict] = {}
+        self.model_loads = []
+        self._lock = Lock()
+
+    @contextmanager
+    def activate(self):
+        """Macht diese Bilanz für den aktuellen Kontext (Thread) zur aktiven"""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def run(self, function, *args, **kwargs):
+        """Führt ``function`` mit dieser Bilanz als aktiver aus (Thread-Ziel)"""
+        with self.activate():
+            return function(*args, **kwargs)
+
+    @contextmanager
+    def stage(self, name: str):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        thread_cpu_start = time.thread_time()
+        sampler_token = _sampler.start()
+        try:
+            yield
+        finally:
+            peak = _sampler.stop(sampler_token)
+            self.add(name, time.perf_counter() - wall_start, time.process_time() - cpu_start,
+                     time.thread_time() - thread_cpu_start, peak)
+
+    def add(self, name: str, wall: float, cpu: float, thread_cpu: float, peak_rss: int):
+        with self._lock:
+            entry = self.stages.setdefault(name, {
+                "calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0,
+                "thread_cpu_seconds": 0.0, "peak_rss_bytes": 0
+            })
+            entry["calls"] += 1
+            entry["wall_seconds"] += wall
+            entry["cpu_seconds"] += cpu
+            entry["thread_cpu_seconds"] += thread_cpu
+            entry["peak_rss_bytes"] = max(entry["peak_rss_bytes"], peak_rss)
+
+    def add_model_load(self, kind: str, model: str, seconds: float):
+        with self._lock:
+            self.model_loads.append({"kind": kind, "model": model, "seconds": round(seconds, 3)})
+
+    def summary(self) -> Dict:
+        with self._lock:
+            stages = {
+                name: dict(entry,
+                           wall_seconds=round(entry["wall_seconds"], 3),
+                           cpu_seconds=round(entry["cpu_seconds"], 3),
+                           thread_cpu_seconds=round(entry["thread_cpu_seconds"], 3),
+                           peak_rss_mb=round(entry["peak_rss_bytes"] / 1024 / 1024, 1))
+                for name, entry in self.stages.items()
+            }
+            model_loads = list(self.model_loads)
+        return {
+            "stages": stages,
+            "model_loads": model_loads,
+            "model_load_seconds": round(sum(load["seconds"] for load in model_loads), 3),
+            "elapsed_seconds": round(time.time() - self.created_at, 3),
+            "process_peak_rss_mb": round((peak_rss_bytes() or 0) / 1024 / 1024, 1)
+        }
+
+
+def current_timings() -> Optional[JobTimings]:
+    return _current.get()
+
+def record_model_load(kind: str, model: str, seconds: float):
+    """Ordnet eine Modell-Ladezeit dem Job des aktuellen Kontexts zu (falls vorhanden)"""
+    timings = _current.get()
+    if timings is not None:
+        timings.add_model_load(kind, model, seconds)
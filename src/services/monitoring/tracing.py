@@ -0,0 +1,231 @@
+# src/services/monitoring/tracing.py
+import logging
+import hashlib
+import json
+import os
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "a2t-dreammall"
+
+# OTLP Status-Codes
+STATUS_UNSET, STATUS_OK, STATUS_ERROR = 0, 1, 2
+
+
+class Span:
+    """Ein Abschnitt eines Traces (Name, Zeitraum, Attribute, Status)"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, attributes: Dict = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = {key: value for key, value in (attributes or {}).items() if value is not None}
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = STATUS_UNSET
+        self.status_message = None
+
+    def set_attribute(self, key: str, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, **attributes):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def set_status(self, code: int, message: str = None):
+        self.status = code
+        self.status_message = message
+
+    def to_otlp(self) -> Dict:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in self.attributes.items()],
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+class _NoopSpan:
+    """Platzhalter, wenn kein Trace aktiv oder Tracing abgeschaltet ist"""
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, **attributes):
+        pass
+
+    def set_status(self, code, message=None):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+def _otlp_value(value) -> Dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+def _from_otlp_value(value: Dict):
+    if "intValue" in value:
+        return int(value["intValue"])
+    for key in ("boolValue", "doubleValue", "stringValue"):
+        if key in value:
+            return value[key]
+    return None
+
+
+class FileSpanExporter:
+    """Schreibt beendete Spans als OTLP-JSON (eine ``ExportTraceServiceRequest``
+    je Zeile) nach ``directory/<trace_id>.jsonl``; lesbar mit dem
+    otlpjsonfile-Receiver des OpenTelemetry Collectors."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, trace_id: str) -> str:
+        return os.path.join(self.directory, f"{trace_id}.jsonl")
+
+    def export(self, span: Span):
+        line = json.dumps({"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "a2t"}, "spans": [span.to_otlp()]}]
+        }]}, default=str)
+        with self._lock:
+            with open(self.path(span.trace_id), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def load(self, trace_id: str) -> List[Dict]:
+        """Alle gespeicherten Spans eines Traces im OTLP-Format"""
+        spans = []
+        try:
+            with open(self.path(trace_id), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        request = json.loads(line)
+                    except ValueError:
+                        continue  # abgeschnittene letzte Zeile
+                    for resource in request.get("resourceSpans", []):
+                        for scope in resource.get("scopeSpans", []):
+                            spans.extend(scope.get("spans", []))
+        except OSError:
+            pass
+        return spans
+
+    def prune(self, max_age_hours: float):
+        """Entfernt Trace-Dateien, die älter als ``max_age_hours`` sind"""
+        cutoff = time.time() - max_age_hours * 3600
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith(".jsonl") and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("a2t_current_span", default=None)
+
+
+class Tracer:
+    """Minimaler Tracer: Spans hängen über eine ContextVar am aktuellen Span.
+
+    Ohne Exporter (Tracing abgeschaltet) und außerhalb eines Traces liefert
+    ``span`` nur einen Platzhalter, es entsteht kein Aufwand. Worker-Threads
+    erben den aktuellen Span, wenn sie über ``contextvars.copy_context().run``
+    gestartet werden.
+    """
+
+    def __init__(self, exporter: FileSpanExporter = None):
+        self.exporter = exporter
+
+    @contextmanager
+    def span(self, name: str, trace_id: str = None, **attributes):
+        """Kind-Span des aktuellen Spans; mit ``trace_id`` und ohne aktuellen
+        Span beginnt ein neuer Wurzel-Span in diesem Trace"""
+        parent = _current_span.get()
+        if self.exporter is None or (parent is None and trace_id is None):
+            yield NOOP_SPAN
+            return
+        span = Span(name, parent.trace_id if parent else trace_id,
+                    parent.span_id if parent else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set_status(STATUS_ERROR, f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end_ns = time.time_ns()
+            try:
+                self.exporter.export(span)
+            except OSError as e:
+                logger.warning(f"⚠️ [TRACE] Could not export span {name}: {e}")
+
+    def current_span(self):
+        span = _current_span.get()
+        return span if span is not None and self.exporter is not None else NOOP_SPAN
+
+    def waterfall(self, trace_id: str) -> Dict:
+        """Spans eines Traces als Wasserfall: zeitlich sortiert, mit Versatz zum
+        Trace-Beginn, Dauer und Verschachtelungstiefe"""
+        spans = self.exporter.load(trace_id) if self.exporter else []
+        if not spans:
+            return {"trace_id": trace_id, "spans": []}
+        start = min(int(span["startTimeUnixNano"]) for span in spans)
+        end = max(int(span["endTimeUnixNano"]) for span in spans)
+        parents = {span["spanId"]: span.get("parentSpanId") for span in spans}
+
+        def depth(span_id):
+            level = 0
+            while parents.get(span_id) in parents and level < 64:
+                span_id = parents[span_id]
+                level += 1
+            return level
+
+        entries = []
+        for span in sorted(spans, key=lambda s: int(s["startTimeUnixNano"])):
+            entries.append({
+                "name": span["name"],
+                "span_id": span["spanId"],
+                "parent_id": span.get("parentSpanId"),
+                "depth": depth(span["spanId"]),
+                "offset_ms": round((int(span["startTimeUnixNano"]) - start) / 1e6, 3),
+                "duration_ms": round((int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6, 3),
+                "status": {STATUS_OK: "ok", STATUS_ERROR: "error"}.get(span.get("status", {}).get("code"), "unset"),
+                "attributes": {a["key"]: _from_otlp_value(a["value"]) for a in span.get("attributes", [])},
+            })
+        return {"trace_id": trace_id, "duration_ms": round((end - start) / 1e6, 3), "spans": entries}
+
+
+tracer = Tracer()
+
+def trace_id_for(job_id: str) -> str:
+    """Trace-ID (32 Hex-Zeichen) eines Jobs; UUID-Job-IDs werden direkt übernommen"""
+    hex_id = job_id.replace("-", "").lower()
+    if len(hex_id) == 32 and all(c in "0123456789abcdef" for c in hex_id):
+        return hex_id
+    return hashlib.md5(job_id.encode()).hexdigest()
@@ -1,8 +1,19 @@
 # src/services/protocol/generator.py
+import logging
 import os
-from dataclasses import dataclass
+import math
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from typing import List, Dict
 import json
+import numpy as np
+
+from config.settings import A2TSettings
+from services.ai.speaker_index import SpeakerIndex, match_voiceprints
+from services.jobs.scheduler import PRIORITY_DEFAULT
+from services.monitoring.metrics import time_stage
+
+logger = logging.getLogger(__name__)
 
 @dataclass
 class ProtocolData:
@@ -12,50 +23,160 @@ class ProtocolData:
     speakers: List[Dict]
     protocol_text: str
     metadata: Dict
+    speaker_embeddings: Dict = field(default_factory=dict)  # {"engine": ..., "centroids": {speaker: [floats]}}
 
 class ProtocolGenerator:
-    def __init__(self, ollama_client, whisper_client, diarization_client):
+    def __init__(self, ollama_client, whisper_client, diarization_client, speaker_index=None,
+                 turn_transcriber=None, chunked_transcriber=None, whisper_pool=None, compute_gate=None):
         self.ollama = ollama_client
         self.whisper = whisper_client
         self.diarization = diarization_client
+        self.speaker_index = speaker_index  # bekannte Stimmen → automatische Sprechernamen
+        self.turn_transcriber = turn_transcriber  # Diarize-first: parallele Transkription je Turn
+        self.chunked_transcriber = chunked_transcriber  # Abschnittsweise Transkription für Zwischenstände
+        self.whisper_pool = whisper_pool  # Exklusive Whisper-Clients (inkl. whisper_client)
+        self.compute_gate = compute_gate  # Begrenzt gleichzeitige Whisper-Rechenarbeit
+    
+    @contextmanager
+    def whisper_session(self, model: str = None):
+        """Whisper-Client für eine Transkription in einem Stück: mit Pool und Gate
+        exklusiv und innerhalb des Rechenlimits, sonst direkt ``whisper_client``"""
+        if self.whisper_pool is None or self.compute_gate is None:
+            yield self.whisper
+            return
+        with self.compute_gate.hold(PRIORITY_DEFAULT):
+            with self.whisper_pool.client(model or self.whisper.current_model_size) as client:
+                yield client
+        
+    def process_audio_to_protocol(self, audio_path: str, whisper_model: str = None,
+                                  speed_profile: str = None, transcript_result: Dict = None,
+                                  speech_timeline=None, diarization_engine: str = None,
+                                  diarization_progress=None, diarize_first: bool = False,
+                                  transcription_progress=None, generate_protocol: bool = True,
+                                  checkpoint=None) -> ProtocolData:
+        """Komplette Pipeline: Audio → Protokoll mit Debug-Output
+        
+        Ist ``transcript_result`` bereits vorhanden (z.B. aus der Zwei-Pass-Transkription),
+        wird die Whisper-Transkription übersprungen. Mit ``speech_timeline`` wurde
+        ``audio_path`` um Stille verkürzt; alle Zeitstempel werden dann auf die
+        Originalaufnahme zurückgerechnet. ``diarization_engine`` wählt die
+        Sprechertrennung ('pyannote', 'light' oder 'auto'), ``diarization_progress``
+        erhält im Langform-Modus den Fortschritt je Fenster.
+        
+        Mit ``diarize_first`` läuft die Sprechertrennung zuerst; die Aufnahme wird
+        an den Turn-Grenzen geschnitten und parallel transkribiert
+        (``transcription_progress(done, total, seconds)`` je fertigem Abschnitt).
+        Mit ``generate_protocol=False`` entfällt der LLM-Aufruf (z.B. für Teilaufnahmen).
         
-    def process_audio_to_protocol(self, audio_path: str, whisper_model: str = None) -> ProtocolData:
-        """Komplette Pipeline: Audio → Protokoll mit Debug-Output"""
+        Mit ``checkpoint`` (``JobCheckpoint``) werden Transkript, Transkriptions-Abschnitte
+        und Diarization gesichert bzw. aus einem früheren Lauf übernommen.
+        """
         
-        print("🎵 [PROTOCOL] Starting audio processing pipeline...")
-        print(f"📁 [PROTOCOL] Audio file: {audio_path}")
-        print(f"📏 [PROTOCOL] File size: {os.path.getsize(audio_path) if os.path.exists(audio_path) else 'FILE NOT FOUND'} bytes")
+        logger.info("🎵 [PROTOCOL] Starting audio processing pipeline...")
+        logger.info(f"📁 [PROTOCOL] Audio file: {audio_path}")
+        logger.info(f"📏 [PROTOCOL] File size: {os.path.getsize(audio_path) if os.path.exists(audio_path) else 'FILE NOT FOUND'} bytes")
         
         try:
+            # Diarize-first: Sprechertrennung zuerst, danach Transkription je Sprecher-Turn
+            diarize_first = diarize_first and transcript_result is None and self.turn_transcriber is not None
+            transcript_computed = transcript_result is None
+            if transcript_result is None and checkpoint is not None:
+                transcript_result = checkpoint.load("transcript")
+                if transcript_result is not None:
+                    transcript_computed = False
+                    logger.info("♻️ [PROTOCOL] Resuming with checkpointed transcription")
+            
+            if diarize_first:
+                speakers, identified, speaker_embeddings, diarization_engine = self._diarize(
+                    audio_path, diarization_engine, diarization_progress, checkpoint
+                )
+                if transcript_result is None:
+                    logger.info("📝 [PROTOCOL] Transcribing speaker turns in parallel...")
+                    with time_stage("transcribe"):
+                        transcript_result = self.turn_transcriber.transcribe(
+                            audio_path,
+                            speakers,
+                            model=whisper_model or self.whisper.current_model_size,
+                            language=A2TSettings.WHISPER_LANGUAGE,
+                            profile=speed_profile,
+                            progress_callback=transcription_progress,
+                            completed=checkpoint.load_chunks("turns") if checkpoint else None,
+                            on_turn=(lambda entry: checkpoint.append_chunk("turns", entry)) if checkpoint else None
+                        )
+            
             # 1. Transkription with model selection
-            print("📝 [PROTOCOL] Starting transcription...")
-            if whisper_model:
-                print(f"🎯 [PROTOCOL] Using Whisper model: {whisper_model}")
+            elif transcript_result is None:
+                logger.info("📝 [PROTOCOL] Starting transcription...")
+                if whisper_model:
+                    logger.info(f"🎯 [PROTOCOL] Using Whisper model: {whisper_model}")
+                
+                with time_stage("transcribe"):
+                    if checkpoint is not None and self.chunked_transcriber is not None \
+                            and self.chunked_transcriber.worthwhile(audio_path):
+                        # Lange Aufnahmen abschnittsweise, damit ein Neustart nur den laufenden Abschnitt verliert
+                        transcript_result = self.chunked_transcriber.transcribe(
+                            audio_path,
+                            model=whisper_model or self.whisper.current_model_size,
+                            language=A2TSettings.WHISPER_LANGUAGE,
+                            profile=speed_profile,
+                            completed=checkpoint.load_chunks("transcript_chunks"),
+                            on_chunk=lambda entry: checkpoint.append_chunk("transcript_chunks", entry)
+                        )
+                    else:
+                        with self.whisper_session(whisper_model) as client:
+                            transcript_result = client.transcribe_with_timestamps(
+                                audio_path, 
+                                model_override=whisper_model,
+                                profile=speed_profile
+                            )
+            else:
+                logger.info("📝 [PROTOCOL] Using existing transcription result")
             
-            transcript_result = self.whisper.transcribe_with_timestamps(
-                audio_path, 
-                model_override=whisper_model
-            )
+            if checkpoint is not None and transcript_computed:
+                checkpoint.save("transcript", transcript_result)
             
-            print(f"📝 [PROTOCOL] Transcription completed with model '{transcript_result.get('model_used', 'unknown')}'")
-            print(f"📝 [PROTOCOL] Duration: {transcript_result.get('duration', 'unknown')} seconds")
-            print(f"📝 [PROTOCOL] Segments: {len(transcript_result.get('segments', []))}")
-            print(f"📝 [PROTOCOL] Text length: {len(transcript_result.get('text', ''))}")
+            logger.info(f"📝 [PROTOCOL] Transcription completed with model '{transcript_result.get('model_used', 'unknown')}'")
+            logger.info(f"📝 [PROTOCOL] Duration: {transcript_result.get('duration', 'unknown')} seconds")
+            logger.info(f"📝 [PROTOCOL] Segments: {len(transcript_result.get('segments', []))}")
+            logger.info(f"📝 [PROTOCOL] Text length: {len(transcript_result.get('text', ''))}")
             
             # 2. Speaker Diarization
-            print("🎭 [PROTOCOL] Starting speaker diarization...")
-            speakers = self.diarization.identify_speakers(audio_path)
-            print(f"🎭 [PROTOCOL] Speaker diarization completed. Found {len(speakers)} segments")
+            if not diarize_first:
+                speakers, identified, speaker_embeddings, diarization_engine = self._diarize(
+                    audio_path, diarization_engine, diarization_progress, checkpoint
+                )
+            
+            if speech_timeline is not None:
+                logger.info("🔇 [PROTOCOL] Mapping timestamps back onto the original timeline...")
+                transcript_result = dict(
+                    transcript_result,
+                    segments=speech_timeline.remap_segments(transcript_result.get("segments", [])),
+                    duration=speech_timeline.original_duration
+                )
+                speakers = speech_timeline.remap_turns(speakers)
             
             # 3. Merge transcription with speaker information
-            print("🔗 [PROTOCOL] Merging transcription with speaker information...")
-            enhanced_segments = self._merge_transcription_with_speakers(
-                transcript_result["segments"], speakers
-            )
-            print(f"🔗 [PROTOCOL] Enhanced segments created: {len(enhanced_segments)}")
+            with time_stage("merge"):
+                if diarize_first:
+                    # Jedes Segment stammt bereits aus genau einem Sprecher-Turn
+                    enhanced_segments = [
+                        dict({
+                            'start': seg.get('start', 0),
+                            'end': seg.get('end', 0),
+                            'text': seg.get('text', ''),
+                            'speaker': seg['speaker']
+                        }, **self._confidence_fields(seg))
+                        for seg in transcript_result["segments"]
+                    ]
+                else:
+                    logger.info("🔗 [PROTOCOL] Merging transcription with speaker information...")
+                    enhanced_segments = self._merge_transcription_with_speakers(
+                        transcript_result["segments"], speakers
+                    )
+            logger.info(f"🔗 [PROTOCOL] Enhanced segments created: {len(enhanced_segments)}")
             
         except Exception as e:
-            print(f"❌ [PROTOCOL] Error in transcription/diarization phase: {e}")
+            logger.error(f"❌ [PROTOCOL] Error in transcription/diarization phase: {e}")
             import traceback
             traceback.print_exc()
             raise e
@@ -70,7 +191,7 @@ class ProtocolGenerator:
             if segments:
                 last_segment = segments[-1]
                 duration = last_segment.get("end", 0)
-                print(f"⏱️ Fixed duration from segments: {duration:.2f} seconds")
+                logger.info(f"⏱️ Fixed duration from segments: {duration:.2f} seconds")
         
         # Calculate actual speaker count
         speaker_count = len(unique_speakers) if unique_speakers else 1
@@ -83,20 +204,35 @@ class ProtocolGenerator:
             "unique_speakers": unique_speakers,
             "segments_count": len(transcript_result.get("segments", [])),
             "diarization_available": len(speakers) > 0,
+            "diarization_engine": diarization_engine,
+            "pipeline_order": "diarize_first" if diarize_first else "transcribe_first",
             "transcript_length": len(transcript_result["text"]),
             "average_segment_duration": duration / len(transcript_result.get("segments", [1])) if duration > 0 else 0,
-            "whisper_model_used": transcript_result.get("model_used", "unknown")
+            "whisper_model_used": transcript_result.get("model_used", "unknown"),
+            "whisper_profile": transcript_result.get("profile"),
+            "whisper_processing_time": transcript_result.get("processing_time"),
+            "whisper_real_time_factor": transcript_result.get("real_time_factor")
         }
+        if speech_timeline is not None:
+            metadata["silence_skipping"] = speech_timeline.get_stats()
+        if identified:
+            metadata["speaker_identification"] = identified
+        if diarize_first:
+            metadata["speaker_turns"] = transcript_result.get("turns")
+            metadata["transcription_workers"] = transcript_result.get("workers")
         
-        print(f"📊 Enhanced Metadata: {metadata}")
+        logger.info(f"📊 Enhanced Metadata: {metadata}")
         
         # 5. Protokoll-Generierung
-        print("🤖 Starting protocol generation...")
-        protocol_text = self.ollama.generate_protocol(
-            transcript_result["text"], 
-            speakers
-        )
-        print("🤖 Protocol generation completed")
+        protocol_text = ""
+        if generate_protocol:
+            logger.info("🤖 Starting protocol generation...")
+            with time_stage("llm"):
+                protocol_text = self.ollama.generate_protocol(
+                    transcript_result["text"], 
+                    speakers
+                )
+            logger.info("🤖 Protocol generation completed")
         
         return ProtocolData(
             audio_file=audio_path,
@@ -104,9 +240,198 @@ class ProtocolGenerator:
             segments=enhanced_segments if enhanced_segments else transcript_result.get("segments", []),
             speakers=speakers,
             protocol_text=protocol_text,
-            metadata=metadata
+            metadata=metadata,
+            speaker_embeddings=speaker_embeddings
+        )
+    
+    def append_to_protocol(self, previous: ProtocolData, audio_path: str, **options) -> ProtocolData:
+        """Hängt einen weiteren Aufnahmeteil an ein bestehendes Ergebnis an.
+        
+        Nur der neue Teil wird transkribiert und diarisiert (``options`` wie bei
+        ``process_audio_to_protocol``). Seine Zeitstempel werden um die bisherige
+        Dauer verschoben, seine Sprecher über die Stimmprofile mit den Sprechern
+        der früheren Teile verknüpft. Das Protokoll wird aus dem bisherigen
+        Protokoll und dem Transkript des neuen Teils fortgeschrieben.
+        """
+        offset = previous.metadata.get("duration", 0) or 0
+        previous_engine = previous.speaker_embeddings.get("engine")
+        if previous_engine:
+            options["diarization_engine"] = previous_engine  # nur gleiche Engine liefert vergleichbare Profile
+        logger.info(f"➕ [PROTOCOL] Appending part {len(previous.metadata.get('parts', [])) + 2} at {offset:.1f}s: {audio_path}")
+        
+        part = self.process_audio_to_protocol(audio_path, generate_protocol=False, **options)
+        links = self._link_part_speakers(previous, part)
+        rename = {label: link["speaker"] for label, link in links.items()}
+        logger.info(f"➕ [PROTOCOL] Speaker links: {', '.join(f'{k} -> {v}' for k, v in rename.items()) or 'none'}")
+        
+        def shift(items):
+            return [
+                dict(item, start=item.get("start", 0) + offset, end=item.get("end", 0) + offset,
+                     speaker=rename.get(item.get("speaker"), item.get("speaker")))
+                for item in items
+            ]
+        
+        segments = previous.segments + shift(part.segments)
+        speakers = previous.speakers + shift(part.speakers)
+        transcript = (previous.transcript.rstrip() + " " + part.transcript.lstrip()).strip()
+        speaker_embeddings = self._merge_speaker_embeddings(previous, part, rename)
+        
+        logger.info("🤖 Updating protocol with the new part...")
+        with time_stage("llm"):
+            protocol_text = self.ollama.update_protocol(
+                previous.protocol_text, part.transcript, speakers, full_transcript=transcript
+            )
+        
+        duration = offset + (part.metadata.get("duration", 0) or 0)
+        unique_speakers = sorted(set(s["speaker"] for s in speakers))
+        parts = previous.metadata.get("parts") or [{
+            "offset": 0.0,
+            "duration": offset,
+            "whisper_model_used": previous.metadata.get("whisper_model_used")
+        }]
+        parts = parts + [{
+            "offset": offset,
+            "duration": part.metadata.get("duration", 0),
+            "whisper_model_used": part.metadata.get("whisper_model_used"),
+            "speaker_links": links
+        }]
+        metadata = dict(
+            previous.metadata,
+            duration=duration,
+            duration_formatted=self._format_duration(duration),
+            speaker_count=len(unique_speakers) or 1,
+            unique_speakers=unique_speakers,
+            segments_count=len(segments),
+            diarization_available=len(speakers) > 0,
+            transcript_length=len(transcript),
+            average_segment_duration=duration / len(segments) if segments and duration > 0 else 0,
+            parts=parts
+        )
+        
+        return ProtocolData(
+            audio_file=previous.audio_file,
+            transcript=transcript,
+            segments=segments,
+            speakers=speakers,
+            protocol_text=protocol_text,
+            metadata=metadata,
+            speaker_embeddings=speaker_embeddings
         )
     
+    def _link_part_speakers(self, previous: ProtocolData, part: ProtocolData) -> Dict[str, Dict]:
+        """Ordnet die Sprecher eines neuen Teils den bisherigen Sprechern zu.
+        
+        Rückgabe ``{part_label: {"speaker": label, "similarity": float|None}}``.
+        Nicht wiedererkannte SPEAKER_XX erhalten eine freie Nummer, damit sie nicht
+        mit einem anderen früheren Sprecher zusammenfallen; Namen aus dem
+        Stimmen-Index bleiben erhalten.
+        """
+        engine = part.speaker_embeddings.get("engine")
+        previous_centroids = previous.speaker_embeddings.get("centroids", {})
+        part_centroids = part.speaker_embeddings.get("centroids", {})
+        part_labels = list(dict.fromkeys(s["speaker"] for s in part.speakers))
+        
+        matches = {}
+        if engine and engine == previous.speaker_embeddings.get("engine") and previous_centroids:
+            names = list(previous_centroids.keys())
+            matrix = np.ascontiguousarray(SpeakerIndex._normalize(
+                np.vstack([np.asarray(previous_centroids[name]) for name in names])
+            ).T)
+            threshold = A2TSettings.SPEAKER_MATCH_THRESHOLDS.get(engine, 0.75)
+            matches = match_voiceprints(part_centroids, names, matrix, threshold)
+        
+        taken = set(s["speaker"] for s in previous.speakers) | set(previous_centroids)
+        taken |= {m["name"] for m in matches.values()}
+        next_number = 1 + max([int(label.rsplit("_", 1)[1]) for label in taken
+                               if label.startswith("SPEAKER_") and label.rsplit("_", 1)[1].isdigit()] or [-1])
+        
+        links = {}
+        for label in part_labels:
+            if label in matches:
+                links[label] = {"speaker": matches[label]["name"], "similarity": round(matches[label]["similarity"], 4)}
+            elif not part_centroids:
+                links[label] = {"speaker": label, "similarity": None}  # ohne Profile keine Zuordnung möglich
+            elif label.startswith("SPEAKER_") or label in taken:
+                links[label] = {"speaker": f"SPEAKER_{next_number:02d}", "similarity": None}
+                next_number += 1
+            else:
+                links[label] = {"speaker": label, "similarity": None}
+        return links
+    
+    def _merge_speaker_embeddings(self, previous: ProtocolData, part: ProtocolData, rename: Dict[str, str]) -> Dict:
+        """Vereinigt die Stimmprofile; verknüpfte Sprecher werden nach Redezeit gemittelt"""
+        if part.speaker_embeddings.get("engine") != previous.speaker_embeddings.get("engine"):
+            return previous.speaker_embeddings
+        
+        def talk_time(speakers):
+            seconds = {}
+            for turn in speakers:
+                seconds[turn["speaker"]] = seconds.get(turn["speaker"], 0.0) + turn.get("end", 0) - turn.get("start", 0)
+            return seconds
+        
+        previous_seconds = talk_time(previous.speakers)
+        part_seconds = talk_time(part.speakers)
+        centroids = {label: np.asarray(vector) for label, vector in previous.speaker_embeddings.get("centroids", {}).items()}
+        for label, vector in part.speaker_embeddings.get("centroids", {}).items():
+            target = rename.get(label, label)
+            vector = np.asarray(vector)
+            if target in centroids:
+                old_weight = previous_seconds.get(target, 1.0)
+                new_weight = part_seconds.get(label, 1.0)
+                vector = (centroids[target] * old_weight + vector * new_weight) / (old_weight + new_weight)
+            centroids[target] = vector
+        
+        return {
+            "engine": previous.speaker_embeddings.get("engine"),
+            "centroids": {label: [float(v) for v in vector] for label, vector in centroids.items()}
+        }
+    
+    def _diarize(self, audio_path: str, diarization_engine: str, diarization_progress, checkpoint=None):
+        """Sprechertrennung inkl. automatischer Benennung bekannter Stimmen.
+        Rückgabe: (speakers, identified, speaker_embeddings, engine)"""
+        diarization_engine = self.diarization.resolve_engine(diarization_engine)
+        saved = checkpoint.load("diarization") if checkpoint is not None else None
+        if saved is not None:
+            logger.info("♻️ [PROTOCOL] Resuming with checkpointed speaker diarization")
+            speakers, voiceprints = saved["speakers"], saved["voiceprints"]
+        else:
+            logger.info(f"🎭 [PROTOCOL] Starting speaker diarization ({diarization_engine})...")
+            with time_stage("diarize"):
+                speakers, voiceprints = self.diarization.identify_speakers(
+                    audio_path, engine=diarization_engine, progress_callback=diarization_progress,
+                    return_embeddings=True
+                )
+            if checkpoint is not None:
+                checkpoint.save("diarization", {"speakers": speakers, "voiceprints": voiceprints})
+        diarization_engine = voiceprints.get("engine") or diarization_engine
+        logger.info(f"🎭 [PROTOCOL] Speaker diarization completed. Found {len(speakers)} segments")
+        
+        # Bekannte Stimmen automatisch benennen
+        identified = {}
+        if self.speaker_index is not None and voiceprints.get("centroids"):
+            identified = self.speaker_index.match(voiceprints["centroids"], voiceprints["engine"])
+            if identified:
+                logger.info(f"🗂️ [PROTOCOL] Recognised speakers: {', '.join(m['name'] for m in identified.values())}")
+                speakers = self._apply_speaker_names(speakers, identified)
+        speaker_embeddings = {
+            "engine": voiceprints.get("engine"),
+            "centroids": {
+                identified.get(label, {}).get("name", label): [float(v) for v in centroid]
+                for label, centroid in voiceprints.get("centroids", {}).items()
+            }
+        }
+        return speakers, identified, speaker_embeddings, diarization_engine
+    
+    def _apply_speaker_names(self, speakers: List[Dict], identified: Dict) -> List[Dict]:
+        """Ersetzt SPEAKER_XX durch erkannte Namen; das Diarization-Label bleibt als speaker_id erhalten"""
+        named = []
+        for turn in speakers:
+            match = identified.get(turn["speaker"])
+            if match:
+                turn = dict(turn, speaker=match["name"], speaker_id=turn["speaker"])
+            named.append(turn)
+        return named
+    
     def _format_duration(self, seconds: float) -> str:
         """Format duration in human readable format"""
         if seconds <= 0:
@@ -127,12 +452,12 @@ class ProtocolGenerator:
         if not speaker_segments:
             # No speaker diarization available, add default speaker to Whisper segments
             return [
-                {
+                dict({
                     'start': seg.get('start', 0),
                     'end': seg.get('end', 0),
                     'text': seg.get('text', ''),
                     'speaker': 'Speaker_1'
-                }
+                }, **self._confidence_fields(seg))
                 for seg in whisper_segments
             ]
         
@@ -160,11 +485,22 @@ class ProtocolGenerator:
                     best_overlap = overlap
                     speaker = speaker_seg.get('speaker', 'Speaker_Unknown')
             
-            enhanced_segments.append({
+            enhanced_segments.append(dict({
                 'start': whisper_start,
                 'end': whisper_end,
                 'text': whisper_text,
                 'speaker': speaker
-            })
+            }, **self._confidence_fields(whisper_seg)))
         
-        return enhanced_segments
\ No newline at end of file
+        return enhanced_segments
+    
+    def _confidence_fields(self, whisper_segment: Dict) -> Dict:
+        """Konfidenzwerte eines Whisper-Segments für die Ausgabe übernehmen"""
+        fields = {
+            key: whisper_segment[key]
+            for key in ('avg_logprob', 'no_speech_prob', 'compression_ratio', 'redecoded')
+            if key in whisper_segment
+        }
+        if 'avg_logprob' in fields:
+            fields['confidence'] = round(math.exp(min(0.0, fields['avg_logprob'])), 4)
+        return fields
\ No newline at end of file
@@ -0,0 +1,26 @@
+# test/test_diarization_import.py
+"""Smoke-Test: der Dienst muss ohne installiertes pyannote importierbar sein
+(STUB_ENGINES und die leichte MFCC-Diarization sind genau für solche Hosts da)."""
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+
+def test_diarization_imports_without_pyannote(monkeypatch):
+    for module in ("dotenv", "soundfile", "scipy", "numpy"):
+        pytest.importorskip(module)
+
+    # None in sys.modules lässt jeden Import von pyannote mit ImportError scheitern
+    for name in [name for name in sys.modules if name == "pyannote" or name.startswith("pyannote.")]:
+        monkeypatch.delitem(sys.modules, name)
+    monkeypatch.setitem(sys.modules, "pyannote", None)
+    monkeypatch.delitem(sys.modules, "services.ai.diarization", raising=False)
+
+    diarization = importlib.import_module("services.ai.diarization")
+
+    assert diarization.PYANNOTE_AVAILABLE is False
+    assert diarization.Pipeline is None
@@ -0,0 +1,88 @@
+// js/live-console.js
+// Live-Konsole: Log-Zeilen des laufenden Jobs aus /api/v1/jobs/<id>/logs
+
+let liveConsoleJobId = null;
+let liveConsoleInterval = null;
+let liveConsoleNext = 0;
+
+const LIVE_CONSOLE_MAX_LINES = 500;
+
+const LIVE_CONSOLE_LEVEL_CLASSES = {
+    DEBUG: 'text-gray-500',
+    INFO: 'text-gray-200',
+    WARNING: 'text-yellow-300',
+    ERROR: 'text-red-400',
+    CRITICAL: 'text-red-500 font-bold'
+};
+
+// Start polling the job's log buffer (every second)
+function startLiveConsole(jobId) {
+    stopLiveConsole(false);
+    const container = document.getElementById('liveConsole');
+    if (!container) {
+        console.error('❌ Live console container not found');
+        return;
+    }
+
+    console.log('🖥️ Starting live console for job:', jobId);
+    liveConsoleJobId = jobId;
+    liveConsoleNext = 0;
+    container.innerHTML = '';
+    document.getElementById('liveConsoleSection')?.classList.remove('hidden');
+
+    fetchLiveConsoleLogs();
+    liveConsoleInterval = setInterval(fetchLiveConsoleLogs, 1000);
+}
+
+// Stop polling; by default fetch the remaining lines once more
+function stopLiveConsole(flush = true) {
+    if (liveConsoleInterval) {
+        clearInterval(liveConsoleInterval);
+        liveConsoleInterval = null;
+    }
+    if (flush && liveConsoleJobId) {
+        fetchLiveConsoleLogs();
+    }
+}
+
+async function fetchLiveConsoleLogs() {
+    const jobId = liveConsoleJobId;
+    if (!jobId) return;
+
+    try {
+        const response = await fetch(`/api/v1/jobs/${jobId}/logs?since=${liveConsoleNext}`);
+        if (!response.ok) {
+            throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+        }
+
+        const data = await response.json();
+        if (jobId !== liveConsoleJobId || data.next <= liveConsoleNext) return;
+        liveConsoleNext = data.next;
+        appendLiveConsoleRecords(data.records);
+
+    } catch (error) {
+        console.error('❌ Failed to load job logs:', error);
+    }
+}
+
+// Append log lines, keep the console scrolled to the bottom
+function appendLiveConsoleRecords(records) {
+    const container = document.getElementById('liveConsole');
+    if (!container || !records.length) return;
+
+    const atBottom = container.scrollHeight - container.scrollTop - container.clientHeight < 20;
+    for (const record of records) {
+        const line = document.createElement('div');
+        line.className = `whitespace-pre-wrap ${LIVE_CONSOLE_LEVEL_CLASSES[record.level] || 'text-gray-200'}`;
+        const time = new Date(record.ts * 1000).toLocaleTimeString('de-DE');
+        const stage = record.stage ? ` [${record.stage}]` : '';
+        line.textContent = `${time}${stage} ${record.message}`;
+        container.appendChild(line);
+    }
+    while (container.childElementCount > LIVE_CONSOLE_MAX_LINES) {
+        container.removeChild(container.firstElementChild);
+    }
+    if (atBottom) {
+        container.scrollTop = container.scrollHeight;
+    }
+}